@@ -31,3 +31,7 @@ YERLI_URETIM_URL = "https://drive.google.com/file/d/1pYA85nxhmU6yhWJ3n0jIz1zAkTU
 # Google Drive FILE_ID'yi buraya ekleyin
 # Örnek: "https://drive.google.com/uc?export=download&id=1XYZ789GHI012"
 
+# Etiket QR kodu çizim yöntemi
+# "vektor": QR modülleri PDF'e dikdörtgen olarak çizilir (PNG kodlama/çözme yok, baskıda keskin)
+# "raster": QR kodu PNG resmi olarak gömülür (eski yöntem)
+QR_CIZIM = "vektor"
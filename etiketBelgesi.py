@@ -0,0 +1,81 @@
+"""
+Etiket Belgesi - modüllerin paylaştığı tek etiketEkle.json belgesi
+
+MainWindow bir EtiketBelgesi oluşturur ve Etiket Ekle, Json Göster ve Yazdır
+ekranlarına verir. Belge bir kez okunur, okumalar bellekten yapılır; her kayıttan
+sonra degisti sinyali değişen (kategori, koleksiyon) anahtarlarıyla yayınlanır ve
+ekranlar sadece o düğümleri yeniler.
+
+Yazma işlemleri EtiketDeposu üzerinden yapılır (işlem günlüğü + atomik anlık görüntü).
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from etiketDeposu import EtiketDeposu
+
+
+class EtiketBelgesi(QObject):
+    """Paylaşılan belge + değişiklik bildirimi
+
+    degisti(anahtarlar, kaynak):
+        anahtarlar: değişen {(kategori, koleksiyon)} kümesi; None = belge diskten
+                    yeniden okundu (başka bir süreç yazdı), tümü yenilenmeli
+        kaynak: değişikliği yapan nesne (kendi değişikliğini tekrar işlememek için)
+    """
+
+    degisti = pyqtSignal(object, object)
+
+    def __init__(self, json_file, parent=None):
+        super().__init__(parent)
+        self.depo = EtiketDeposu(json_file)
+        self.json_file = self.depo.json_file
+
+    @property
+    def data(self):
+        return self.depo.data
+
+    def exists(self):
+        return self.depo.exists()
+
+    def degisti_mi(self):
+        return self.depo.degisti_mi()
+
+    def load(self, force=False, kaynak=None):
+        """Belgeyi döndür - dosya başka bir süreç tarafından değiştirildiyse yeniden oku ve bildir"""
+        onceki = self.depo.data
+        data = self.depo.load(force=force)
+        if onceki is not None and data is not onceki:
+            self.degisti.emit(None, kaynak)
+        return data
+
+    def commit(self, islemler, kaynak=None):
+        """İşlemleri depoya yaz ve değişen koleksiyonları bildir"""
+        if not islemler:
+            return
+        onceki = self.depo.data
+        self.depo.commit(islemler)
+        if onceki is not None and self.depo.data is not onceki:
+            # Yazmadan önce belge diskten yeniden okundu - kaynak dahil herkes yenilemeli
+            self.degisti.emit(None, None)
+            return
+        self.degisti.emit({tuple(islem["yol"][:2]) for islem in islemler if len(islem["yol"]) >= 2}, kaynak)
+
+    def alan_kaydet(self, kategori, koleksiyon, alan, deger, kaynak=None):
+        """Koleksiyondaki tek bir alanı (etiket_listesi veya takım) kaydet"""
+        self.commit([{"op": "set", "yol": [kategori, koleksiyon, alan], "deger": deger}], kaynak=kaynak)
+
+    def koleksiyonlari_kaydet(self, anahtarlar, kaynak=None):
+        """Bellekte değiştirilmiş koleksiyonları kaydet (belgede olmayanlar silinir)"""
+        anahtarlar = set(anahtarlar)
+        if not anahtarlar:
+            return
+        onceki = self.depo.data
+        self.depo.koleksiyonlari_kaydet(anahtarlar)
+        if onceki is not None and self.depo.data is not onceki:
+            self.degisti.emit(None, None)
+            return
+        self.degisti.emit(anahtarlar, kaynak)
+
+    def write_all(self, data, kaynak=None):
+        """Tüm belgeyi yaz (içe aktarma) - tüm ekranlar yenilenir"""
+        self.depo.write_all(data)
+        self.degisti.emit(None, kaynak)
@@ -0,0 +1,992 @@
+"""
+Etiket Çizim - etiket PDF'lerini çizen Qt'den bağımsız katman
+
+EtiketApp (Yazdır ekranı) sadece veriyi hazırlar; sayfalar EtiketCizici ile çizilir.
+
+Her sayfada aynı kalan içerik (kesim çizgileri, başlık resmi, yerli üretim logosu,
+dipnot) belge başına bir kez PDF form nesnesine (Form XObject) çizilir ve her
+sayfaya doForm ile basılır. Sayfa başına sadece tablo, QR kodu ve indirim etiketi
+çizilir.
+
+QR kodları QrOnbellegi'nden (bellek + disk) alınır; aynı URL bir belgede birden
+fazla etikette geçiyorsa QR resmi belgeye bir kez gömülür (URL başına form).
+Başlık ve logo resimleri ResimOnbellegi ile diskte (resim_cache) tutulur ve
+ETag/Last-Modified ile doğrulanır; her açılışta Google Drive'dan indirilmez.
+QR_CIZIM = "vektor" (config) ile QR modülleri PNG yerine doğrudan dikdörtgen olarak
+çizilir; "raster" eski PNG yöntemidir.
+
+paralel_pdf_olustur() EXC ve SUBE PDF'lerini işçi süreçlerde aynı anda çizer; çok
+büyük etiket listeleri parçalara bölünüp paralel çizilir ve pypdf ile tek PDF'te
+birleştirilir (pypdf yoksa parçalara bölünmez). Etiket başına ilerleme (n/toplam,
+kalan süre) bildirilir ve iş iptal edilebilir; PDF'ler geçici dosyalara yazılır ve
+ancak tüm çizim başarıyla bitince hedef dosyaların yerine konur (iptal edilen veya
+hata alan çalışma mevcut Etiket_EXC.pdf / Etiket_SUBE.pdf dosyalarına dokunmaz).
+
+Her etiketin çizim girdileri (başlık, ürün/paket fiyatları, QR URL'si, indirim,
+dipnot tarihi, resim/font sürümleri) özetlenir ve etiket_ozetleri.json'a yazılır.
+Çalıştırmada kaç etiketin gerçekten değiştiği raporlanır; hiçbir etiketi değişmemiş
+ve dosyası yerinde duran PDF yeniden çizilmez.
+
+Benchmark (Qt gerektirmez):
+    python -m etiketCizim --bench 1000
+    python -m etiketCizim --bench 1000 --jobs 4
+"""
+
+import os
+import sys
+import time
+import random
+import json
+import argparse
+import hashlib
+import queue
+import tempfile
+from io import BytesIO
+from multiprocessing import Manager
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+from reportlab.lib.utils import ImageReader
+from reportlab.lib import colors
+from reportlab.platypus import Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph
+from config import ETIKET_BASLIK_URL, YERLI_URETIM_URL, QR_CIZIM
+from etiketFontlari import fontlari_hazirla, font_surumu
+from etiketDeposu import json_yaz_atomik
+from qrOnbellek import QrOnbellegi, QR_ONBELLEK_KLASORU
+from resimOnbellek import ResimOnbellegi, RESIM_ONBELLEK_KLASORU
+
+# pypdf (opsiyonel) - parçalara bölünmüş büyük PDF'leri birleştirmek için
+try:
+    from pypdf import PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+
+# Sabit sayfa katmanının belgedeki form adı
+SABIT_FORM_ADI = "etiket_sabit_katman"
+
+# QR kodunun sayfadaki boyutu (pt)
+QR_BOYUTU = 100
+
+QR_CIZIM_YONTEMLERI = ("vektor", "raster")
+
+# Son çizilen PDF'lerin etiket özetleri (exe/script klasöründe)
+ETIKET_OZET_DOSYASI = "etiket_ozetleri.json"
+
+# Etiket yerleşimi (çizim kodu) değiştiğinde artırılır - tüm özetleri geçersiz kılar
+CIZIM_SURUMU = 1
+
+# URL'si olmayan (QR kodu çizilemeyen) etiketlerin listesi (exe/script klasöründe)
+QR_HATA_DOSYASI = "QR_Hata.txt"
+
+# Bir parçadaki en az etiket sayısı (her parça sabit katmanı ve fontları yeniden gömer)
+MIN_PARCA_BOYUTU = 100
+
+
+# Çözülmüş resimler (ImageReader) - içerik özetine göre, yazdırmalar arasında yeniden kullanılır
+_resim_okuyuculari = {}
+
+
+class IptalEdildi(Exception):
+    """Çizim kullanıcı tarafından iptal edildi"""
+
+
+def get_base_dir():
+    """Exe veya script dizinini döndür"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def load_image_from_url_or_file(url, fallback_filename, cache=None):
+    """
+    Google Drive URL'den veya yerel dosyadan resim yükle (önbellek desteği ile)
+
+    Args:
+        url: Google Drive resim URL'i (None olabilir)
+        fallback_filename: Yerel dosya adı (fallback)
+        cache: Resim önbelleği (dict) - Resimleri tekrar indirmemek için
+
+    Returns:
+        ImageReader nesnesi
+    """
+    # Cache kontrolü - daha önce yüklendiyse direkt döndür
+    cache_key = resim_anahtari(url, fallback_filename)
+    if cache is not None and cache_key in cache:
+        if cache[cache_key] is None:
+            # Ana süreç yükleyemedi - tekrar denenmez
+            raise FileNotFoundError(f"Resim bulunamadı: {fallback_filename} (URL: {url})")
+        return cache[cache_key]
+
+    # URL'den, başarısız olursa yerel dosyadan yükle
+    img = ImageReader(BytesIO(resim_verisi_yukle(url, fallback_filename)))
+    if cache is not None:
+        cache[cache_key] = img
+    return img
+
+
+def resim_anahtari(url, fallback_filename):
+    """Resim önbelleği anahtarı"""
+    return f"{url}_{fallback_filename}"
+
+
+def sabit_resim_verileri(log=print, base_dir=None):
+    """Başlık ve logo resimlerini bir kez yükle ve ham bayt olarak döndür: {anahtar: bayt}
+
+    İşçi süreçlere bu sözlük gönderilir (her süreç resimleri yeniden indirmez).
+    Yüklenemeyen resimler None olarak işaretlenir (işçiler tekrar denemez).
+    İndirilen resimler base_dir/resim_cache altında saklanır (sonraki açılışlarda
+    RESIM_MAX_YAS dolana kadar indirilmez).
+    """
+    onbellek = ResimOnbellegi(os.path.join(base_dir or get_base_dir(), RESIM_ONBELLEK_KLASORU))
+    veriler = {}
+    for url, dosya_adi in [(ETIKET_BASLIK_URL, "etiket_baslik.png"), (YERLI_URETIM_URL, "yerli_uretim.jpg")]:
+        try:
+            veriler[resim_anahtari(url, dosya_adi)] = resim_verisi_yukle(url, dosya_adi, onbellek)
+        except Exception as e:
+            veriler[resim_anahtari(url, dosya_adi)] = None
+            log(f"⚠️ Resim yüklenemedi ({dosya_adi}): {e}")
+    return veriler
+
+
+def resim_onbellegi(veriler):
+    """Ham bayt sözlüğünden EtiketCizici için resim önbelleği (ImageReader) oluştur
+
+    Aynı baytlar için süreçte daha önce oluşturulmuş ImageReader yeniden kullanılır.
+    """
+    onbellek = {}
+    for anahtar, veri in (veriler or {}).items():
+        if veri is None:
+            onbellek[anahtar] = None
+            continue
+        ozet = hashlib.sha1(veri).hexdigest()
+        if ozet not in _resim_okuyuculari:
+            _resim_okuyuculari[ozet] = ImageReader(BytesIO(veri))
+        onbellek[anahtar] = _resim_okuyuculari[ozet]
+    return onbellek
+
+
+def resim_verisi_yukle(url, fallback_filename, onbellek=None):
+    """Resmi Google Drive URL'den (yoksa yerel dosyadan) ham bayt olarak yükle
+
+    İndirilen resim disk önbelleğinde (resim_cache) tutulur ve ETag/Last-Modified
+    ile doğrulanır; ağ yoksa önbellekteki kopya kullanılır.
+    """
+    if url:
+        if onbellek is None:
+            onbellek = ResimOnbellegi(os.path.join(get_base_dir(), RESIM_ONBELLEK_KLASORU))
+        veri = onbellek.getir(url, convert_gdrive_url(url))
+        if veri is not None:
+            return veri
+        print(f"⚠️ URL'den resim yüklenemedi ({fallback_filename}), yerel dosya deneniyor")
+
+    local_path = os.path.join(get_base_dir(), fallback_filename)
+    if os.path.exists(local_path):
+        with open(local_path, 'rb') as f:
+            return f.read()
+
+    raise FileNotFoundError(f"Resim bulunamadı: {fallback_filename} (URL: {url})")
+
+
+def convert_gdrive_url(url):
+    """
+    Google Drive URL'ini doğrudan indirme formatına çevir
+
+    Örnek girdi formatları:
+    - https://drive.google.com/file/d/FILE_ID/view?usp=drive_link
+    - https://drive.google.com/file/d/FILE_ID/view?usp=sharing
+    - https://drive.google.com/uc?export=download&id=FILE_ID (zaten doğru format)
+
+    Çıktı:
+    - https://drive.google.com/uc?export=download&id=FILE_ID
+    """
+    import re
+
+    # Zaten doğru formattaysa direkt döndür
+    if 'uc?export=download' in url:
+        return url
+
+    # /file/d/FILE_ID/view formatından FILE_ID'yi çıkar
+    match = re.search(r'/file/d/([a-zA-Z0-9_-]+)', url)
+    if match:
+        file_id = match.group(1)
+        return f"https://drive.google.com/uc?export=download&id={file_id}"
+
+    # Format tanınmadıysa orijinal URL'i döndür
+    return url
+
+
+def qr_hata_satiri(etiket):
+    """URL'si olmayan etiket için QR_Hata.txt satırı"""
+    return f"{etiket['koleksiyon_adi']} - QR kodu oluşturulamadı (URL bulunamadı)"
+
+
+def qr_hatalarini_yaz(base_dir, satirlar):
+    """QR hata satırlarını QR_Hata.txt'ye ekle (sadece ana süreç yazar)"""
+    if not satirlar:
+        return
+    with open(os.path.join(base_dir, QR_HATA_DOSYASI), "a", encoding="utf-8") as f:
+        f.writelines(satir + "\n" for satir in satirlar)
+
+
+def format_price(price):
+    """Fiyatı TL formatında döndürür."""
+    if price == 0:
+        return "0 TL"
+    return f"{price:,.0f} TL".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def cizim_girdileri(etiket):
+    """Etiket sayfasına yansıyan alanlar (draw_etiket / draw_table ile aynı tutulmalı)
+
+    updated_at, secDeger/excDeger/subeDeger gibi çizilmeyen alanlar dahil değildir.
+    """
+    data = etiket['data']
+    etiket_listesi = data['etiket_listesi']
+    takim_sku = etiket_listesi['takim_sku']
+    return {
+        'koleksiyon_adi': etiket['koleksiyon_adi'],
+        'baslik': takim_sku.get('urun_adi_tam', f"{etiket['koleksiyon_adi']} Yatak Odası Takımı"),
+        'url': takim_sku.get('url'),
+        'indirim_yuzde': takim_sku.get('indirim_yuzde', 0),
+        'urunler': [[urun['urun_adi_tam'], urun.get('perakende_fiyat', 0), urun.get('liste_fiyat', 0)]
+                    for urun in etiket_listesi.get('urunler', [])],
+        'paketler': [[key, value.get('total_perakende_price', 0), value.get('total_liste_price', 0)]
+                     for key, value in data.items()
+                     if key != 'etiket_listesi' and isinstance(value, dict) and 'products' in value],
+        'paket_sayisi': len([k for k in data.keys() if k != 'etiket_listesi']),
+    }
+
+
+def ortam_ozeti(resim_verileri, qr_cizim=None):
+    """Tüm etiketlerde ortak çizim girdilerinin özeti (dipnot tarihi, resimler, fontlar, QR yöntemi)"""
+    fontlari_hazirla(log=lambda mesaj: None)
+    ortam = {
+        'surum': CIZIM_SURUMU,
+        'dipnot_tarihi': datetime.now().strftime('%d.%m.%Y'),
+        'resimler': {anahtar: hashlib.sha1(veri).hexdigest() if veri is not None else None
+                     for anahtar, veri in sorted((resim_verileri or {}).items())},
+        'fontlar': repr(font_surumu()),
+        'qr_cizim': qr_cizim or QR_CIZIM,
+    }
+    return hashlib.sha1(json.dumps(ortam, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def etiket_ozeti(etiket, ortam):
+    """Etiketin çizim girdilerinin özeti (aynı özet = aynı sayfa)"""
+    icerik = json.dumps(cizim_girdileri(etiket), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1((ortam + icerik).encode('utf-8')).hexdigest()
+
+
+def etiket_ozetlerini_yukle(base_dir):
+    """{pdf yolu: {"etiketler": [[kategori, koleksiyon, özet]], "pdf": [boyut, mtime_ns]}}"""
+    try:
+        with open(os.path.join(base_dir, ETIKET_OZET_DOSYASI), 'r', encoding='utf-8') as f:
+            ozetler = json.load(f)
+        return ozetler if isinstance(ozetler, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def pdf_durumu(output_path):
+    """PDF dosyasının [boyut, mtime_ns] bilgisi (yoksa None)"""
+    try:
+        durum = os.stat(output_path)
+    except OSError:
+        return None
+    return [durum.st_size, durum.st_mtime_ns]
+
+
+def degisiklik_raporu(ad, onceki, etiketler):
+    """Önceki çizime göre yeni / güncellenen / çıkarılan etiket sayıları (log metni)"""
+    if not onceki:
+        return f"{ad}: önceki çizim kaydı yok, {len(etiketler)} etiket çizilecek"
+    eski = {(kategori, koleksiyon): ozet for kategori, koleksiyon, ozet in onceki.get("etiketler", [])}
+    yeni = {(kategori, koleksiyon): ozet for kategori, koleksiyon, ozet in etiketler}
+    eklenen = sum(1 for anahtar in yeni if anahtar not in eski)
+    guncellenen = sum(1 for anahtar, ozet in yeni.items() if anahtar in eski and eski[anahtar] != ozet)
+    cikarilan = sum(1 for anahtar in eski if anahtar not in yeni)
+    return (f"{ad}: {eklenen + guncellenen}/{len(etiketler)} etiket değişti "
+            f"({eklenen} yeni, {guncellenen} güncellendi, {cikarilan} çıkarıldı)")
+
+
+class TabloStilleri:
+    """draw_table'ın paragraf ve tablo stilleri - çizici başına bir kez oluşturulur
+
+    Etiketten etikete sadece paket satırlarının başladığı satır (ürün sayısı)
+    değişir; o satırların stili ürün sayısına göre önbellekte tutulur.
+    """
+
+    def __init__(self, font_normal, font_bold):
+        styles = getSampleStyleSheet()
+        self.font_bold = font_bold
+
+        # Başlık satırı - Koleksiyon adı
+        self.baslik = ParagraphStyle(
+            'TitleStyle',
+            parent=styles['Normal'],
+            fontName=font_bold,
+            fontSize=16,
+            leading=18,
+            textColor=colors.HexColor("#000000"),
+            alignment=0
+        )
+
+        # Ürünler
+        self.urun = ParagraphStyle(
+            'ProductStyle',
+            parent=styles['Normal'],
+            fontName=font_normal,
+            fontSize=10,
+            leading=12,
+            textColor=colors.black
+        )
+
+        # Paket/Kombinasyonlar
+        self.aciklama = ParagraphStyle(
+            'AciklamaStyle',
+            parent=styles['Normal'],
+            fontName=font_bold,
+            fontSize=14,
+            leading=16,
+            textColor=colors.HexColor("#000000"),
+            spaceBefore=10,
+            spaceAfter=10
+        )
+
+        # Tablo stili (tüm etiketlerde ortak)
+        self.tablo = TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#D3D3D3")),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.black),
+            ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+            ('ALIGN', (1,0), (-1,-1), 'RIGHT'),
+            ('FONTNAME', (0,0), (-1,0), font_bold),
+            ('FONTSIZE', (0,0), (-1,0), 16),
+            ('BOTTOMPADDING', (0,0), (-1,0), 12),
+            ('BACKGROUND', (0,1), (-1,-1), colors.white),
+            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.HexColor("#F5F5F5"), colors.white]),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ])
+        self._paket_stilleri = {}  # {ürün sayısı: TableStyle}
+
+    def paket_satirlari(self, product_count):
+        """Paket satırlarının (ürünlerden sonraki satırlar) stili"""
+        stil = self._paket_stilleri.get(product_count)
+        if stil is None:
+            stil = TableStyle([
+                ('FONTNAME', (0,product_count+1), (-1,-1), self.font_bold),
+                ('FONTSIZE', (0,product_count+1), (-1,-1), 14),
+            ])
+            self._paket_stilleri[product_count] = stil
+        return stil
+
+
+class EtiketCizici:
+    """Etiket sayfalarını ReportLab canvas'ına çizer
+
+    Args:
+        base_dir: Yerel resimlerin ve önbelleklerin bulunduğu klasör
+        log: Mesaj fonksiyonu (Yazdır ekranında output_text.appendPlainText)
+        image_cache: Resim önbelleği (dict) - çağıran tarafından paylaşılabilir
+        qr_onbellek: QrOnbellegi - verilmezse base_dir/qr_cache kullanılır
+        qr_cizim: "vektor" veya "raster" (varsayılan config.QR_CIZIM)
+        sabit_form: False ise sabit katman her sayfaya yeniden çizilir (karşılaştırma için)
+        stil_onbellegi: False ise tablo stilleri her etiket için yeniden oluşturulur (karşılaştırma için)
+    """
+
+    def __init__(self, base_dir=None, log=print, image_cache=None, qr_onbellek=None, sabit_form=True,
+                 qr_cizim=None, stil_onbellegi=True):
+        self.base_dir = base_dir or get_base_dir()
+        self.log = log
+        self.image_cache = image_cache if image_cache is not None else {}
+        if qr_onbellek is None:
+            qr_onbellek = QrOnbellegi(os.path.join(self.base_dir, QR_ONBELLEK_KLASORU))
+        self.qr_onbellek = qr_onbellek
+        self.qr_formlari = {}  # {url: form adı} - belge başına
+        self.qr_tekrar = 0  # Belgede daha önce gömülmüş QR'ı kullanan etiket sayısı
+        self.qr_hatalari = []  # Belgede URL'si olmayan etiketler (QR_Hata.txt satırları, çağıran yazar)
+        self.sabit_form = sabit_form
+        self.qr_cizim = qr_cizim or QR_CIZIM
+        if self.qr_cizim not in QR_CIZIM_YONTEMLERI:
+            log(f"⚠️ Bilinmeyen QR_CIZIM değeri: {self.qr_cizim!r}, 'raster' kullanılacak")
+            self.qr_cizim = "raster"
+        self.font_normal, self.font_bold = fontlari_hazirla(log=log)
+        self.stil_onbellegi = stil_onbellegi
+        self.tablo_stilleri = TabloStilleri(self.font_normal, self.font_bold)
+
+    def create_pdf(self, etiket_data, output_path, ilerleme=None, iptal=None):
+        """PDF dosyasını oluşturur.
+
+        Geçici dosyaya yazılır ve bitince os.replace ile hedefin yerine konur.
+
+        Args:
+            ilerleme: Her etiketten sonra çağrılır: ilerleme(cizilen, toplam)
+            iptal: Her etiketten önce sorulur; True dönerse IptalEdildi fırlatılır
+        """
+        gecici = output_path + ".tmp"
+        try:
+            c = canvas.Canvas(gecici, pagesize=landscape(A4))
+            self.qr_formlari = {}
+            self.qr_tekrar = 0
+            self.qr_hatalari = []
+            self.qr_onbellek.istatistik_sifirla()
+
+            # Sabit katman belge başına bir kez çizilir
+            if self.sabit_form:
+                c.beginForm(SABIT_FORM_ADI)
+                self.draw_sabit_katman(c)
+                c.endForm()
+
+            for i, etiket in enumerate(etiket_data):
+                if iptal is not None and iptal():
+                    raise IptalEdildi()
+                self.draw_etiket(c, etiket)
+                if i < len(etiket_data) - 1:
+                    c.showPage()
+                if ilerleme is not None:
+                    ilerleme(i + 1, len(etiket_data))
+
+            c.save()
+            os.replace(gecici, output_path)
+            self.log(f"{self.qr_onbellek.ozet()} | belgede tekrar kullanılan {self.qr_tekrar}")
+
+        except Exception as e:
+            if os.path.exists(gecici):
+                os.remove(gecici)
+            if not isinstance(e, IptalEdildi):
+                self.log(f"❌ PDF oluşturma hatası: {str(e)}")
+            raise
+
+    def draw_sabit_katman(self, c):
+        """Her sayfada aynı olan içeriği çizer (kesim çizgileri, resimler, dipnot)."""
+        page_width, page_height = landscape(A4)
+
+        # Kesim çizgileri
+        self.draw_cutting_lines(c)
+
+        # Başlık resmi (Google Drive veya yerel - önbellekli)
+        try:
+            header_img = load_image_from_url_or_file(ETIKET_BASLIK_URL, "etiket_baslik.png", cache=self.image_cache)
+            c.drawImage(header_img, -10, page_height-175, width=590, height=90, preserveAspectRatio=True)
+        except Exception as e:
+            self.log(f"⚠️ Başlık resmi yüklenemedi: {e}")
+
+        # Yerli Üretim Logosu (Google Drive veya yerel - önbellekli)
+        try:
+            logo_img = load_image_from_url_or_file(YERLI_URETIM_URL, "yerli_uretim.jpg", cache=self.image_cache)
+            c.drawImage(logo_img, page_width-180, 80, width=100, height=30)
+        except Exception as e:
+            self.log(f"⚠️ Logo yüklenemedi: {e}")
+
+        # Dipnot
+        c.setFont(self.font_normal, 9)
+        dipnot = f"Fiyat Değişiklik Tarihi: {datetime.now().strftime('%d.%m.%Y')} / Fiyatlara KDV dahildir / Üretim Yeri: TÜRKİYE"
+        c.drawString(100, 80, dipnot)
+
+    def draw_etiket(self, c, etiket):
+        """Tek bir etiket sayfası çizer."""
+        try:
+            # Sayfa boyutları
+            page_width, page_height = landscape(A4)
+
+            # Sabit katman (kesim çizgileri, başlık, logo, dipnot)
+            if self.sabit_form:
+                c.doForm(SABIT_FORM_ADI)
+            else:
+                self.draw_sabit_katman(c)
+
+            # QR Kodu
+            takim_sku = etiket['data']['etiket_listesi']['takim_sku']
+            if 'url' in takim_sku and takim_sku['url']:
+                c.doForm(self.qr_formu(c, takim_sku['url']))
+            else:
+                self.qr_hatalari.append(qr_hata_satiri(etiket))
+
+            # İndirim Yüzdesi Etiketi (header ile QR kod arasına)
+            indirim_yuzde = takim_sku.get('indirim_yuzde', 0)
+            if indirim_yuzde > 0:
+                # İndirim etiketinin boyutları ve konumu
+                etiket_width = 110
+                etiket_height = 45
+                # Header'ın sağ üst köşesine yerleştir (QR kodun solunda)
+                etiket_x = 510  # header sağ tarafı
+                etiket_y = page_height - 140
+
+                # Kırmızı arka plan (döndürülmüş etiket efekti)
+                c.saveState()
+                c.translate(etiket_x, etiket_y)
+                c.rotate(-17)  # 12 derece sola eğik
+
+                # Kırmızı dikdörtgen (yuvarlatılmış köşeler)
+                c.setFillColorRGB(0.07, 0.07, 0.07)  # Parlak kırmızı
+                c.roundRect(0, 0, etiket_width, etiket_height, 8, fill=1, stroke=0)
+
+                # Beyaz yazı (indirim yüzdesi)
+                c.setFillColorRGB(1, 1, 1)  # Beyaz
+                c.setFont(self.font_bold, 36)
+                text = f"-{indirim_yuzde}%"
+                text_width = c.stringWidth(text, self.font_bold, 36)
+                text_x = (etiket_width - text_width) / 2
+                text_y = etiket_height / 2 - 13
+                c.drawString(text_x, text_y, text)
+
+                c.restoreState()
+
+            # Tablo oluştur
+            self.draw_table(c, etiket, page_height)
+
+        except Exception as e:
+            self.log(f"❌ Etiket çizme hatası: {str(e)}")
+            raise
+
+    def draw_table(self, c, etiket, page_height):
+        """Etiket tablosunu çizer."""
+        data = []
+        stiller = self.tablo_stilleri if self.stil_onbellegi else TabloStilleri(self.font_normal, self.font_bold)
+
+        # Başlık satırı - Koleksiyon adı
+        # takim_sku'dan urun_adi_tam bilgisini al
+        takim_sku = etiket['data']['etiket_listesi']['takim_sku']
+        koleksiyon_title = takim_sku.get('urun_adi_tam', f"{etiket['koleksiyon_adi']} Yatak Odası Takımı")
+        title_para = Paragraph(koleksiyon_title, stiller.baslik)
+        data.append([title_para, "İNDİRİMLİ FİYAT", "LİSTE FİYATI"])
+
+        # Ürünler
+        etiket_listesi = etiket['data']['etiket_listesi']
+        if 'urunler' in etiket_listesi:
+            for urun in etiket_listesi['urunler']:
+                product_name = Paragraph(urun['urun_adi_tam'], stiller.urun)
+                data.append([
+                    product_name,
+                    format_price(urun.get('perakende_fiyat', 0)),
+                    format_price(urun.get('liste_fiyat', 0))
+                ])
+
+        # Paket/Kombinasyonlar
+        product_count = len(etiket_listesi.get('urunler', []))
+
+        for key, value in etiket['data'].items():
+            if key != 'etiket_listesi' and isinstance(value, dict) and 'products' in value:
+                paket_name_text = f"{key.title()}"
+                paket_name = Paragraph(paket_name_text, stiller.aciklama)
+                data.append([
+                    paket_name,
+                    format_price(value.get('total_perakende_price', 0)),
+                    format_price(value.get('total_liste_price', 0))
+                ])
+
+        # Tablo boyutları
+        col_widths = [landscape(A4)[0]-425, 135, 125]
+        row_heights = [30] + [17] * product_count
+
+        # Paket satırları için yükseklik ekle
+        paket_count = len([k for k in etiket['data'].keys() if k != 'etiket_listesi'])
+        if paket_count > 0:
+            row_heights += [20] * paket_count
+
+        # Tabloyu çiz (ortak stil + ürün sayısına bağlı paket satırı stili)
+        table = Table(data, colWidths=col_widths, rowHeights=row_heights)
+        table.setStyle(stiller.tablo)
+        table.setStyle(stiller.paket_satirlari(product_count))
+        table.wrapOn(c, landscape(A4)[0], landscape(A4)[1])
+        table.drawOn(c, 80, page_height - 180 - table._height)
+
+    def draw_cutting_lines(self, c):
+        """Kesim çizgilerini çizer."""
+        page_width, page_height = landscape(A4)
+        line_length = 60
+
+        c.setLineWidth(2)
+
+        # Sol Üst
+        c.line(10, page_height-10, 10+line_length, page_height-10)
+        c.line(10, page_height-10, 10, page_height-10-line_length)
+        # Sağ Üst
+        c.line(page_width-10, page_height-10, page_width-10-line_length, page_height-10)
+        c.line(page_width-10, page_height-10, page_width-10, page_height-10-line_length)
+        # Sol Alt
+        c.line(10, 10, 10+line_length, 10)
+        c.line(10, 10, 10, 10+line_length)
+        # Sağ Alt
+        c.line(page_width-10, 10, page_width-10-line_length, 10)
+        c.line(page_width-10, 10, page_width-10, 10+line_length)
+
+    def qr_formu(self, c, url):
+        """URL'nin QR kodunu içeren formun adını döndür (belgede ilk kullanımda oluşturulur)."""
+        form_adi = self.qr_formlari.get(url)
+        if form_adi is not None:
+            self.qr_tekrar += 1
+            return form_adi
+
+        page_width, page_height = landscape(A4)
+        x, y = page_width-185, page_height-175
+        form_adi = "qr_" + hashlib.sha1(url.encode('utf-8')).hexdigest()
+        c.beginForm(form_adi)
+        if self.qr_cizim == "vektor":
+            self.draw_qr_vektor(c, self.qr_onbellek.matris(url), x, y, QR_BOYUTU)
+        else:
+            c.drawImage(self.generate_qr_code(url), x, y, width=QR_BOYUTU, height=QR_BOYUTU)
+        c.endForm()
+        self.qr_formlari[url] = form_adi
+        return form_adi
+
+    def draw_qr_vektor(self, c, matris, x, y, boyut):
+        """QR matrisini tek bir dolgu yolu olarak çizer (yan yana koyu modüller tek dikdörtgen)."""
+        modul = boyut / len(matris)
+
+        # Beyaz zemin (raster resimdeki kenar boşluğu ile aynı görünüm)
+        c.setFillColorRGB(1, 1, 1)
+        c.rect(x, y, boyut, boyut, fill=1, stroke=0)
+
+        yol = c.beginPath()
+        for satir_no, satir in enumerate(matris):
+            satir_y = y + boyut - (satir_no + 1) * modul
+            sutun = satir.find("1")
+            while sutun != -1:
+                bitis = satir.find("0", sutun)
+                if bitis == -1:
+                    bitis = len(satir)
+                yol.rect(x + sutun * modul, satir_y, (bitis - sutun) * modul, modul)
+                sutun = satir.find("1", bitis)
+        c.setFillColorRGB(0, 0, 0)
+        c.drawPath(yol, fill=1, stroke=0)
+
+    def generate_qr_code(self, url):
+        """QR kodunu önbellekten (yoksa üreterek) ImageReader olarak döndürür."""
+        return ImageReader(BytesIO(self.qr_onbellek.png(url)))
+
+
+# İşçi süreç başına tek çizici (font, QR ve resim önbellekleri parçalar arasında korunur)
+_isci_cizici = None
+
+
+def _parca_ciz(base_dir, qr_cizim, resim_verileri, etiket_data, output_path, ad, kuyruk, iptal_olayi):
+    """İşçi süreçte bir PDF (parça) çiz; (log mesajları, QR hata satırları) döndür
+
+    Mesajları GUI'ye, QR hatalarını QR_Hata.txt'ye ana süreç iletir (işçiler dosyaya
+    aynı anda yazmaz). Her çizilen etiket kuyruğa (ad) olarak bildirilir; iptal_olayi
+    set edilirse durur.
+    """
+    global _isci_cizici
+    mesajlar = []
+    if _isci_cizici is None or (_isci_cizici.base_dir, _isci_cizici.qr_cizim) != (base_dir, qr_cizim):
+        _isci_cizici = EtiketCizici(base_dir, log=mesajlar.append, image_cache=resim_onbellegi(resim_verileri),
+                                    qr_cizim=qr_cizim)
+    _isci_cizici.log = mesajlar.append
+    _isci_cizici.create_pdf(etiket_data, output_path,
+                            ilerleme=lambda cizilen, toplam: kuyruk.put(ad),
+                            iptal=iptal_olayi.is_set)
+    return mesajlar, _isci_cizici.qr_hatalari
+
+
+def pdf_parcalari(etiket_data, output_path, jobs):
+    """Etiketleri paralel çizilecek parçalara böl: [(etiketler, parça dosyası)]
+
+    Küçük listeler ve pypdf yoksa tek parça (doğrudan output_path) döner.
+    """
+    parca_sayisi = min(jobs, len(etiket_data) // MIN_PARCA_BOYUTU)
+    if not PYPDF_AVAILABLE or parca_sayisi < 2:
+        return [(etiket_data, output_path)]
+    boyut = -(-len(etiket_data) // parca_sayisi)
+    return [(etiket_data[bas:bas + boyut], f"{output_path}.parca{no}.pdf")
+            for no, bas in enumerate(range(0, len(etiket_data), boyut))]
+
+
+def pdf_birlestir(parca_yollari, output_path):
+    """Parça PDF'lerini sırayla tek dosyada birleştir ve parçaları sil"""
+    writer = PdfWriter()
+    for yol in parca_yollari:
+        writer.append(yol)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+    for yol in parca_yollari:
+        os.remove(yol)
+
+
+class IlerlemeSayaci:
+    """Çizilen etiket sayısı ve kalan süre tahmini"""
+
+    def __init__(self, toplam, bildir=None):
+        self.toplam = toplam
+        self.cizilen = 0
+        self.bildir = bildir
+        self.baslangic = time.perf_counter()
+
+    def ekle(self, adet=1):
+        self.cizilen += adet
+        if self.bildir is not None:
+            self.bildir(self.cizilen, self.toplam, self.kalan_sure())
+
+    def kalan_sure(self):
+        """Tahmini kalan süre (saniye) - henüz etiket çizilmediyse None"""
+        if self.cizilen == 0:
+            return None
+        gecen = time.perf_counter() - self.baslangic
+        return gecen / self.cizilen * (self.toplam - self.cizilen)
+
+
+def _dosyalari_sil(yollar):
+    for yol in yollar:
+        try:
+            os.remove(yol)
+        except OSError:
+            pass
+
+
+def paralel_pdf_olustur(isler, base_dir=None, jobs=None, log=print, qr_cizim=None, resim_verileri=None,
+                        ilerleme=None, iptal=None, zorla=False):
+    """PDF'leri (EXC, SUBE) işçi süreçlerde aynı anda çiz
+
+    Belgeler önce <hedef>.yeni dosyalarına yazılır; hepsi bitince hedeflerin yerine
+    konur. İptal veya hata durumunda geçici dosyalar silinir, hedefler değişmez.
+
+    Args:
+        isler: [(ad, etiket_data, output_path)]
+        jobs: İşçi süreç sayısı (None = işlemci sayısı, 1 = bu süreçte sırayla)
+        log: Mesaj fonksiyonu (ana süreçte çağrılır)
+        resim_verileri: sabit_resim_verileri() sonucu (None = burada yüklenir)
+        ilerleme: ilerleme(cizilen, toplam, kalan_saniye) - kalan_saniye None olabilir
+        iptal: Periyodik olarak sorulur; True dönerse çizim durur ve IptalEdildi fırlatılır
+        zorla: True ise etiketleri değişmemiş PDF'ler de yeniden çizilir
+    """
+    base_dir = base_dir or get_base_dir()
+    jobs = jobs or os.cpu_count() or 1
+    if resim_verileri is None:
+        resim_verileri = sabit_resim_verileri(log, base_dir)
+
+    # Etiket özetleri - değişen etiketleri raporla, hiç değişmemiş PDF'leri atla
+    ozetler = etiket_ozetlerini_yukle(base_dir)
+    ortam = ortam_ozeti(resim_verileri, qr_cizim)
+    yeni_ozetler = {}
+    cizilecek = []
+    for ad, etiket_data, output_path in isler:
+        etiketler = [[etiket['kategori'], etiket['koleksiyon_adi'], etiket_ozeti(etiket, ortam)]
+                     for etiket in etiket_data]
+        onceki = ozetler.get(os.path.abspath(output_path))
+        log(degisiklik_raporu(ad, onceki, etiketler))
+        if (not zorla and onceki and onceki.get("etiketler") == etiketler
+                and onceki.get("pdf") is not None and onceki.get("pdf") == pdf_durumu(output_path)):
+            log(f"♻️ {ad} PDF güncel, yeniden çizilmedi: {output_path}")
+            # Çizilmeyen etiketlerin QR hataları da listelenmeli (çağıran dosyayı temizledi)
+            qr_hatalarini_yaz(base_dir, [qr_hata_satiri(etiket) for etiket in etiket_data
+                                         if not etiket['data']['etiket_listesi']['takim_sku'].get('url')])
+            continue
+        yeni_ozetler[os.path.abspath(output_path)] = etiketler
+        cizilecek.append((ad, etiket_data, output_path))
+    isler = cizilecek
+
+    # Atlanan belgeler ilerlemeye dahil edilmez (kalan süre sadece çizilenlerden hesaplanır)
+    sayac = IlerlemeSayaci(sum(len(etiket_data) for _, etiket_data, _ in isler), ilerleme)
+
+    yeni_dosyalar = {ad: output_path + ".yeni" for ad, _, output_path in isler}
+    parcalar = {ad: pdf_parcalari(etiket_data, yeni_dosyalar[ad], jobs) for ad, etiket_data, _ in isler}
+
+    try:
+        if jobs <= 1:
+            cizici = EtiketCizici(base_dir, log=log, image_cache=resim_onbellegi(resim_verileri), qr_cizim=qr_cizim)
+            for ad, etiket_data, _ in isler:
+                cizici.create_pdf(etiket_data, yeni_dosyalar[ad], ilerleme=lambda cizilen, toplam: sayac.ekle(),
+                                  iptal=iptal)
+                qr_hatalarini_yaz(base_dir, cizici.qr_hatalari)
+                log(f"✅ {ad} PDF çizildi ({len(etiket_data)} etiket)")
+        elif isler:
+            _havuzda_ciz(parcalar, yeni_dosyalar, base_dir, jobs, log, qr_cizim, resim_verileri, sayac, iptal)
+
+        # Tüm belgeler hazır - hedeflerin yerine koy
+        for ad, _, output_path in isler:
+            try:
+                os.replace(yeni_dosyalar[ad], output_path)
+            except PermissionError as e:
+                raise PermissionError(f"{output_path} yazılamadı (PDF başka bir programda açık olabilir): {e}")
+            ozetler[os.path.abspath(output_path)] = {"etiketler": yeni_ozetler[os.path.abspath(output_path)],
+                                                     "pdf": pdf_durumu(output_path)}
+    except BaseException:
+        _dosyalari_sil(list(yeni_dosyalar.values()) +
+                       [yol for ad_parcalari in parcalar.values() for _, yol in ad_parcalari])
+        raise
+    finally:
+        # Yerine konan PDF'lerin özetleri (hata olsa da tamamlananlar kaydedilir)
+        if isler:
+            try:
+                json_yaz_atomik(os.path.join(base_dir, ETIKET_OZET_DOSYASI), ozetler)
+            except OSError as e:
+                log(f"⚠️ Etiket özetleri kaydedilemedi: {e}")
+
+
+def _havuzda_ciz(parcalar, hedefler, base_dir, jobs, log, qr_cizim, resim_verileri, sayac, iptal):
+    """Parçaları işçi süreçlerde çiz, ilerlemeyi kuyruktan topla, bitenleri birleştir"""
+    biten = {ad: 0 for ad in parcalar}
+    isci_sayisi = min(jobs, sum(len(p) for p in parcalar.values()))
+
+    with Manager() as yonetici, ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+        kuyruk = yonetici.Queue()
+        iptal_olayi = yonetici.Event()
+
+        gorevler = {}
+        for ad, ad_parcalari in parcalar.items():
+            for etiketler, parca_yolu in ad_parcalari:
+                gorev = havuz.submit(_parca_ciz, base_dir, qr_cizim, resim_verileri, etiketler, parca_yolu,
+                                     ad, kuyruk, iptal_olayi)
+                gorevler[gorev] = (ad, len(etiketler))
+
+        bekleyen = set(gorevler)
+        hata = None
+        while bekleyen:
+            if iptal is not None and iptal() and not iptal_olayi.is_set():
+                iptal_olayi.set()
+                log("⏹ İptal ediliyor...")
+            bitenler, bekleyen = wait(bekleyen, timeout=0.2, return_when=FIRST_COMPLETED)
+
+            # İşçilerin bildirdiği etiketler
+            adet = 0
+            while True:
+                try:
+                    kuyruk.get_nowait()
+                except queue.Empty:
+                    break
+                adet += 1
+            if adet:
+                sayac.ekle(adet)
+
+            for gorev in bitenler:
+                ad, etiket_sayisi = gorevler[gorev]
+                try:
+                    mesajlar, qr_hatalari = gorev.result()
+                except Exception as e:
+                    # İlk hatada diğer işçileri durdur (hata hepsi bitince fırlatılır;
+                    # gerçek hata, diğer işçilerin IptalEdildi'sine tercih edilir)
+                    if hata is None or (isinstance(hata, IptalEdildi) and not isinstance(e, IptalEdildi)):
+                        hata = e
+                    iptal_olayi.set()
+                    continue
+                for mesaj in mesajlar:
+                    log(f"[{ad}] {mesaj}")
+                qr_hatalarini_yaz(base_dir, qr_hatalari)
+                biten[ad] += 1
+                if len(parcalar[ad]) > 1:
+                    log(f"{ad}: parça {biten[ad]}/{len(parcalar[ad])} tamamlandı ({etiket_sayisi} etiket)")
+                if biten[ad] == len(parcalar[ad]):
+                    if len(parcalar[ad]) > 1:
+                        pdf_birlestir([yol for _, yol in parcalar[ad]], hedefler[ad])
+                    log(f"✅ {ad} PDF çizildi ({sum(len(e) for e, _ in parcalar[ad])} etiket)")
+
+        if hata is not None:
+            raise hata
+
+
+def ornek_etiketler(etiket_sayisi, seed=42):
+    """Benchmark için rastgele etiket verisi üret"""
+    rnd = random.Random(seed)
+    koleksiyonlar = ["ALFA", "BELLA", "CAPRİ", "DORA", "ELİT", "FİNO", "GÜNEŞ", "HAVVA", "İNCİ", "LOTUS"]
+    urunler = ["Karyola 160", "Baza 160", "6 Kapaklı Dolap", "Şifonyer", "Aynalı Konsol", "Komodin"]
+    etiketler = []
+    for i in range(etiket_sayisi):
+        koleksiyon = f"{rnd.choice(koleksiyonlar)} {i}"
+        urun_listesi = [{
+            'urun_adi_tam': f"{koleksiyon} {urun}",
+            'perakende_fiyat': rnd.randrange(5000, 60000),
+            'liste_fiyat': rnd.randrange(60000, 90000),
+        } for urun in rnd.sample(urunler, rnd.randint(3, len(urunler)))]
+        etiketler.append({
+            'kategori': "Yatak Odası",
+            'koleksiyon_adi': koleksiyon,
+            'data': {
+                'etiket_listesi': {
+                    'takim_sku': {
+                        'urun_adi_tam': f"{koleksiyon} Yatak Odası Takımı",
+                        'url': f"https://www.dogtas.com/{koleksiyon.lower().replace(' ', '-')}-yatak-odasi",
+                        'indirim_yuzde': rnd.choice([0, 10, 20, 30]),
+                    },
+                    'urunler': urun_listesi,
+                },
+                'Takım': {
+                    'products': [],
+                    'total_perakende_price': sum(u['perakende_fiyat'] for u in urun_listesi),
+                    'total_liste_price': sum(u['liste_fiyat'] for u in urun_listesi),
+                },
+            },
+        })
+    return etiketler
+
+
+def ornek_resim_verileri():
+    """Benchmark resimleri (ağa çıkmadan başlık ve logo yerine düz renkli resimler)"""
+    from PIL import Image
+    resimler = {}
+    for url, dosya_adi, boyut in [(ETIKET_BASLIK_URL, "etiket_baslik.png", (1180, 180)),
+                                  (YERLI_URETIM_URL, "yerli_uretim.jpg", (400, 120))]:
+        buff = BytesIO()
+        Image.new("RGB", boyut, (200, 30, 30)).save(buff, format="PNG")
+        resimler[resim_anahtari(url, dosya_adi)] = buff.getvalue()
+    return resimler
+
+
+def benchmark(etiket_sayisi, jobs=None, **ayarlar):
+    """Sabit katman (form / her sayfa) ve QR çizim yöntemlerini (vektör / raster) karşılaştır
+
+    QR önbelleği her denemede boştur (QR'lar yeniden üretilir).
+    ayarlar EtiketCizici'ye aynen geçirilir (sonraki seçenekleri de karşılaştırmak için).
+    """
+    etiketler = ornek_etiketler(etiket_sayisi)
+    resimler = ornek_resim_verileri()
+    denemeler = [
+        ("form + vektör QR", True, "vektor"),
+        ("form + raster QR", True, "raster"),
+        ("her sayfa + raster QR", False, "raster"),
+    ]
+    with tempfile.TemporaryDirectory() as klasor:
+        for ad, sabit_form, qr_cizim in denemeler:
+            cizici = EtiketCizici(klasor, log=lambda mesaj: None, image_cache=resim_onbellegi(resimler),
+                                  qr_onbellek=QrOnbellegi(), sabit_form=sabit_form, qr_cizim=qr_cizim, **ayarlar)
+            cikti = os.path.join(klasor, "bench.pdf")
+            baslangic = time.perf_counter()
+            cizici.create_pdf(etiketler, cikti)
+            sure = time.perf_counter() - baslangic
+            print(f"{ad:>21}: {sure:6.2f} s ({sure / etiket_sayisi * 1000:5.1f} ms/etiket) | "
+                  f"{os.path.getsize(cikti) / 1024:8.0f} KB ({etiket_sayisi} etiket)")
+
+        # Tablo stilleri: önbellekli / her etiket için yeniden (sadece draw_table süresi)
+        sureler = {}
+        for stil_onbellegi in (True, False):
+            cizici = EtiketCizici(klasor, log=lambda mesaj: None, qr_onbellek=QrOnbellegi(),
+                                  stil_onbellegi=stil_onbellegi, **ayarlar)
+            c = canvas.Canvas(os.path.join(klasor, "tablo.pdf"), pagesize=landscape(A4))
+            baslangic = time.perf_counter()
+            for etiket in etiketler:
+                cizici.draw_table(c, etiket, landscape(A4)[1])
+            sureler[stil_onbellegi] = time.perf_counter() - baslangic
+        print(f"{'draw_table':>21}: stil önbelleği {sureler[True]:5.2f} s, her etiket {sureler[False]:5.2f} s | "
+              f"tasarruf {(sureler[False] - sureler[True]) / etiket_sayisi * 1000 * 1000:6.0f} ms / 1000 etiket")
+
+        if jobs:
+            # EXC + SUBE (yarı yarıya) - 1 süreç ve jobs süreç ile duvar saati süresi
+            yari = etiket_sayisi // 2
+            for isci in sorted({1, jobs}):
+                # Her deneme ayrı klasörde (boş QR disk önbelleği ile)
+                isci_klasoru = os.path.join(klasor, f"jobs{isci}")
+                os.makedirs(isci_klasoru)
+                isler = [("EXC", etiketler[:yari], os.path.join(isci_klasoru, "exc.pdf")),
+                         ("SUBE", etiketler[yari:], os.path.join(isci_klasoru, "sube.pdf"))]
+                baslangic = time.perf_counter()
+                paralel_pdf_olustur(isler, base_dir=isci_klasoru, jobs=isci, log=lambda mesaj: None,
+                                    resim_verileri=resimler)
+                sure = time.perf_counter() - baslangic
+                print(f"{f'{isci} süreç (EXC+SUBE)':>21}: {sure:6.2f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="etiketCizim", description="Etiket PDF çizim benchmark")
+    parser.add_argument("--bench", type=int, default=1000, help="Benchmark etiket sayısı")
+    parser.add_argument("--jobs", type=int, default=None, help="Paralel çizim karşılaştırması için süreç sayısı")
+    args = parser.parse_args(argv)
+    benchmark(args.bench, jobs=args.jobs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""
+Etiket Deposu - etiketEkle.json için işlem günlüklü (journal) belge deposu
+
+etiketEkle.json anlık görüntü (snapshot) olarak kalır; kaydetmeler dosyayı baştan
+yazmak yerine yanındaki etiketEkle.json.journal dosyasına tek satırlık işlem olarak
+eklenir (koleksiyon/alan bazında upsert veya silme). Bir satır bir işlemdir: yarım
+yazılmış son satır okunurken atlanır, böylece çökme belgeyi bozmaz.
+
+Günlük belirli sayıda işleme ulaşınca anlık görüntü geçici dosyaya yazılıp
+os.replace ile değiştirilir ve günlük silinir (sıkıştırma). İşlemler aynı değeri
+yeniden yazdığı için sıkıştırma sırasında çökme olsa da günlüğün tekrar
+uygulanması güvenlidir.
+
+Günlüğe ekleme ve sıkıştırma etiketEkle.json.lock kilit dosyasıyla sıraya
+sokulur: başka bir süreç (fiyatGuncelle CLI vb.) anlık görüntü yazılıp günlük
+silinirken araya işlem ekleyemez (eklenen işlem kaybolmaz).
+
+Okuyan modüller dosyayı doğrudan değil EtiketDeposu.load() ile okumalıdır
+(günlükteki değişiklikler anlık görüntüye henüz yazılmamış olabilir).
+
+Komut satırı (mevcut JSON biçimine dışa/içe aktarma):
+    python -m etiketDeposu export cikti.json
+    python -m etiketDeposu import yedek.json
+    python -m etiketDeposu compact
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Günlük dosyası anlık görüntünün yanında bu uzantıyla tutulur
+GUNLUK_UZANTISI = ".journal"
+
+# Bu kadar işlemden sonra anlık görüntü yeniden yazılır ve günlük sıfırlanır
+SIKISTIRMA_ESIGI = 200
+
+# Günlük/anlık görüntü yazımını süreçler arasında sıraya sokan kilit dosyası
+KILIT_UZANTISI = ".lock"
+
+# Kilit için en fazla bekleme süresi ve çöken süreçten kalmış sayılacak kilit yaşı (saniye)
+KILIT_BEKLEME = 10
+ESKI_KILIT_SURESI = 60
+
+
+def get_base_dir():
+    """Exe veya script dizinini döndür"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def sirali_belge(data):
+    """Kategori ve koleksiyonları alfabetik sıralanmış yeni belge döndür"""
+    sorted_data = {}
+    for kategori in sorted(data.keys()):
+        sorted_data[kategori] = {}
+        for koleksiyon in sorted(data[kategori].keys()):
+            sorted_data[kategori][koleksiyon] = data[kategori][koleksiyon]
+    return sorted_data
+
+
+def json_yaz_atomik(dosya_yolu, data):
+    """JSON'u geçici dosyaya yaz, diske aktar ve os.replace ile yerine koy"""
+    klasor = os.path.dirname(dosya_yolu)
+    if klasor:
+        os.makedirs(klasor, exist_ok=True)
+    gecici = dosya_yolu + ".tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(gecici, dosya_yolu)
+
+
+def islem_uygula(data, islem):
+    """Tek bir günlük işlemini belgeye uygula
+
+    İşlem biçimi: {"op": "set" | "delete", "yol": [kategori, koleksiyon, (alan)], "deger": ...}
+    Koleksiyon silindiğinde kategori boş kalırsa kategori de silinir.
+    """
+    yol = islem["yol"]
+    if not 1 <= len(yol) <= 3:
+        raise ValueError(f"Geçersiz işlem yolu: {yol}")
+
+    if islem["op"] == "set":
+        hedef = data
+        for anahtar in yol[:-1]:
+            hedef = hedef.setdefault(anahtar, {})
+        hedef[yol[-1]] = islem["deger"]
+    elif islem["op"] == "delete":
+        hedef = data
+        for anahtar in yol[:-1]:
+            hedef = hedef.get(anahtar)
+            if hedef is None:
+                return
+        hedef.pop(yol[-1], None)
+        if len(yol) == 2 and yol[0] in data and not data[yol[0]]:
+            del data[yol[0]]
+    else:
+        raise ValueError(f"Bilinmeyen işlem: {islem['op']}")
+
+
+class EtiketDeposu:
+    """etiketEkle.json için anlık görüntü + günlük deposu
+
+    Belge bellekte tutulur (data); dosyalar başka bir yazıcı tarafından
+    değiştirilmediği sürece load() diski tekrar okumaz.
+    """
+
+    def __init__(self, json_file, sikistirma_esigi=SIKISTIRMA_ESIGI):
+        self.json_file = str(json_file)
+        self.journal_file = self.json_file + GUNLUK_UZANTISI
+        self.lock_file = self.json_file + KILIT_UZANTISI
+        self.sikistirma_esigi = sikistirma_esigi
+        self.data = None
+        self.surum = None  # Son okunan/yazılan dosya durumu (anlık görüntü mtime, günlük boyutu)
+        self.gunluk_islem_sayisi = 0
+
+    def dosya_surumu(self):
+        """Diskteki durumu temsil eden anahtar (başka yazıcıyı tespit etmek için)"""
+        try:
+            mtime = os.stat(self.json_file).st_mtime_ns
+        except OSError:
+            mtime = None
+        try:
+            gunluk_boyutu = os.path.getsize(self.journal_file)
+        except OSError:
+            gunluk_boyutu = 0
+        return (mtime, gunluk_boyutu)
+
+    def exists(self):
+        return os.path.exists(self.json_file) or os.path.exists(self.journal_file)
+
+    def degisti_mi(self):
+        """Dosyalar son okumadan/yazmadan sonra başka biri tarafından değişti mi?"""
+        return self.data is None or self.dosya_surumu() != self.surum
+
+    @contextmanager
+    def kilit(self):
+        """Günlüğe ekleme / sıkıştırma için süreçler arası kilit (kilit dosyası)"""
+        klasor = os.path.dirname(self.lock_file)
+        if klasor:
+            os.makedirs(klasor, exist_ok=True)
+        baslangic = time.monotonic()
+        while True:
+            try:
+                fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_file) > ESKI_KILIT_SURESI:
+                        # Çöken bir yazıcıdan kalmış kilit
+                        logging.warning(f"Eski kilit dosyası silindi ({self.lock_file})")
+                        os.remove(self.lock_file)
+                        continue
+                except OSError:
+                    continue  # Kilit bu arada bırakıldı - tekrar dene
+                if time.monotonic() - baslangic > KILIT_BEKLEME:
+                    raise TimeoutError(f"Etiket deposu kilitli (başka bir işlem yazıyor): {self.lock_file}")
+                time.sleep(0.05)
+        try:
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            os.close(fd)
+            yield
+        finally:
+            try:
+                os.remove(self.lock_file)
+            except OSError:
+                pass
+
+    def load(self, force=False):
+        """Anlık görüntüyü oku, günlüğü uygula ve belgeyi döndür (değişiklik yoksa bellekten)"""
+        if not force and not self.degisti_mi():
+            return self.data
+
+        surum = self.dosya_surumu()
+        if os.path.exists(self.json_file):
+            with open(self.json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            data = {}
+
+        islem_sayisi = 0
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for satir_no, satir in enumerate(f, 1):
+                    if not satir.strip():
+                        continue
+                    try:
+                        kayit = json.loads(satir)
+                    except ValueError:
+                        # Yarım kalmış yazma - bu işlem hiç yapılmamış sayılır
+                        logging.warning(f"Günlükte bozuk satır atlandı ({self.journal_file}:{satir_no})")
+                        continue
+                    for islem in kayit.get("islemler", []):
+                        islem_uygula(data, islem)
+                    islem_sayisi += 1
+
+        self.data = data
+        self.surum = surum
+        self.gunluk_islem_sayisi = islem_sayisi
+        return data
+
+    def commit(self, islemler):
+        """İşlemleri tek günlük satırı olarak ekle ve belleğe uygula (atomik)"""
+        if not islemler:
+            return
+
+        satir = json.dumps({
+            "zaman": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "islemler": islemler
+        }, ensure_ascii=False)
+
+        with self.kilit():
+            data = self.load()
+            with open(self.journal_file, 'a+b') as f:
+                # Yarım kalmış son satır varsa yeni işlem aynı satıra eklenmesin (yoksa o da atlanır)
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write((satir + "\n").encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+
+            for islem in islemler:
+                islem_uygula(data, islem)
+            self.surum = self.dosya_surumu()
+            self.gunluk_islem_sayisi += 1
+
+        if self.gunluk_islem_sayisi >= self.sikistirma_esigi:
+            self.compact()
+
+    def alan_kaydet(self, kategori, koleksiyon, alan, deger):
+        """Koleksiyondaki tek bir alanı (etiket_listesi veya takım) kaydet"""
+        self.commit([{"op": "set", "yol": [kategori, koleksiyon, alan], "deger": deger}])
+
+    def koleksiyonlari_kaydet(self, anahtarlar):
+        """Bellekte değiştirilmiş koleksiyonları günlüğe yaz (belgede olmayanlar silinir)
+
+        Args:
+            anahtarlar: (kategori, koleksiyon) anahtarları
+        """
+        data = self.data if self.data is not None else self.load()
+        islemler = []
+        for kategori, koleksiyon in sorted(anahtarlar):
+            if koleksiyon in data.get(kategori, {}):
+                islemler.append({"op": "set", "yol": [kategori, koleksiyon], "deger": data[kategori][koleksiyon]})
+            else:
+                islemler.append({"op": "delete", "yol": [kategori, koleksiyon]})
+        self.commit(islemler)
+
+    def _anlik_goruntu_yaz(self, data):
+        """Anlık görüntüyü yaz ve günlüğü sil - kilit alınmışken çağrılmalı"""
+        json_yaz_atomik(self.json_file, sirali_belge(data))
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.data = data  # Aynı nesne korunur (modüllerdeki referanslar geçerli kalır)
+        self.surum = self.dosya_surumu()
+        self.gunluk_islem_sayisi = 0
+
+    def write_all(self, data):
+        """Tüm belgeyi anlık görüntü olarak yaz ve günlüğü sıfırla"""
+        with self.kilit():
+            self._anlik_goruntu_yaz(data)
+
+    def compact(self):
+        """Günlüğü anlık görüntüye işle
+
+        Belge kilit altında yeniden okunur; başka bir sürecin eklediği işlemler de
+        anlık görüntüye girer, silinen günlükte işlenmemiş satır kalmaz.
+        """
+        with self.kilit():
+            self._anlik_goruntu_yaz(self.load())
+        logging.info(f"Etiket deposu sıkıştırıldı: {self.json_file}")
+
+    def export_json(self, hedef_dosya):
+        """Güncel belgeyi mevcut JSON biçiminde başka bir dosyaya yaz"""
+        json_yaz_atomik(str(hedef_dosya), sirali_belge(self.load()))
+
+    def import_json(self, kaynak_dosya):
+        """JSON dosyasını içe aktar (mevcut belgenin yerine geçer)"""
+        with open(kaynak_dosya, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("JSON kök nesnesi bir sözlük olmalı")
+        self.write_all(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="etiketDeposu", description="etiketEkle.json deposu")
+    parser.add_argument("--json", default=os.path.join(get_base_dir(), "etiketEkle.json"),
+                        help="etiketEkle.json yolu")
+    subparsers = parser.add_subparsers(dest="komut", required=True)
+    p_export = subparsers.add_parser("export", help="Güncel belgeyi JSON dosyasına aktar")
+    p_export.add_argument("hedef")
+    p_import = subparsers.add_parser("import", help="JSON dosyasını depoya aktar (mevcut belge değişir)")
+    p_import.add_argument("kaynak")
+    subparsers.add_parser("compact", help="Günlüğü anlık görüntüye işle")
+    args = parser.parse_args(argv)
+
+    depo = EtiketDeposu(args.json)
+    if args.komut == "export":
+        depo.export_json(args.hedef)
+        print(f"[OK] {args.hedef} yazıldı")
+    elif args.komut == "import":
+        depo.import_json(args.kaynak)
+        print(f"[OK] {args.kaynak} içe aktarıldı")
+    else:
+        depo.compact()
+        print(f"[OK] {args.json} sıkıştırıldı")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
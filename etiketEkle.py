@@ -5,8 +5,6 @@ Doğtaş Etiket Listesi - Ürün seçimi ve etiket oluşturma
 import sys
 import os
 
-import re
-import json
 from datetime import datetime
 from pathlib import Path
 import warnings
@@ -14,18 +12,26 @@ import pandas as pd
 import numpy as np
 import requests
 from io import BytesIO
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import (Qt, QTimer, QAbstractTableModel, QSortFilterProxyModel,
+                          QModelIndex, pyqtSignal)
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QApplication, QMainWindow, QFrame,
-                             QTableWidget, QTableWidgetItem, QLineEdit, QCheckBox,
+                             QTableView, QLineEdit, QSpinBox, QStyledItemDelegate,
                              QComboBox, QMessageBox, QHeaderView, QRadioButton, QButtonGroup,
                              QListWidget, QAbstractItemView)
 from PyQt5.QtGui import QFont, QColor
 import logging
 from config import SPREADSHEET_ID
+from urunArama import UrunAramaIndeksi, AramaOnbellegi, turkce_normalize
+from etiketBelgesi import EtiketBelgesi
+from takimKurallari import (TakimKuralMotoru, KURAL_DOSYASI, KURAL_ONBELLEK_DOSYASI,
+                            toplu_takim_onerileri, toplu_takim_farki, toplu_takim_islemleri)
 
 warnings.filterwarnings('ignore')
 
+# Tablo sıralaması için model rolü (seçililer önce, sonra alfabetik)
+SORT_ROLE = Qt.UserRole + 1
+
 
 def get_base_dir():
     """Exe veya script dizinini döndür"""
@@ -75,10 +81,216 @@ def setup_data_file(filename):
     return target_file
 
 
+class UrunTableModel(QAbstractTableModel):
+    """DogtasCom kataloğu için tablo modeli - Seç (checkbox) + Miktar + katalog sütunları
+
+    Satırlar bir kez yüklenir; filtreleme/sıralama UrunFilterProxyModel üzerinden yapılır.
+    Seçim durumunun tek kaynağı SKU kümesi (secili_skular) ve miktar sözlüğüdür;
+    seçili satır sayısı her değişiklikte güncellenir (tablo taranmaz).
+    """
+    checkbox_toggled = pyqtSignal()  # Kullanıcı bir checkbox'ı değiştirdiğinde
+
+    # Sütun sıralaması: Seç, Miktar, urun_adi, urun_adi_tam, LISTE, PERAKENDE, kategori, KOLEKSIYON, urun_url
+    COLUMN_ORDER = ["urun_adi", "urun_adi_tam", "LISTE", "PERAKENDE", "kategori", "KOLEKSIYON", "urun_url"]
+
+    # Başlık isimleri
+    HEADER_LABELS = {
+        "urun_adi": "Ürün Adı",
+        "urun_url": "URL",
+        "urun_adi_tam": "Malzeme Adı",
+        "LISTE": "LISTE",
+        "PERAKENDE": "PERAKENDE",
+        "kategori": "Kategori",
+        "KOLEKSIYON": "KOLEKSIYON"
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.secili_skular = set()  # İşaretli SKU'lar
+        self.miktar_state = {}      # {sku: "miktar"}
+        self.secili_satir_sayisi = 0  # İşaretli SKU'lara ait satır sayısı
+        self.sku_satir_sayisi = {}  # {sku: katalogdaki satır sayısı}
+        self.rows = []
+        self.skus = []        # Satır bazında SKU (strip edilmiş)
+        self.alpha_rank = []  # Satır bazında malzeme adına göre alfabetik sıra
+        self.data_keys = []
+        self.headers = []
+
+        # Tek font nesnesi (her hücre için yeni QFont oluşturma)
+        self.font = QFont()
+        self.font.setPointSize(15)
+        self.font.setBold(True)
+
+    def set_rows(self, rows):
+        """Katalog satırlarını yükle (sadece veri yenilendiğinde çağrılır)"""
+        self.beginResetModel()
+        self.rows = rows
+        self.skus = [str(row.get('sku', '')).strip() for row in rows]
+        self.sku_satir_sayisi = {}
+        for sku in self.skus:
+            self.sku_satir_sayisi[sku] = self.sku_satir_sayisi.get(sku, 0) + 1
+        self.secili_satir_sayisi = sum(self.sku_satir_sayisi.get(sku, 0) for sku in self.secili_skular)
+
+        # Alfabetik sıra önceden hesaplanır, sıralama sırasında string karşılaştırılmaz
+        sirali = sorted(range(len(rows)), key=lambda i: str(rows[i].get('urun_adi_tam', '')).lower())
+        self.alpha_rank = [0] * len(rows)
+        for rank, i in enumerate(sirali):
+            self.alpha_rank[i] = rank
+
+        # Mevcut sütunları kontrol et ve sıralı listeyi oluştur
+        all_keys = set(rows[0].keys()) if rows else set()
+        self.data_keys = [key for key in self.COLUMN_ORDER if key in all_keys]
+
+        # Eksik sütunları sona ekle
+        for key in all_keys:
+            if key not in self.data_keys:
+                self.data_keys.append(key)
+
+        # Header listesi oluştur - Seç, Miktar + diğerleri
+        self.headers = ["Seç", "Miktar"] + [self.HEADER_LABELS.get(key, key) for key in self.data_keys]
+        self.endResetModel()
+
+    def is_checked(self, sku):
+        return sku in self.secili_skular
+
+    def set_checked(self, sku, checked):
+        """SKU'yu işaretle/işareti kaldır ve sayacı güncelle (görünüm için refresh_states çağrılmalı)"""
+        if checked and sku not in self.secili_skular:
+            self.secili_skular.add(sku)
+            self.secili_satir_sayisi += self.sku_satir_sayisi.get(sku, 0)
+        elif not checked and sku in self.secili_skular:
+            self.secili_skular.discard(sku)
+            self.secili_satir_sayisi -= self.sku_satir_sayisi.get(sku, 0)
+
+    def clear_checked(self):
+        """Tüm işaretleri kaldır"""
+        self.secili_skular.clear()
+        self.secili_satir_sayisi = 0
+
+    def miktar(self, sku):
+        return self.miktar_state.get(sku, "1")
+
+    def refresh_states(self):
+        """Seçim/miktar durumları toplu değiştirildiğinde görünümü güncelle"""
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self.headers):
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+        if index.column() == 1:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+        sku = self.skus[row]
+
+        if column == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if sku in self.secili_skular else Qt.Unchecked
+            if role == SORT_ROLE:
+                # Sıralama: Önce checkbox işaretliler, sonra alfabetik
+                return self.alpha_rank[row] + (0 if sku in self.secili_skular else len(self.rows))
+            return None
+
+        if role == Qt.FontRole:
+            return self.font
+
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+
+        if column == 1:
+            # Miktar sütunu - global değeri kullan
+            return self.miktar(sku)
+
+        value = self.rows[row].get(self.data_keys[column - 2], "")
+
+        # Sayısal değerlerde .0 ifadesini kaldır
+        if isinstance(value, (int, float)):
+            if isinstance(value, float) and value.is_integer():
+                return str(int(value))
+            return str(value)
+        if value is None or pd.isna(value):
+            return ""
+        return str(value)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+
+        sku = self.skus[index.row()]
+        if index.column() == 0 and role == Qt.CheckStateRole:
+            self.set_checked(sku, value == Qt.Checked)
+            self.dataChanged.emit(index, index)
+            self.checkbox_toggled.emit()
+            return True
+
+        if index.column() == 1 and role == Qt.EditRole:
+            self.miktar_state[sku] = str(value)
+            self.dataChanged.emit(index, index)
+            return True
+
+        return False
+
+
+class UrunFilterProxyModel(QSortFilterProxyModel):
+    """Görünür satırları (filter_data sonucu) süzen ve seçilileri üste alan proxy"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.visible_rows = None  # Kaynak satır indeksleri kümesi (None = hepsi)
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)  # Checkbox değişince sadece o satır yer değiştirir
+
+    def set_visible_rows(self, rows):
+        """Filtre sonucunu uygula (None = tüm satırlar)"""
+        self.visible_rows = None if rows is None else set(rows)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.visible_rows is None or source_row in self.visible_rows
+
+
+class MiktarDelegate(QStyledItemDelegate):
+    """Miktar sütunu için sayı düzenleyici"""
+
+    def createEditor(self, parent, option, index):
+        editor = QSpinBox(parent)
+        editor.setRange(1, 999)
+        editor.setFont(index.data(Qt.FontRole) or editor.font())
+        return editor
+
+    def setEditorData(self, editor, index):
+        text = index.data(Qt.EditRole)
+        editor.setValue(int(text) if text and text.isdigit() else 1)
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, str(editor.value()), Qt.EditRole)
+
+
 class EtiketListesiWindow(QMainWindow):
     """Etiket Listesi penceresi - stok_module.py ve ssh_module.py stilinde"""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, belge=None):
         super().__init__(parent)
         self.setWindowTitle("Etiket Listesi")
 
@@ -89,136 +301,31 @@ class EtiketListesiWindow(QMainWindow):
         # Data
         self.original_data = []
         self.filtered_data = []
+        self.filtered_rows = None  # filter_data sonucu kaynak satır indeksleri (None = hepsi)
+        self.arama_indeksi = UrunAramaIndeksi([])  # Ürün adı kelime indeksi + sıralı SKU dizisi
+        self.arama_onbellegi = AramaOnbellegi()  # (sorgu, kategori, koleksiyon) -> satır indeksleri (LRU)
+
+        # Yüklemede bir kez oluşturulan kategori/koleksiyon indeksleri
+        self.kategori_koleksiyonlari = {}  # {kategori: {koleksiyon}} - ComboBox'lar için (boş değerler hariç)
+        self.kategori_satirlari = {}  # {kategori: [satır indeksleri]}
+        self.koleksiyon_satirlari = {}  # {(kategori, koleksiyon): [satır indeksleri]}
         self.current_kategori = None
         self.current_koleksiyon = None
         self.current_takim = None
 
-        # Checkbox ve miktar durumlarını saklamak için (SKU bazında)
-        self.checked_state = {}  # {sku: True/False}
-        self.miktar_state = {}   # {sku: "miktar"}
+        # Checkbox ve miktar durumları (SKU bazında) UrunTableModel içinde tutulur:
+        # table_model.secili_skular, table_model.miktar_state
 
         # JSON dosya yolu - PyInstaller uyumlu
         self.json_file = setup_data_file("etiketEkle.json")
+        # Paylaşılan belge (MainWindow verir; tek başına çalışırken kendi belgesini açar)
+        self.belge = belge if belge is not None else EtiketBelgesi(self.json_file, self)
 
-        # Yatak Odası takım kombinasyonları tanımlamaları (Regex pattern'ler)
-        self.yatak_odasi_kombinasyonlari = {
-            "6 Kapaklı, Karyola": {
-                "aranacak_urunler": [
-                    r"(?i)\b6\s*kapak(lı)?\b",
-                    r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
-                    r"(?i)^(?!.*180)(?!.*Baza)(?!.*Başlıklı).*Karyola.*160.*$",
-                    r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
-                    r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
-                    r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
-
-                ],
-                "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
-            },
-            "6 Kapaklı, Baza": {
-                "aranacak_urunler": [
-                    r"(?i)\b6\s*kapak(lı)?\b",
-                    r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
-                    r"(?i)^(?!.*başlıklı)(?=.*baza)(?=.*160).*$",
-                    r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
-                    r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
-                    r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
-                ],
-                "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
-            },
-            "5 Kapaklı, Karyola": {
-                "aranacak_urunler": [
-                    r"(?i)\b5\s*kapak(lı)?\b",
-                    r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
-                    r"(?i)^(?!.*180)(?!.*Baza)(?!.*Başlıklı).*Karyola.*160.*$",
-                    r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
-                    r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
-                    r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
-                ],
-                "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
-            },
-            "5 Kapaklı, Baza": {
-                "aranacak_urunler": [
-                    r"(?i)\b5\s*kapak(lı)?\b",
-                    r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
-                    r"(?i)^(?!.*başlıklı)(?=.*baza)(?=.*160).*$",
-                    r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
-                    r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
-                    r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
-                ],
-
-                "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
-            }
-        }
-
-        # Yemek Odası takım kombinasyonları tanımlamaları (Regex pattern'ler)
-        self.yemek_odasi_kombinasyonlari = {
-            "Konsol, Açılır, Sandalye*6": {
-                "aranacak_urunler": [
-                    r"(?i)^(?!.*ayna)(?!.*mini)(?=.*konsol).*$",
-                    r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
-                    r"(?i)^(?!.*sabit)(?=.*yemek)(?=.*açılır).*$",
-                    r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
-                ],
-                "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
-            },
-            "Konsol, Sabit, Sandalye*6": {
-                "aranacak_urunler": [
-                    r"(?i)^(?!.*ayna)(?!.*mini)(?=.*konsol).*$",
-                    r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
-                    r"(?i)^(?!.*açılır)(?=.*yemek)(?=.*sabit).*$",
-                    r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
-                ],
-                "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
-            },
-            "Açılır, Sandalye*6": {
-                "aranacak_urunler": [
-                    r"(?i)^(?!.*sabit)(?=.*yemek)(?=.*açılır).*$",
-                    r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
-                ],
-                "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
-            },
-            "Sabit, Sandalye*6": {
-                "aranacak_urunler": [
-                    r"(?i)^(?!.*açılır)(?=.*yemek)(?=.*sabit).*$",
-                    r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
-                ],
-                "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
-            }
-        }
-
-        # Oturma Grubu takım kombinasyonları tanımlamaları (Regex pattern'ler)
-        self.oturma_grubu_kombinasyonlari = {
-            "Üçlü*2, Berjer*2": {
-                "aranacak_urunler": [
-                    r"(?i)^(?=.*(berjer|tekli)).*$",
-                    r"(?i)^(?=.*(üçlü)).*$"
-                ],
-                "adet": {
-                    r"(?i)^(?=.*(berjer|tekli)).*$": 2,
-                    r"(?i)^(?=.*(üçlü)).*$": 2
-                }
-            }
-        }
-
-        # Genç Odası takım kombinasyonları tanımlamaları (Regex pattern'ler)
-        self.genc_odasi_kombinasyonlari = {
-            "3 Kapaklı, 100 Karyola, Çalışma Masası": {
-                "aranacak_urunler": [
-                    r"(?i).*(3\s*kapa|3\s*kapı).*dolap.*",
-                    r"(?i)^(?=.*(ba(ş|s)l(ı|i)k|100))(?!.*başlıksız)(?!.*karyola).*",
-                    r"(?i)^(?=.*karyola)(?=.*100)(?!.*baza)(?=.*(başlıksız|kasa))?.*",
-                    r"(?i)^(?=.*(çalışma|calısma))(?=.*masa)(?!.*üst)(?!.*modül)(?!.*eko)(?!.*kompakt).*"
-                ]
-            },
-            "3 Kapaklı, 100 Baza, Çalışma Masası": {
-                "aranacak_urunler": [
-                    r"(?i).*(3\s*kapa|3\s*kapı).*dolap.*",
-                    r"(?i)^(?=.*(başlık|100))(?!.*başlıksız)(?!.*karyola).*",
-                    r"(?i)^(?=.*baza)(?=.*100).*",
-                    r"(?i)^(?=.*(çalışma|calısma))(?=.*masa)(?!.*üst)(?!.*modül)(?!.*eko)(?!.*kompakt).*"
-                ]
-            }
-        }
+        # Takım kombinasyonları - exe'nin yanındaki kural dosyasından okunur, değişince yeniden yüklenir
+        self.takim_kurallari = TakimKuralMotoru(
+            dosya_yolu=os.path.join(get_base_dir(), KURAL_DOSYASI),
+            onbellek_yolu=os.path.join(get_base_dir(), KURAL_ONBELLEK_DOSYASI))
+        self.katalog_surumu = 0  # Her veri yüklemesinde artar (kural eşleşme önbelleği için)
 
         # UI setup
         self.setup_ui()
@@ -406,7 +513,7 @@ class EtiketListesiWindow(QMainWindow):
         self.takim_button_group = QButtonGroup()
         self.takim_radios = {}
 
-        takimlar = ["6 Kapaklı, Karyola", "6 Kapaklı, Baza", "5 Kapaklı, Karyola", "5 Kapaklı, Baza"]
+        takimlar = self.takim_kurallari.takim_adlari("Yatak Odası")
         for i, takim_adi in enumerate(takimlar):
             radio = QRadioButton(takim_adi)
             radio.setStyleSheet("""
@@ -565,23 +672,58 @@ class EtiketListesiWindow(QMainWindow):
         """)
         save_json_btn.clicked.connect(self.save_selection_to_json)
 
+        # Toplu Takım butonu (seçili preset'i kategorideki tüm koleksiyonlara uygular)
+        toplu_takim_btn = QPushButton("Toplu Takım (Kategori)")
+        toplu_takim_btn.setToolTip("Seçili takım preset'ini kategorideki tüm koleksiyonlara uygular, farkı gösterir ve tek seferde kaydeder")
+        toplu_takim_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #17a2b8;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 8px 16px;
+                font-size: 14px;
+                font-weight: bold;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background-color: #1fc8e3;
+            }
+            QPushButton:pressed {
+                background-color: #117a8b;
+            }
+        """)
+        toplu_takim_btn.clicked.connect(self.save_toplu_takim_to_json)
+
         button_layout.addWidget(save_etiket_btn)
         button_layout.addWidget(save_json_btn)
+        button_layout.addWidget(toplu_takim_btn)
         button_layout.addStretch()
 
         main_layout.addLayout(button_layout)
 
-        # Tablo
-        self.table = QTableWidget()
-        self.table.setEditTriggers(QTableWidget.DoubleClicked | QTableWidget.EditKeyPressed)
+        # Tablo (model/proxy - satırlar bir kez oluşturulur, sadece görünenler çizilir)
+        self.table_model = UrunTableModel(self)
+        self.table_model.checkbox_toggled.connect(self.on_checkbox_changed)
+        self.table_proxy = UrunFilterProxyModel(self)
+        self.table_proxy.setSourceModel(self.table_model)
+
+        self.table = QTableView()
+        self.table.setModel(self.table_proxy)
+        self.table.setItemDelegateForColumn(1, MiktarDelegate(self.table))
+        self.table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
         self.table.verticalHeader().setDefaultSectionSize(
             self.table.verticalHeader().defaultSectionSize() + 2
         )
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 font-size: 15px;
                 font-weight: bold;
             }
+            QTableView::indicator {
+                width: 18px;
+                height: 18px;
+            }
         """)
         main_layout.addWidget(self.table)
 
@@ -632,7 +774,24 @@ class EtiketListesiWindow(QMainWindow):
             # Kategori radio butonlarını oluştur
             self.populate_kategori_radios()
 
+            # Arama indeksini bir kez oluştur (her tuş vuruşunda satırlar taranmaz)
+            self.arama_indeksi = UrunAramaIndeksi(self.original_data)
+            self.arama_onbellegi.clear()
+
+            # Kategori → koleksiyon ve (kategori, koleksiyon) → satır indekslerini oluştur
+            self.build_kategori_indexes()
+
+            # Yeni katalog sürümü - takım kuralı eşleşmeleri yeniden hesaplanır
+            self.katalog_surumu += 1
+            self.takim_kurallari.katalog_ayarla(self.original_data, self.katalog_surumu)
+
+            # Tablo modelini doldur (filtre/sıralama değişikliklerinde yeniden oluşturulmaz)
+            self.table_model.set_rows(self.original_data)
+            self.table_proxy.sort(0, Qt.AscendingOrder)
+            self.setup_table_columns()
+
             # Tabloyu güncelle
+            self.filtered_rows = None
             self.filtered_data = self.original_data.copy()
             self.update_table()
 
@@ -644,19 +803,38 @@ class EtiketListesiWindow(QMainWindow):
             self.status_label.setText(f"❌ {error_msg}")
             QMessageBox.critical(self, "Hata", f"Google Sheets'ten veri yüklenemedi:\n{error_msg}")
 
+    def build_kategori_indexes(self):
+        """Kategori ve koleksiyon indekslerini oluştur (sadece veri yüklendiğinde)"""
+        self.kategori_koleksiyonlari = {}
+        self.kategori_satirlari = {}
+        self.koleksiyon_satirlari = {}
+
+        for row_idx, row in enumerate(self.original_data):
+            if 'kategori' not in row:
+                continue
+
+            kategori = str(row['kategori'])
+            self.kategori_satirlari.setdefault(kategori, []).append(row_idx)
+
+            # ComboBox'ta boş kategori gösterilmez
+            if row['kategori']:
+                koleksiyonlar = self.kategori_koleksiyonlari.setdefault(kategori, set())
+            else:
+                koleksiyonlar = None
+
+            if 'KOLEKSIYON' in row:
+                koleksiyon = str(row['KOLEKSIYON']).strip()
+                self.koleksiyon_satirlari.setdefault((kategori, koleksiyon), []).append(row_idx)
+                if koleksiyonlar is not None and row['KOLEKSIYON'] and koleksiyon:
+                    koleksiyonlar.add(koleksiyon)
+
     def populate_kategori_radios(self):
         """Kategorileri ComboBox olarak doldur"""
-        # Kategorileri topla
-        kategoriler = set()
-        for row in self.original_data:
-            if 'kategori' in row and row['kategori']:
-                kategoriler.add(str(row['kategori']))
-
         # Kategori ComboBox'ını doldur
         self.kategori_combo.blockSignals(True)
         self.kategori_combo.clear()
         self.kategori_combo.addItem("")  # Boş seçenek
-        for kategori in sorted(kategoriler):
+        for kategori in sorted(self.kategori_koleksiyonlari):
             self.kategori_combo.addItem(kategori)
         self.kategori_combo.blockSignals(False)
 
@@ -690,14 +868,8 @@ class EtiketListesiWindow(QMainWindow):
 
     def update_koleksiyon_list(self, kategori):
         """Seçilen kategoriye göre koleksiyon ComboBox'ını güncelle"""
-        # Koleksiyonları topla
-        koleksiyonlar = set()
-        for row in self.original_data:
-            if 'kategori' in row and str(row['kategori']) == kategori:
-                if 'KOLEKSIYON' in row and row['KOLEKSIYON']:
-                    koleksiyon = str(row['KOLEKSIYON']).strip()
-                    if koleksiyon:
-                        koleksiyonlar.add(koleksiyon)
+        # Koleksiyonları indeksten al
+        koleksiyonlar = self.kategori_koleksiyonlari.get(kategori, set())
 
         # Koleksiyon ComboBox'ını doldur
         self.koleksiyon_combo.blockSignals(True)
@@ -728,14 +900,9 @@ class EtiketListesiWindow(QMainWindow):
         self.separator.show()
 
         # Takım seçimi widget'ını göster ve kategoriye göre takımları güncelle
-        # Combo box seçiminde kategoriye özel takımlar + özel takım alanı göster
-        if self.current_kategori in ["Yatak Odası", "Yemek Odası", "Oturma Grubu", "Doğtaş Genç ve Çocuk Odası"]:
-            self.update_takim_radios(self.current_kategori, show_predefined=True)
-            self.takim_secim_widget.show()
-        else:
-            # Diğer kategoriler için sadece özel takım alanı
-            self.update_takim_radios(self.current_kategori, show_predefined=False)
-            self.takim_secim_widget.show()
+        # Combo box seçiminde kategoriye özel takımlar (kural dosyasında tanımlıysa) + özel takım alanı göster
+        self.update_takim_radios(self.current_kategori, show_predefined=True)
+        self.takim_secim_widget.show()
 
         # Veriyi filtrele
         self.filter_data()
@@ -823,17 +990,15 @@ class EtiketListesiWindow(QMainWindow):
 
         self.takim_radios.clear()
 
+        # Kural dosyası değiştiyse yeniden yükle (exe yeniden derlenmeden kural güncellenebilir)
+        _, hata = self.takim_kurallari.yenile_gerekirse()
+        if hata:
+            self.status_label.setText(f"⚠️ {hata}")
+
         # Kategoriye göre takımları belirle (sadece show_predefined=True ise)
         takimlar = []
         if show_predefined and kategori:
-            if kategori == "Yatak Odası":
-                takimlar = ["6 Kapaklı, Karyola", "6 Kapaklı, Baza", "5 Kapaklı, Karyola", "5 Kapaklı, Baza"]
-            elif kategori == "Yemek Odası":
-                takimlar = ["Konsol, Açılır, Sandalye*6", "Konsol, Sabit, Sandalye*6", "Açılır, Sandalye*6", "Sabit, Sandalye*6"]
-            elif kategori == "Oturma Grubu":
-                takimlar = ["Üçlü*2, Berjer*2", "Üçlü, İkili, Berjer", "İkili Modül-Kollu*2, Köşe Modülü"]
-            elif kategori == "Doğtaş Genç ve Çocuk Odası":
-                takimlar = ["3 Kapaklı, 100 Karyola, Çalışma Masası", "3 Kapaklı, 100 Baza, Çalışma Masası"]
+            takimlar = self.takim_kurallari.takim_adlari(kategori)
 
         # Layout'dan mevcut radio butonlarını temizle (özel takım hariç)
         layout = self.takim_secim_widget.layout()
@@ -899,30 +1064,6 @@ class EtiketListesiWindow(QMainWindow):
         # Bu fonksiyon artık update_table içinde otomatik yapılıyor
         pass
 
-    def sort_filtered_data_alphabetically(self):
-        """Filtered data'yı malzeme adına göre alfabetik sırala (checkbox işaretliler önce)"""
-        try:
-            sorted_data = []
-            for row_data in self.filtered_data:
-                row_sku = str(row_data.get('sku', '')).strip()
-                is_checked = self.checked_state.get(row_sku, False)
-                urun_adi_tam = str(row_data.get('urun_adi_tam', '')).lower()
-
-                sorted_data.append({
-                    'data': row_data,
-                    'is_checked': is_checked,
-                    'urun_adi_tam': urun_adi_tam
-                })
-
-            # Sıralama: Önce checkbox işaretliler (0), sonra alfabetik
-            sorted_data.sort(key=lambda x: (not x['is_checked'], x['urun_adi_tam']))
-
-            # Veriyi güncelle
-            self.filtered_data = [item['data'] for item in sorted_data]
-
-        except Exception as e:
-            logging.error(f"Veri sıralama hatası: {str(e)}")
-
     def schedule_filter(self):
         """Filtreleme işlemini zamanlı olarak başlat"""
         # Her durumda filtreleme yap (manuel modda sadece malzeme adı filtresi)
@@ -932,76 +1073,78 @@ class EtiketListesiWindow(QMainWindow):
     def filter_data(self):
         """Verileri filtrele"""
         try:
-            search_text = self.search_box.text().strip().lower()
-
-            # Filtreleme öncesi checkbox durumlarını kaydet (sadece tablo varsa)
-            if self.table.rowCount() > 0:
-                self.save_checkbox_states()
-
-            # Seçili satırların SKU'larını al
-            checked_skus = set(sku for sku, is_checked in self.checked_state.items() if is_checked)
+            search_text = self.search_box.text().strip()
 
             # Sadece manuel inputlar kullanılıyorsa (combo'lar boşsa)
             is_manual_only = (not self.kategori_combo.currentText() and not self.koleksiyon_combo.currentText()) and \
                              (self.kategori_input.text().strip() or self.koleksiyon_input.text().strip())
 
-            # Filtreleme
-            filtered = []
-            for row in self.original_data:
-                # Seçili satırları her zaman dahil et (filtrelemeye tabi tutma)
-                row_sku = str(row.get('sku', '')).strip()
-                if row_sku in checked_skus:
-                    filtered.append(row)
-                    continue
-
-                # Tam manuel girişte kategori ve koleksiyon filtrelemesi yapma
-                if not is_manual_only:
-                    # Kategori filtresi (combo box kullanıldığında)
-                    if self.current_kategori:
-                        if 'kategori' not in row or str(row['kategori']) != self.current_kategori:
-                            continue
+            # Tam manuel girişte kategori ve koleksiyon filtrelemesi yapma
+            kategori = None if is_manual_only else self.current_kategori
+            koleksiyon = None if is_manual_only else self.current_koleksiyon
+
+            # Önce önbelleğe bak: aynı sorgu -> anında, sorgunun devamı -> sadece önceki sonuç süzülür
+            sorgu = turkce_normalize(search_text)
+            eslesen = self.arama_onbellegi.get(sorgu, kategori, koleksiyon)
+            if eslesen is None:
+                taban = self.arama_onbellegi.find_base(sorgu, kategori, koleksiyon)
+                if taban is not None:
+                    eslesen = self.arama_indeksi.narrow(taban, search_text)
+                else:
+                    eslesen = self.match_rows(search_text, kategori, koleksiyon)
+                self.arama_onbellegi.put(sorgu, kategori, koleksiyon, eslesen)
+
+            # Seçili satırları her zaman dahil et (filtrelemeye tabi tutma)
+            checked_skus = self.table_model.secili_skular
+            if checked_skus:
+                filtered = set(eslesen)
+                for sku in checked_skus:
+                    filtered.update(self.arama_indeksi.rows_for_sku(sku))
+                filtered = sorted(filtered)
+            else:
+                filtered = eslesen
 
-                    # Koleksiyon filtresi (combo box kullanıldığında)
-                    if self.current_koleksiyon:
-                        if 'KOLEKSIYON' not in row or str(row['KOLEKSIYON']).strip() != self.current_koleksiyon:
-                            continue
+            self.filtered_rows = filtered
+            self.filtered_data = [self.original_data[i] for i in filtered]
 
-                # Arama filtresi - Hem ürün adı hem de SKU'da ara
-                if search_text:
-                    found = False
+            # Sıralama (seçililer önce, sonra malzeme adı) proxy modelde yapılır
+            self.update_table()
 
-                    # Ürün adında ara
-                    if 'urun_adi_tam' in row:
-                        urun_adi = str(row['urun_adi_tam']).lower()
-                        # Regex pattern (her kelime için AND operasyonu)
-                        parts = [re.escape(part) for part in search_text.split() if part]
-                        pattern = r'(?=.*?{})'.format(')(?=.*?'.join(parts))
-                        if re.search(pattern, urun_adi):
-                            found = True
+            self.status_label.setText(f"✅ {len(filtered)} kayıt gösteriliyor")
 
-                    # SKU'da ara
-                    if not found and 'sku' in row:
-                        sku = str(row['sku']).lower()
-                        if search_text in sku:
-                            found = True
+        except Exception as e:
+            logging.error(f"Filtreleme hatası: {str(e)}")
+            self.status_label.setText(f"❌ Filtreleme hatası: {str(e)}")
 
-                    if not found:
-                        continue
+    def match_rows(self, search_text, kategori, koleksiyon):
+        """Arama metni + kategori/koleksiyon filtresine uyan satır indeksleri (artan sırada)"""
+        # Arama filtresi - Hem ürün adı (kelime indeksi, AND) hem de SKU öneki
+        eslesen = self.arama_indeksi.search(search_text) if search_text else None
 
-                filtered.append(row)
+        # Kategori/koleksiyon seçiliyse yüklemede hazırlanan alt kümeden başla
+        if kategori and koleksiyon:
+            satirlar = self.koleksiyon_satirlari.get((kategori, koleksiyon), [])
+        elif kategori:
+            satirlar = self.kategori_satirlari.get(kategori, [])
+        else:
+            satirlar = None
 
-            self.filtered_data = filtered
+        if satirlar is not None:
+            return satirlar if eslesen is None else [i for i in satirlar if i in eslesen]
 
-            # Malzeme adına göre alfabetik sırala (seçili olmayanlar için)
-            self.sort_filtered_data_alphabetically()
+        aday_satirlar = range(len(self.original_data)) if eslesen is None else sorted(eslesen)
 
-            self.update_table()
+        result = []
+        for row_idx in aday_satirlar:
+            row = self.original_data[row_idx]
 
-            self.status_label.setText(f"✅ {len(filtered)} kayıt gösteriliyor")
+            # Koleksiyon filtresi (kategori seçilmeden koleksiyon kullanıldığında)
+            if koleksiyon:
+                if 'KOLEKSIYON' not in row or str(row['KOLEKSIYON']).strip() != koleksiyon:
+                    continue
 
-        except Exception as e:
-            logging.error(f"Filtreleme hatası: {str(e)}")
-            self.status_label.setText(f"❌ Filtreleme hatası: {str(e)}")
+            result.append(row_idx)
+        return result
 
     def clear_search(self):
         """Arama kutusunu ve tüm filtreleri temizle"""
@@ -1051,168 +1194,68 @@ class EtiketListesiWindow(QMainWindow):
         self.current_takim = None
 
         # Tüm checkbox'ları ve miktarları temizle
-        self.checked_state.clear()
-        self.miktar_state.clear()
-
-        # Tabloyu tamamen temizle (update_table içinde save_checkbox_states çağrılmasın diye)
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
+        self.table_model.clear_checked()
+        self.table_model.miktar_state.clear()
+        self.table_model.refresh_states()
+        self.table_proxy.invalidate()
 
         # Tüm veriyi göster
+        self.filtered_rows = None
         self.filtered_data = self.original_data.copy()
         self.update_table()
 
     def update_table(self):
-        """Tabloyu güncelle"""
-        if not self.filtered_data:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
-            return
-
-        # Mevcut durumları kaydet (sadece tablo daha önce oluşturulmuşsa)
-        if self.table.rowCount() > 0:
-            self.save_checkbox_states()
-
-        self.table.blockSignals(True)
-        self.table.clearContents()
-
-        try:
-            # Sütun sıralaması: Seç, Miktar, urun_adi, urun_adi_tam, LISTE, PERAKENDE, kategori, KOLEKSIYON, urun_url
-            column_order = ["urun_adi", "urun_adi_tam", "LISTE", "PERAKENDE", "kategori", "KOLEKSIYON", "urun_url"]
-
-            # Başlık isimleri
-            header_labels = {
-                "urun_adi": "Ürün Adı",
-                "urun_url": "URL",
-                "urun_adi_tam": "Malzeme Adı",
-                "LISTE": "LISTE",
-                "PERAKENDE": "PERAKENDE",
-                "kategori": "Kategori",
-                "KOLEKSIYON": "KOLEKSIYON"
-            }
-
-            # Mevcut sütunları kontrol et ve sıralı listeyi oluştur
-            all_keys = set(self.filtered_data[0].keys())
-            data_keys = [key for key in column_order if key in all_keys]
-
-            # Eksik sütunları sona ekle
-            for key in all_keys:
-                if key not in data_keys:
-                    data_keys.append(key)
-
-            # Header listesi oluştur - Seç, Miktar + diğerleri
-            headers = ["Seç", "Miktar"] + [header_labels.get(key, key) for key in data_keys]
-
-            # Tablo boyutlarını ayarla
-            self.table.setRowCount(len(self.filtered_data))
-            self.table.setColumnCount(len(headers))
-            self.table.setHorizontalHeaderLabels(headers)
-
-            # Verileri tabloya ekle
-            for row_idx, row_data in enumerate(self.filtered_data):
-                row_sku = str(row_data.get('sku', '')).strip()
-
-                # Seç checkbox
-                checkbox_widget = QWidget()
-                checkbox_layout = QHBoxLayout(checkbox_widget)
-                checkbox_layout.setContentsMargins(0, 0, 0, 0)
-                checkbox_layout.setAlignment(Qt.AlignCenter)
-
-                checkbox = QCheckBox()
-                # Global checkbox durumunu kullan
-                checkbox.setChecked(self.checked_state.get(row_sku, False))
-
-                # SKU'yu checkbox widget'a data olarak sakla
-                checkbox.setProperty('sku', row_sku)
-
-                checkbox.setStyleSheet("""
-                    QCheckBox {
-                        font-size: 14px;
-                        font-weight: bold;
-                    }
-                    QCheckBox::indicator {
-                        width: 18px;
-                        height: 18px;
-                    }
-                """)
-                # Checkbox değiştiğinde sayacı güncelle ve sırala
-                checkbox.clicked.connect(self.on_checkbox_changed)
-                checkbox_layout.addWidget(checkbox)
-                self.table.setCellWidget(row_idx, 0, checkbox_widget)
-
-                # Miktar sütunu - global değeri kullan
-                miktar_value = self.miktar_state.get(row_sku, "1")
-                miktar_item = QTableWidgetItem(miktar_value)
-                miktar_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                font = QFont()
-                font.setPointSize(15)
-                font.setBold(True)
-                miktar_item.setFont(font)
-                self.table.setItem(row_idx, 1, miktar_item)
-
-                # Diğer sütunlar
-                for col_idx, key in enumerate(data_keys):
-                    value = row_data.get(key, "")
-
-                    # Sayısal değerlerde .0 ifadesini kaldır
-                    if isinstance(value, (int, float)):
-                        if isinstance(value, float) and value.is_integer():
-                            display_value = str(int(value))
-                        else:
-                            display_value = str(value)
-                    elif pd.isna(value) or value is None:
-                        display_value = ""
-                    else:
-                        display_value = str(value)
-
-                    item = QTableWidgetItem(display_value)
-                    item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                    item.setFont(font)
-                    self.table.setItem(row_idx, col_idx + 2, item)  # +2 çünkü Seç ve Miktar önce geliyor
-
-            # Sütun genişliklerini ayarla
-            header = self.table.horizontalHeader()
-            header.setSectionResizeMode(0, QHeaderView.Fixed)
-            self.table.setColumnWidth(0, 60)
-            header.setSectionResizeMode(1, QHeaderView.Fixed)
-            self.table.setColumnWidth(1, 80)
-
-            for i in range(2, len(headers)):
-                header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
-
-        finally:
-            self.table.blockSignals(False)
+        """Filtre sonucunu tabloya uygula (satırlar yeniden oluşturulmaz)"""
+        self.table_proxy.set_visible_rows(self.filtered_rows)
 
         # Sayacı güncelle
         self.update_selected_count()
 
+    def setup_table_columns(self):
+        """Sütun genişliklerini ayarla"""
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Fixed)
+        self.table.setColumnWidth(0, 60)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        self.table.setColumnWidth(1, 80)
+
+        for i in range(2, self.table_model.columnCount()):
+            header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
+
+    def visible_rows(self):
+        """Tabloda görünen satırların kaynak indekslerini tablo sırasıyla döndür (seçililer önce, sonra alfabetik)"""
+        rows = range(len(self.original_data)) if self.filtered_rows is None else self.filtered_rows
+        skus = self.table_model.skus
+        alpha_rank = self.table_model.alpha_rank
+        secili = self.table_model.secili_skular
+        return sorted(rows, key=lambda i: (skus[i] not in secili, alpha_rank[i]))
+
+    def checked_rows(self):
+        """İşaretli satırları tablo sırasıyla döndür: [(row_data, miktar)]
+
+        İşaretli satırlar filtreden bağımsız olarak her zaman görünür olduğundan
+        SKU kümesinden doğrudan bulunur (tablo taranmaz).
+        """
+        secili = []
+        for sku in self.table_model.secili_skular:
+            secili.extend(self.arama_indeksi.rows_for_sku(sku))
+        secili.sort(key=lambda i: self.table_model.alpha_rank[i])
+        return [(self.original_data[i], self.table_model.miktar(self.table_model.skus[i])) for i in secili]
+
     def on_checkbox_changed(self):
-        """Checkbox değiştiğinde sayacı güncelle ve tabloyu sırala"""
+        """Checkbox değiştiğinde sayacı güncelle (satır proxy tarafından yerine taşınır)"""
         # Hiçbiri/Tümü radio butonlarının seçimini kaldır
         if self.selection_button_group.checkedButton():
             self.selection_button_group.setExclusive(False)
             self.selection_button_group.checkedButton().setChecked(False)
             self.selection_button_group.setExclusive(True)
 
-        # Checkbox durumlarını global değişkene kaydet
-        self.save_checkbox_states()
-
         self.update_selected_count()
-        # Kısa bir gecikme ile sıralama yap (UI responsive kalsın)
-        QTimer.singleShot(100, self.sort_table_by_checkbox_status)
 
     def update_selected_count(self):
         """Seçili satır sayısını güncelle"""
         try:
-            count = 0
-            for row_idx in range(self.table.rowCount()):
-                checkbox_widget = self.table.cellWidget(row_idx, 0)
-                if checkbox_widget:
-                    checkbox = checkbox_widget.findChild(QCheckBox)
-                    if checkbox and checkbox.isChecked():
-                        count += 1
-
-            self.selected_count_label.setText(f"Seçili: {count}")
+            self.selected_count_label.setText(f"Seçili: {self.table_model.secili_satir_sayisi}")
         except Exception as e:
             logging.error(f"Sayaç güncelleme hatası: {str(e)}")
 
@@ -1220,19 +1263,11 @@ class EtiketListesiWindow(QMainWindow):
         """Tüm checkbox'ları kaldır"""
         try:
             # Global state'i temizle
-            self.checked_state.clear()
-
-            # Tablodaki checkbox'ları temizle
-            for row_idx in range(self.table.rowCount()):
-                checkbox_widget = self.table.cellWidget(row_idx, 0)
-                if checkbox_widget:
-                    checkbox = checkbox_widget.findChild(QCheckBox)
-                    if checkbox and checkbox.isChecked():
-                        checkbox.setChecked(False)
+            self.table_model.clear_checked()
+            self.table_model.refresh_states()
 
             # Sayacı güncelle ve sırala
-            self.update_selected_count()
-            QTimer.singleShot(100, self.sort_table_by_checkbox_status)
+            self.sort_table_by_checkbox_status()
         except Exception as e:
             logging.error(f"Checkbox temizleme hatası: {str(e)}")
 
@@ -1240,71 +1275,33 @@ class EtiketListesiWindow(QMainWindow):
         """Tüm checkbox'ları işaretle"""
         try:
             # Tablodaki tüm satırları işaretle ve global state'e kaydet
-            for row_idx in range(self.table.rowCount()):
-                if row_idx < len(self.filtered_data):
-                    row_sku = str(self.filtered_data[row_idx].get('sku', '')).strip()
-                    if row_sku:
-                        self.checked_state[row_sku] = True
-
-                checkbox_widget = self.table.cellWidget(row_idx, 0)
-                if checkbox_widget:
-                    checkbox = checkbox_widget.findChild(QCheckBox)
-                    if checkbox and not checkbox.isChecked():
-                        checkbox.setChecked(True)
+            for row_idx in self.visible_rows():
+                row_sku = self.table_model.skus[row_idx]
+                if row_sku:
+                    self.table_model.set_checked(row_sku, True)
+            self.table_model.refresh_states()
 
             # Sayacı güncelle ve sırala
-            self.update_selected_count()
-            QTimer.singleShot(100, self.sort_table_by_checkbox_status)
+            self.sort_table_by_checkbox_status()
         except Exception as e:
             logging.error(f"Checkbox seçme hatası: {str(e)}")
 
-    def save_checkbox_states(self):
-        """Mevcut checkbox ve miktar durumlarını global değişkene kaydet"""
-        for row_idx in range(self.table.rowCount()):
-            # Checkbox widget'tan SKU'yu al (data olarak saklanıyor)
-            checkbox_widget = self.table.cellWidget(row_idx, 0)
-            if checkbox_widget:
-                checkbox = checkbox_widget.findChild(QCheckBox)
-                if checkbox:
-                    # SKU'yu widget property'sinden al
-                    row_sku = checkbox.property('sku')
-                    if row_sku:
-                        self.checked_state[row_sku] = checkbox.isChecked()
-
-                        # Miktar durumu
-                        miktar_item = self.table.item(row_idx, 1)
-                        if miktar_item:
-                            self.miktar_state[row_sku] = miktar_item.text()
-
     def get_checked_rows_from_table(self):
         """Global checkbox state'inden seçili satırları döndür"""
         checked_rows = []
         for row in self.original_data:
             row_sku = str(row.get('sku', '')).strip()
-            if row_sku and self.checked_state.get(row_sku, False):
+            if row_sku and self.table_model.is_checked(row_sku):
                 checked_rows.append({
                     'data': row.copy(),
-                    'miktar': self.miktar_state.get(row_sku, "1")
+                    'miktar': self.table_model.miktar(row_sku)
                 })
         return checked_rows
 
     def sort_table_by_checkbox_status(self):
         """Tablodaki satırları checkbox durumuna göre sırala (seçililer üstte, sonra alfabetik)"""
         try:
-            if self.table.rowCount() == 0:
-                return
-
-            # Checkbox durumlarını kaydet
-            if self.table.rowCount() > 0 and len(self.filtered_data) > 0:
-                self.save_checkbox_states()
-
-            # Malzeme adına göre alfabetik sırala (seçililer önce)
-            self.sort_filtered_data_alphabetically()
-
-            # Tabloyu güncelle
-            self.update_table()
-
-            # Sayacı güncelle
+            self.table_proxy.invalidate()
             self.update_selected_count()
 
         except Exception as e:
@@ -1331,90 +1328,36 @@ class EtiketListesiWindow(QMainWindow):
                 takim_adi = button.text()
                 self.current_takim = takim_adi
 
-            # Kategoriye göre doğru kombinasyon dictionary'sini seç
-            kombinasyon_dict = None
-            if self.current_kategori == "Yatak Odası":
-                kombinasyon_dict = self.yatak_odasi_kombinasyonlari
-            elif self.current_kategori == "Yemek Odası":
-                kombinasyon_dict = self.yemek_odasi_kombinasyonlari
-            elif self.current_kategori == "Oturma Grubu":
-                kombinasyon_dict = self.oturma_grubu_kombinasyonlari
-            elif self.current_kategori == "Doğtaş Genç ve Çocuk Odası":
-                kombinasyon_dict = self.genc_odasi_kombinasyonlari
-            else:
-                # Diğer kategoriler için kombinasyon yok, çık
-                return
+            # Kural dosyası değiştiyse yeniden yükle
+            _, hata = self.takim_kurallari.yenile_gerekirse()
+            if hata:
+                self.status_label.setText(f"⚠️ {hata}")
 
-            # Seçilen takım kombinasyonunu al
-            if not kombinasyon_dict or takim_adi not in kombinasyon_dict:
+            # Tablo sırasıyla görünür satırlar için derlenmiş kurallardan seçimi al
+            satirlar = self.visible_rows()
+            secim = self.takim_kurallari.takim_sec(self.current_kategori, takim_adi, satirlar)
+            if secim is None:
+                # Bu kategori/takım için kombinasyon yok, çık
                 return
 
-            kombinasyon = kombinasyon_dict[takim_adi]
-            aranacak_pattern_listesi = kombinasyon["aranacak_urunler"]
-            adet_bilgileri = kombinasyon.get("adet", {})
-            exclude_patterns = kombinasyon.get("exclude_patterns", {})
+            skus = self.table_model.skus
 
             # Önce tüm checkbox'ları temizle ve miktarları 1'e sıfırla
-            for row_idx in range(self.table.rowCount()):
-                checkbox_widget = self.table.cellWidget(row_idx, 0)
-                if checkbox_widget:
-                    checkbox = checkbox_widget.findChild(QCheckBox)
-                    if checkbox:
-                        checkbox.setChecked(False)
-
-                # Miktar sütununu 1'e sıfırla
-                miktar_item = self.table.item(row_idx, 1)
-                if miktar_item:
-                    miktar_item.setText("1")
-
-            # Regex pattern'leri kullanarak ürünleri bul ve seç
-            for pattern in aranacak_pattern_listesi:
-                for row_idx in range(self.table.rowCount()):
-                    row_data = self.filtered_data[row_idx]
-
-                    # Ürün adını al
-                    if 'urun_adi_tam' not in row_data:
-                        continue
-
-                    urun_adi_tam = str(row_data['urun_adi_tam'])
-
-                    # Regex pattern ile eşleşme kontrolü
-                    if re.search(pattern, urun_adi_tam, re.IGNORECASE):
-                        # Exclude pattern kontrolü
-                        should_exclude = False
-                        if pattern in exclude_patterns:
-                            for exclude_pattern in exclude_patterns[pattern]:
-                                if re.search(exclude_pattern, urun_adi_tam, re.IGNORECASE):
-                                    should_exclude = True
-                                    break
-
-                        if should_exclude:
-                            continue  # Bu ürünü atla
-
-                        # Checkbox'ı işaretle
-                        checkbox_widget = self.table.cellWidget(row_idx, 0)
-                        if checkbox_widget:
-                            checkbox = checkbox_widget.findChild(QCheckBox)
-                            if checkbox:
-                                checkbox.setChecked(True)
-
-                        # Adet bilgisi varsa güncelle
-                        miktar = 1
-                        for adet_pattern, adet_degeri in adet_bilgileri.items():
-                            if re.search(adet_pattern, urun_adi_tam, re.IGNORECASE):
-                                miktar = adet_degeri
-                                break
-
-                        # Miktar sütununu güncelle
-                        miktar_item = self.table.item(row_idx, 1)
-                        if miktar_item:
-                            miktar_item.setText(str(miktar))
-
-                        break  # Bu pattern için ürünü bulduk, bir sonraki pattern'e geç
+            for row_idx in satirlar:
+                self.table_model.set_checked(skus[row_idx], False)
+                self.table_model.miktar_state[skus[row_idx]] = "1"
+
+            # Eşleşen ürünleri işaretle ve adet bilgisini yaz
+            for row_idx, miktar in secim:
+                self.table_model.set_checked(skus[row_idx], True)
+                self.table_model.miktar_state[skus[row_idx]] = str(miktar)
+
+            # Yeni sınıflandırılan ürün adlarını sonraki açılışlar için sakla
+            self.takim_kurallari.onbellek_kaydet()
 
             # Sayacı güncelle ve seçilileri üste sırala
-            self.update_selected_count()
-            QTimer.singleShot(100, self.sort_table_by_checkbox_status)
+            self.table_model.refresh_states()
+            self.sort_table_by_checkbox_status()
 
             self.status_label.setText(f"✅ {takim_adi} takımı için ürünler otomatik seçildi")
 
@@ -1431,14 +1374,9 @@ class EtiketListesiWindow(QMainWindow):
 
             # Önce seçili satırları topla
             selected_rows = []
-            for row_idx in range(self.table.rowCount()):
-                checkbox_widget = self.table.cellWidget(row_idx, 0)
-                if checkbox_widget:
-                    checkbox = checkbox_widget.findChild(QCheckBox)
-                    if checkbox and checkbox.isChecked():
-                        row_data = self.filtered_data[row_idx]
-                        if 'sku' in row_data and 'urun_adi_tam' in row_data:
-                            selected_rows.append(row_data)
+            for row_data, _ in self.checked_rows():
+                if 'sku' in row_data and 'urun_adi_tam' in row_data:
+                    selected_rows.append(row_data)
 
             # Seçili ürünleri ayır: urunler ve takim_sku
             urunler = []
@@ -1575,23 +1513,13 @@ class EtiketListesiWindow(QMainWindow):
                 QMessageBox.warning(self, "Uyarı", "Hiç ürün seçilmedi!")
                 return
 
-            # JSON yapısını oluştur/güncelle - Kategori → Koleksiyon → etiket_listesi
-            if os.path.exists(self.json_file):
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {}
-
-            # Kategori → Koleksiyon hiyerarşisi
-            if self.current_kategori not in data:
-                data[self.current_kategori] = {}
-
-            if self.current_koleksiyon not in data[self.current_kategori]:
-                data[self.current_kategori][self.current_koleksiyon] = {}
+            # Mevcut kayıt - Kategori → Koleksiyon → etiket_listesi (sadece okunur)
+            data = self.belge.load()
+            koleksiyon_kaydi = data.get(self.current_kategori, {}).get(self.current_koleksiyon, {})
 
             # Mevcut etiket listesi varsa göster ve onay iste
-            if 'etiket_listesi' in data[self.current_kategori][self.current_koleksiyon]:
-                existing_data = data[self.current_kategori][self.current_koleksiyon]['etiket_listesi']
+            if 'etiket_listesi' in koleksiyon_kaydi:
+                existing_data = koleksiyon_kaydi['etiket_listesi']
                 existing_urunler = existing_data.get('urunler', [])
 
                 existing_product_list = "\n".join([f"{p.get('urun_adi_tam', '')} ({p.get('sku', '')})" for p in existing_urunler])
@@ -1632,22 +1560,84 @@ class EtiketListesiWindow(QMainWindow):
             if takim_sku_data:
                 etiket_listesi['takim_sku'] = takim_sku_data
 
-            data[self.current_kategori][self.current_koleksiyon]['etiket_listesi'] = etiket_listesi
+            # Sadece bu koleksiyonun etiket listesini kaydet (tek günlük satırı)
+            self.belge.alan_kaydet(self.current_kategori, self.current_koleksiyon, 'etiket_listesi', etiket_listesi,
+                                   kaynak=self)
 
-            # Kategori ve koleksiyonları alfabetik sırala
-            sorted_data = {}
-            for kategori in sorted(data.keys()):
-                sorted_data[kategori] = {}
-                for koleksiyon in sorted(data[kategori].keys()):
-                    sorted_data[kategori][koleksiyon] = data[kategori][koleksiyon]
+        except Exception as e:
+            logging.error(f"Etiket listesi JSON kaydetme hatası: {str(e)}")
 
-            # JSON dosyasına kaydet
-            os.makedirs(os.path.dirname(self.json_file), exist_ok=True)
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(sorted_data, f, ensure_ascii=False, indent=2)
+    def save_toplu_takim_to_json(self):
+        """Seçili takım preset'ini kategorideki tüm koleksiyonlara uygula (fark incelemesi + tek yazma)"""
+        try:
+            if not self.current_kategori:
+                QMessageBox.warning(self, "Uyarı", "Önce Kategori seçmelisiniz!")
+                return
+
+            takim_adi = None
+            for name, radio in self.takim_radios.items():
+                if radio.isChecked():
+                    takim_adi = name
+                    break
+
+            if not takim_adi:
+                QMessageBox.warning(self, "Uyarı", "Toplu oluşturma için hazır bir takım seçmelisiniz!")
+                return
+
+            # Kural dosyası değiştiyse yeniden yükle
+            _, hata = self.takim_kurallari.yenile_gerekirse()
+            if hata:
+                self.status_label.setText(f"⚠️ {hata}")
+
+            # Mevcut kayıtlar (sadece okunur - öneriler belgeyi değiştirmez)
+            data = self.belge.load()
+
+            self.status_label.setText(f"🔄 {self.current_kategori} - {takim_adi} tüm koleksiyonlar için hazırlanıyor...")
+            QApplication.processEvents()
+
+            oneriler = toplu_takim_onerileri(
+                self.takim_kurallari, self.original_data, self.koleksiyon_satirlari,
+                self.current_kategori, takim_adi, data,
+                koleksiyonlar=self.kategori_koleksiyonlari.get(self.current_kategori, set()))
+            self.takim_kurallari.onbellek_kaydet()
+
+            degisen = [o for o in oneriler if o['durum'] in ('yeni', 'degisti')]
+            sayilar = {}
+            for oneri in oneriler:
+                sayilar[oneri['durum']] = sayilar.get(oneri['durum'], 0) + 1
+
+            ozet = (f"{self.current_kategori}\n{takim_adi}\n\n"
+                    f"Yeni: {sayilar.get('yeni', 0)}\n"
+                    f"Değişen: {sayilar.get('degisti', 0)}\n"
+                    f"Değişmeyen: {sayilar.get('ayni', 0)}\n"
+                    f"Ürün bulunamayan: {sayilar.get('eslesme_yok', 0)}\n"
+                    f"Etiket listesi olmayan: {sayilar.get('etiket_listesi_yok', 0)}")
+
+            if not degisen:
+                self.status_label.setText(f"ℹ️ {takim_adi}: kaydedilecek değişiklik yok")
+                QMessageBox.information(self, "Toplu Takım", ozet + "\n\nKaydedilecek değişiklik yok.")
+                return
+
+            # Farkı incelemek için detaylı metinle onay iste
+            mesaj = QMessageBox(self)
+            mesaj.setIcon(QMessageBox.Question)
+            mesaj.setWindowTitle("Toplu Takım Kaydet")
+            mesaj.setText(ozet + f"\n\n{len(degisen)} koleksiyon kaydedilsin mi?")
+            mesaj.setDetailedText(toplu_takim_farki(oneriler, takim_adi))
+            mesaj.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+            if mesaj.exec_() != QMessageBox.Yes:
+                return
+
+            # Tek seferde yaz (tüm koleksiyonlar tek günlük satırı - ya hepsi ya hiçbiri)
+            self.belge.commit(toplu_takim_islemleri(self.current_kategori, takim_adi, oneriler), kaynak=self)
+
+            self.status_label.setText(f"✅ {takim_adi}: {len(degisen)} koleksiyon kaydedildi")
 
         except Exception as e:
-            logging.error(f"Etiket listesi JSON kaydetme hatası: {str(e)}")
+            error_msg = f"Toplu takım hatası: {str(e)}"
+            logging.error(error_msg)
+            self.status_label.setText(f"❌ {error_msg}")
+            QMessageBox.critical(self, "Hata", error_msg)
 
     def save_selection_to_json(self):
         """Takım seçimini JSON dosyasına kaydet (Kategori → Koleksiyon → Takım)"""
@@ -1656,12 +1646,8 @@ class EtiketListesiWindow(QMainWindow):
                 QMessageBox.warning(self, "Uyarı", "Önce Kategori ve Koleksiyon seçmelisiniz!")
                 return
 
-            # JSON dosyasını oku
-            if os.path.exists(self.json_file):
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {}
+            # Mevcut kayıtlar (sadece okunur)
+            data = self.belge.load()
 
             # Etiket listesi kontrolü - Kategori → Koleksiyon → etiket_listesi
             if (self.current_kategori not in data or
@@ -1699,58 +1685,46 @@ class EtiketListesiWindow(QMainWindow):
             total_perakende_price = 0
             product_details = []  # Miktar x urun_adi_tam için
 
-            for row_idx in range(self.table.rowCount()):
-                checkbox_widget = self.table.cellWidget(row_idx, 0)
-                if checkbox_widget:
-                    checkbox = checkbox_widget.findChild(QCheckBox)
-                    if checkbox and checkbox.isChecked():
-                        row_data = self.filtered_data[row_idx]
-
-                        # Miktar sütunundan değeri al
-                        miktar_item = self.table.item(row_idx, 1)
-                        miktar = int(miktar_item.text()) if miktar_item and miktar_item.text().isdigit() else 1
-
-                        if 'sku' in row_data and 'urun_adi_tam' in row_data:
-                            sku = str(row_data['sku']).strip()
-
-                            # LISTE fiyatı
-                            liste_price = 0
-                            if 'LISTE' in row_data and row_data['LISTE']:
-                                try:
-                                    liste_price = float(row_data['LISTE']) * miktar
-                                except:
-                                    pass
-
-                            # PERAKENDE fiyatı
-                            perakende_price = 0
-                            if 'PERAKENDE' in row_data and row_data['PERAKENDE']:
-                                try:
-                                    perakende_price = float(row_data['PERAKENDE']) * miktar
-                                except:
-                                    pass
-
-                            # Products'a sadece sku, urun_adi_tam, miktar ekle
-                            selected_products.append({
-                                'sku': sku,
-                                'urun_adi_tam': row_data['urun_adi_tam'],
-                                'miktar': miktar
-                            })
-                            total_liste_price += liste_price
-                            total_perakende_price += perakende_price
+            for row_data, miktar_text in self.checked_rows():
+                # Miktar sütunundan değeri al
+                miktar = int(miktar_text) if miktar_text.isdigit() else 1
 
-                            # Miktar x urun_adi_tam bilgisi
-                            product_details.append(f"{miktar} x {row_data['urun_adi_tam']}")
+                if 'sku' in row_data and 'urun_adi_tam' in row_data:
+                    sku = str(row_data['sku']).strip()
+
+                    # LISTE fiyatı
+                    liste_price = 0
+                    if 'LISTE' in row_data and row_data['LISTE']:
+                        try:
+                            liste_price = float(row_data['LISTE']) * miktar
+                        except:
+                            pass
+
+                    # PERAKENDE fiyatı
+                    perakende_price = 0
+                    if 'PERAKENDE' in row_data and row_data['PERAKENDE']:
+                        try:
+                            perakende_price = float(row_data['PERAKENDE']) * miktar
+                        except:
+                            pass
+
+                    # Products'a sadece sku, urun_adi_tam, miktar ekle
+                    selected_products.append({
+                        'sku': sku,
+                        'urun_adi_tam': row_data['urun_adi_tam'],
+                        'miktar': miktar
+                    })
+                    total_liste_price += liste_price
+                    total_perakende_price += perakende_price
+
+                    # Miktar x urun_adi_tam bilgisi
+                    product_details.append(f"{miktar} x {row_data['urun_adi_tam']}")
 
             if not selected_products:
                 QMessageBox.warning(self, "Uyarı", "Hiç ürün seçilmedi!")
                 return
 
-            # Kategori → Koleksiyon hiyerarşisi
-            if self.current_kategori not in data:
-                data[self.current_kategori] = {}
-
-            if self.current_koleksiyon not in data[self.current_kategori]:
-                data[self.current_kategori][self.current_koleksiyon] = {}
+            koleksiyon_kaydi = data[self.current_kategori][self.current_koleksiyon]
 
             # Toplam indirim yüzdesi hesapla
             total_indirim_yuzde = 0
@@ -1758,8 +1732,8 @@ class EtiketListesiWindow(QMainWindow):
                 total_indirim_yuzde = int((1 - (total_perakende_price / total_liste_price)) * 100)
 
             # Takım daha önce varsa, mevcut bilgileri göster ve güncelleme için onay iste
-            if takim_adi in data[self.current_kategori][self.current_koleksiyon]:
-                existing_data = data[self.current_kategori][self.current_koleksiyon][takim_adi]
+            if takim_adi in koleksiyon_kaydi:
+                existing_data = koleksiyon_kaydi[takim_adi]
                 existing_products = existing_data.get('products', [])
                 existing_liste = existing_data.get('total_liste_price', 0)
                 existing_perakende = existing_data.get('total_perakende_price', 0)
@@ -1810,25 +1784,13 @@ class EtiketListesiWindow(QMainWindow):
                 if reply != QMessageBox.Yes:
                     return
 
-            # Takım bilgisini kaydet
-            data[self.current_kategori][self.current_koleksiyon][takim_adi] = {
+            # Takım bilgisini kaydet (sadece bu takım - tek günlük satırı)
+            self.belge.alan_kaydet(self.current_kategori, self.current_koleksiyon, takim_adi, {
                 'products': selected_products,
                 'total_liste_price': total_liste_price,
                 'total_perakende_price': total_perakende_price,
                 'total_indirim_yuzde': total_indirim_yuzde
-            }
-
-            # Kategori ve koleksiyonları alfabetik sırala
-            sorted_data = {}
-            for kategori in sorted(data.keys()):
-                sorted_data[kategori] = {}
-                for koleksiyon in sorted(data[kategori].keys()):
-                    sorted_data[kategori][koleksiyon] = data[kategori][koleksiyon]
-
-            # JSON dosyasına kaydet
-            os.makedirs(os.path.dirname(self.json_file), exist_ok=True)
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(sorted_data, f, ensure_ascii=False, indent=2)
+            }, kaynak=self)
 
             # Başarı mesajı
             product_info = "\n".join(product_details)
@@ -1857,24 +1819,17 @@ class EtiketListesiWindow(QMainWindow):
             # Seçili satırları topla - sadece 3 ile başlayan SKU'lar
             selected_data = []
 
-            for row_idx in range(self.table.rowCount()):
-                checkbox_widget = self.table.cellWidget(row_idx, 0)
-                if checkbox_widget:
-                    checkbox = checkbox_widget.findChild(QCheckBox)
-                    if checkbox and checkbox.isChecked():
-                        # Bu satırın verilerini al
-                        row_data = self.filtered_data[row_idx]
-
-                        # Sadece 3 ile başlayan SKU'ları al
-                        if 'sku' in row_data and 'urun_adi_tam' in row_data:
-                            sku = str(row_data['sku']).strip()
-                            if sku.startswith('3'):
-                                selected_data.append({
-                                    'sku': sku,
-                                    'urun_adi_tam': row_data['urun_adi_tam'],
-                                    'koleksiyon': row_data.get('KOLEKSIYON', ''),
-                                    'kategori': row_data.get('kategori', '')
-                                })
+            for row_data, _ in self.checked_rows():
+                # Sadece 3 ile başlayan SKU'ları al
+                if 'sku' in row_data and 'urun_adi_tam' in row_data:
+                    sku = str(row_data['sku']).strip()
+                    if sku.startswith('3'):
+                        selected_data.append({
+                            'sku': sku,
+                            'urun_adi_tam': row_data['urun_adi_tam'],
+                            'koleksiyon': row_data.get('KOLEKSIYON', ''),
+                            'kategori': row_data.get('kategori', '')
+                        })
 
             if not selected_data:
                 QMessageBox.information(self, "Bilgi", "3 ile başlayan SKU'ya sahip en az bir satır seçin.")
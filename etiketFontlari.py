@@ -0,0 +1,163 @@
+"""
+Etiket Fontları - PDF etiketleri için TTF fontlarını bir kez bulur ve kaydeder
+
+Aranan yerler (ilk bulunan çift kullanılır):
+1. Exe/script klasörü ve PyInstaller paketi (arial.ttf + arialbd.ttf vb.)
+2. Windows font klasörü (%WINDIR%/Fonts)
+3. fontconfig (fc-match) ve Linux/macOS font klasörleri
+
+Normal ve kalın yüz ayrı dosyalardan kaydedilir (kalın yazı gerçekten kalın olur).
+Kayıt süreç başına bir kez yapılır; sonraki çağrılar önbellekten döner.
+Hiçbir TTF bulunamazsa ReportLab'in Helvetica fontları kullanılır (Türkçe
+karakterler eksik çıkabilir).
+"""
+
+import os
+import sys
+import subprocess
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+
+# PDF içinde kullanılan font adları
+FONT_NORMAL = "Etiket"
+FONT_BOLD = "Etiket-Bold"
+
+# Yedek (gömülü olmayan) fontlar
+YEDEK_NORMAL = "Helvetica"
+YEDEK_BOLD = "Helvetica-Bold"
+
+# (normal, kalın) dosya adı çiftleri - tercih sırasıyla
+FONT_CIFTLERI = [
+    ("arial.ttf", "arialbd.ttf"),
+    ("Arial.ttf", "Arial Bold.ttf"),
+    ("LiberationSans-Regular.ttf", "LiberationSans-Bold.ttf"),
+    ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf"),
+]
+
+# fontconfig sorguları (fc-match) - (normal, kalın)
+FC_SORGULARI = [
+    ("Arial", "Arial:bold"),
+    ("Liberation Sans", "Liberation Sans:bold"),
+    ("DejaVu Sans", "DejaVu Sans:bold"),
+]
+
+# Alt klasörleriyle birlikte taranan (Linux) font klasörleri
+ALT_KLASORLU = [
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+]
+
+# Süreç başına önbellek: (normal_ad, kalin_ad) ve ayrıştırılmış TTFont nesneleri
+_kayitli_fontlar = None
+_kayitli_dosyalar = ()
+_ttf_nesneleri = {}
+
+
+def _aday_klasorler():
+    """Font dosyalarının aranacağı klasörler (öncelik sırasıyla)"""
+    klasorler = []
+    if getattr(sys, 'frozen', False):
+        klasorler.append(os.path.dirname(sys.executable))
+        klasorler.append(getattr(sys, '_MEIPASS', os.path.dirname(sys.executable)))
+    else:
+        klasorler.append(os.path.dirname(os.path.abspath(__file__)))
+    klasorler.append(os.path.join(klasorler[0], "fonts"))
+
+    windir = os.environ.get("WINDIR") or os.environ.get("SystemRoot")
+    if windir:
+        klasorler.append(os.path.join(windir, "Fonts"))
+    klasorler.append("C:/Windows/Fonts")
+
+    klasorler += ALT_KLASORLU + ["/Library/Fonts", "/System/Library/Fonts/Supplemental"]
+    return klasorler
+
+
+def _klasorde_bul(klasor, dosya_adi):
+    """Dosyayı klasörde (Linux font klasörlerinde alt klasörler dahil) ara"""
+    yol = os.path.join(klasor, dosya_adi)
+    if os.path.isfile(yol):
+        return yol
+    if klasor in ALT_KLASORLU and os.path.isdir(klasor):
+        for kok, _, dosyalar in os.walk(klasor):
+            if dosya_adi in dosyalar:
+                return os.path.join(kok, dosya_adi)
+    return None
+
+
+def _fc_match(sorgu):
+    """fontconfig ile sorguya karşılık gelen TTF dosyasını bul (yoksa None)"""
+    try:
+        sonuc = subprocess.run(["fc-match", "-f", "%{file}", sorgu],
+                               capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    yol = sonuc.stdout.strip()
+    if sonuc.returncode == 0 and yol.lower().endswith(".ttf") and os.path.isfile(yol):
+        return yol
+    return None
+
+
+def font_dosyalarini_bul():
+    """Normal ve kalın yüz için TTF dosya yollarını döndür: (normal, kalin) veya None"""
+    klasorler = _aday_klasorler()
+
+    # Tam dosya adıyla ara (önce yerel/paketli ve Windows klasörleri)
+    for normal_adi, kalin_adi in FONT_CIFTLERI:
+        for klasor in klasorler:
+            normal = _klasorde_bul(klasor, normal_adi)
+            if normal:
+                kalin = _klasorde_bul(os.path.dirname(normal), kalin_adi) or _klasorde_bul(klasor, kalin_adi)
+                if kalin:
+                    return normal, kalin
+
+    # fontconfig (Linux) - isimle eşleştir
+    for normal_sorgu, kalin_sorgu in FC_SORGULARI:
+        normal = _fc_match(normal_sorgu)
+        kalin = _fc_match(kalin_sorgu)
+        if normal and kalin and normal != kalin:
+            return normal, kalin
+
+    return None
+
+
+def fontlari_hazirla(log=print):
+    """Fontları (süreçte ilk çağrıda) kaydet ve (normal, kalin) font adlarını döndür"""
+    global _kayitli_fontlar, _kayitli_dosyalar
+    if _kayitli_fontlar is not None:
+        return _kayitli_fontlar
+
+    dosyalar = font_dosyalarini_bul()
+    if dosyalar is None:
+        log("⚠️ TTF font bulunamadı, Helvetica kullanılacak (Türkçe karakterler eksik olabilir)")
+        _kayitli_fontlar = (YEDEK_NORMAL, YEDEK_BOLD)
+        return _kayitli_fontlar
+
+    try:
+        for ad, yol in zip((FONT_NORMAL, FONT_BOLD), dosyalar):
+            if ad not in _ttf_nesneleri:
+                _ttf_nesneleri[ad] = TTFont(ad, yol)
+                pdfmetrics.registerFont(_ttf_nesneleri[ad])
+        pdfmetrics.registerFontFamily(FONT_NORMAL, normal=FONT_NORMAL, bold=FONT_BOLD,
+                                      italic=FONT_NORMAL, boldItalic=FONT_BOLD)
+        _kayitli_fontlar = (FONT_NORMAL, FONT_BOLD)
+        _kayitli_dosyalar = tuple(dosyalar)
+    except Exception as e:
+        log(f"⚠️ Fontlar yüklenemedi ({dosyalar[0]}): {e} - Helvetica kullanılacak")
+        _kayitli_fontlar = (YEDEK_NORMAL, YEDEK_BOLD)
+
+    return _kayitli_fontlar
+
+
+def font_surumu():
+    """Kayıtlı font dosyalarını temsil eden değer (yol, boyut, mtime) - etiket özetleri için"""
+    surum = []
+    for yol in _kayitli_dosyalar:
+        try:
+            durum = os.stat(yol)
+            surum.append((yol, durum.st_size, durum.st_mtime_ns))
+        except OSError:
+            surum.append((yol, None, None))
+    return _kayitli_fontlar, tuple(surum)
@@ -0,0 +1,189 @@
+"""
+Etiket Oluşturma - tarih filtresi, EXC/SUBE ayrımı ve PDF üretimi (Qt'den bağımsız)
+
+Yazdır sekmesindeki (etiketYazdir.py) kurallar burada tutulur; aynı işlem komut
+satırından da çalıştırılabilir (tarama ve fiyat mutabakatından sonra toplu iş için):
+
+    python -m etiketOlustur --since 2025-01-15 --store all
+    python -m etiketOlustur --since 15.01.2025 --store exc --out D:\\Etiket --jobs 4
+"""
+
+import os
+import sys
+import logging
+import argparse
+from datetime import datetime
+from etiketDeposu import EtiketDeposu
+from etiketCizim import paralel_pdf_olustur, QR_HATA_DOSYASI
+
+
+# Mağaza türü -> PDF dosya adı
+PDF_DOSYALARI = {
+    "EXC": "Etiket_EXC.pdf",
+    "SUBE": "Etiket_SUBE.pdf",
+}
+
+
+def get_base_dir():
+    """Exe veya script dizinini döndür"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def deger_acik_mi(deger, varsayilan):
+    """secDeger/excDeger/subeDeger alanını yorumla ("true"/"false" metni veya bool)"""
+    if isinstance(deger, bool):
+        return deger
+    if isinstance(deger, str):
+        return deger.lower() == 'true'
+    return varsayilan
+
+
+def filter_by_date(data, selected_datetime):
+    """Güncellenme tarihi verilen andan sonra olan koleksiyonları döndür."""
+    filtered = []
+
+    for kategori, koleksiyonlar in data.items():
+        for koleksiyon_adi, koleksiyon_verisi in koleksiyonlar.items():
+            if "etiket_listesi" not in koleksiyon_verisi:
+                continue
+
+            etiket_listesi = koleksiyon_verisi["etiket_listesi"]
+            if "takim_sku" not in etiket_listesi:
+                continue
+
+            takim_sku = etiket_listesi["takim_sku"]
+            if "updated_at" not in takim_sku:
+                continue
+
+            try:
+                updated_at = datetime.strptime(takim_sku["updated_at"], "%Y-%m-%d %H:%M:%S")
+                if updated_at > selected_datetime:
+                    filtered.append({
+                        'kategori': kategori,
+                        'koleksiyon_adi': koleksiyon_adi,
+                        'data': koleksiyon_verisi
+                    })
+            except ValueError:
+                continue
+
+    return filtered
+
+
+def separate_exc_sube(filtered_data):
+    """EXC ve SUBE verilerini ayırır (SEÇ işaretli olmayanlar atlanır)."""
+    exc_data = []
+    sube_data = []
+
+    for item in filtered_data:
+        takim_sku = item['data']['etiket_listesi']['takim_sku']
+
+        # SEÇ kontrolü (secDeger varsa ve "true" ise devam et)
+        if not deger_acik_mi(takim_sku.get('secDeger', 'true'), True):
+            continue
+
+        # EXC / SUBE kontrolü (değer "true" ise ilgili listeye ekle)
+        if deger_acik_mi(takim_sku.get('excDeger', 'false'), False):
+            exc_data.append(item)
+        if deger_acik_mi(takim_sku.get('subeDeger', 'false'), False):
+            sube_data.append(item)
+
+    return exc_data, sube_data
+
+
+def pdf_isleri(exc_data, sube_data, out_dir, magaza="all"):
+    """paralel_pdf_olustur için iş listesi: [(ad, etiket_data, output_path)]"""
+    isler = []
+    for ad, etiket_data in [("EXC", exc_data), ("SUBE", sube_data)]:
+        if etiket_data and magaza in ("all", ad.lower()):
+            isler.append((ad, etiket_data, os.path.join(out_dir, PDF_DOSYALARI[ad])))
+    return isler
+
+
+def clear_error_file(base_dir):
+    """QR hata dosyasını temizler."""
+    error_file = os.path.join(base_dir, QR_HATA_DOSYASI)
+    if os.path.exists(error_file):
+        os.remove(error_file)
+
+
+def qr_hatalari(base_dir):
+    """QR kodu oluşturulamayan ürünlerin listesi (dosya yoksa boş metin)"""
+    error_file = os.path.join(base_dir, QR_HATA_DOSYASI)
+    if not os.path.exists(error_file):
+        return ""
+    with open(error_file, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def tarih_oku(metin):
+    """--since değeri: YYYY-MM-DD veya GG.AA.YYYY (o günün başlangıcı)"""
+    for bicim in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(metin, bicim)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Geçersiz tarih: {metin} (YYYY-MM-DD veya GG.AA.YYYY)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="etiketOlustur", description="Etiket PDF'lerini arayüz olmadan oluştur")
+    parser.add_argument("--since", type=tarih_oku, default=datetime.combine(datetime.now().date(), datetime.min.time()),
+                        help="Bu tarihten sonra güncellenen koleksiyonlar (varsayılan: bugün)")
+    parser.add_argument("--store", choices=["exc", "sube", "all"], default="all", help="Oluşturulacak PDF'ler")
+    parser.add_argument("--out", default=get_base_dir(), help="PDF'lerin yazılacağı klasör")
+    parser.add_argument("--jobs", type=int, default=None, help="İşçi süreç sayısı (varsayılan: işlemci sayısı)")
+    parser.add_argument("--json", default=os.path.join(get_base_dir(), "etiketEkle.json"),
+                        help="etiketEkle.json yolu")
+    parser.add_argument("--force", action="store_true", help="Etiketleri değişmemiş PDF'leri de yeniden çiz")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%H:%M:%S")
+
+    depo = EtiketDeposu(args.json)
+    if not depo.exists():
+        logging.error(f"❌ Dosya bulunamadı: {args.json}")
+        return 1
+
+    base_dir = get_base_dir()
+    clear_error_file(base_dir)
+
+    filtered_data = filter_by_date(depo.load(), args.since)
+    exc_data, sube_data = separate_exc_sube(filtered_data)
+    isler = pdf_isleri(exc_data, sube_data, args.out, args.store)
+    if not isler:
+        logging.info(f"{args.since:%d.%m.%Y} tarihinden sonra güncellenmiş etiket bulunamadı ({args.store})")
+        return 0
+
+    for ad, etiket_data, output_path in isler:
+        logging.info(f"{ad} için {len(etiket_data)} etiket oluşturuluyor -> {output_path}")
+
+    os.makedirs(args.out, exist_ok=True)
+    son_yuzde = [-1]
+
+    def ilerleme(cizilen, toplam, kalan):
+        # Günlükte her %10'da bir satır
+        yuzde = cizilen * 100 // toplam
+        if yuzde // 10 != son_yuzde[0] // 10:
+            son_yuzde[0] = yuzde
+            kalan_metin = "" if kalan is None else f" (kalan ~{int(kalan)} sn)"
+            logging.info(f"{cizilen}/{toplam} etiket{kalan_metin}")
+
+    try:
+        paralel_pdf_olustur(isler, base_dir=base_dir, jobs=args.jobs, log=logging.info, ilerleme=ilerleme,
+                            zorla=args.force)
+    except Exception as e:
+        logging.error(f"❌ Hata oluştu: {e}")
+        return 1
+
+    hatalar = qr_hatalari(base_dir)
+    if hatalar:
+        logging.warning(f"⚠️ QR kodu oluşturulamayan ürünler:\n{hatalar}")
+
+    logging.info("✅ İşlem başarıyla tamamlandı!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,517 @@
+"""
+Fiyat Mutabakatı - etiketEkle.json ile DogtasCom fiyat listesini karşılaştırır ve günceller
+
+Fiyat sekmesindeki (jsonGoster.py) kurallar burada, Qt'den bağımsız olarak tutulur.
+Aynı kurallar komut satırından da çalıştırılabilir (tarama sonrası toplu iş için):
+
+    python -m fiyatGuncelle reconcile --dry-run
+    python -m fiyatGuncelle reconcile --apply
+    python -m fiyatGuncelle reconcile --dry-run --prices fiyatlar.json
+"""
+
+import sys
+import os
+import json
+import copy
+import time
+import argparse
+from datetime import datetime
+from io import BytesIO
+from config import SPREADSHEET_ID
+from etiketDeposu import EtiketDeposu
+
+
+# Perakende fiyat farkı bu değeri aşarsa güncellenir (TL)
+FIYAT_FARK_ESIGI = 7
+
+# İndirim oranı hesaplanırken liste fiyatı "aynı" sayılan tolerans (TL)
+LISTE_TOLERANSI = 100
+
+
+def get_base_dir():
+    """Exe veya script dizinini döndür"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def gecerli_sku(sku):
+    """SKU filtreleme: 3 ile başlamalı ve 10 haneli olmalı"""
+    return sku.startswith('3') and len(sku) == 10
+
+
+def malzeme_adi(koleksiyon_adi, urun_adi):
+    """Malzeme adı: KOLEKSIYON + Ürün Adı"""
+    return f"{koleksiyon_adi} {urun_adi.replace(koleksiyon_adi, '').strip()}"
+
+
+def is_takim(key, value):
+    """etiket_listesi dışındaki products içeren anahtarlar özel takımdır"""
+    return key != 'etiket_listesi' and isinstance(value, dict) and 'products' in value
+
+
+class PriceLoader:
+    """Google Sheets'ten fiyat verilerini yükleyen sınıf"""
+
+    def __init__(self, snapshot_file=None):
+        self.price_data = {}
+        if snapshot_file:
+            self.load_snapshot(snapshot_file)
+        else:
+            self.load_prices()
+
+    def load_prices(self):
+        """Google Sheets'ten dogtasCom sayfasını yükle ve SKU bazlı fiyat sözlüğü oluştur"""
+        # Anlık görüntüyle çalışırken gerekmez
+        import pandas as pd
+        import requests
+
+        try:
+            # Google Sheets URL
+            gsheets_url = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=xlsx"
+
+            # Google Sheets'ten veri çek
+            response = requests.get(gsheets_url, timeout=30)
+
+            if response.status_code != 200:
+                print(f"Google Sheets yükleme hatası: HTTP {response.status_code}")
+                self.price_data = {}
+                return
+
+            # DogtasCom sayfasını oku
+            df = pd.read_excel(BytesIO(response.content), sheet_name="DogtasCom")
+
+            # SKU'yu string'e çevir ve fiyat bilgilerini sözlüğe aktar
+            for _, row in df.iterrows():
+                sku = str(row['sku'])
+                self.price_data[sku] = {
+                    'liste': float(row['LISTE']) if pd.notna(row['LISTE']) else 0.0,
+                    'perakende': float(row['PERAKENDE']) if pd.notna(row['PERAKENDE']) else 0.0,
+                    'kategori': str(row.get('kategori', '')),
+                    'koleksiyon': str(row.get('KOLEKSIYON', ''))
+                }
+        except Exception as e:
+            print(f"Google Sheets yükleme hatası: {e}")
+            self.price_data = {}
+
+    def load_snapshot(self, snapshot_file):
+        """Yerel fiyat anlık görüntüsünü (save_snapshot çıktısı) yükle"""
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            self.price_data = json.load(f)
+
+    def save_snapshot(self, snapshot_file):
+        """Fiyat sözlüğünü JSON olarak kaydet (çevrimdışı/tekrarlanabilir çalıştırmalar için)"""
+        with open(snapshot_file, 'w', encoding='utf-8') as f:
+            json.dump(self.price_data, f, ensure_ascii=False, indent=2)
+
+    def get_price(self, sku):
+        """SKU'ya göre fiyat bilgisi döndür - SKU yoksa None döner"""
+        sku_str = str(sku)
+        return self.price_data.get(sku_str, None)  # SKU yoksa None döndür
+
+
+def calculate_collection_discount(koleksiyon_urunler, price_loader):
+    """
+    Koleksiyondaki ürünlerin liste fiyatlarına göre indirim oranını hesapla
+
+    Args:
+        koleksiyon_urunler: JSON'daki koleksiyon ürünleri listesi
+        price_loader: Fiyat kaynağı (PriceLoader veya None)
+
+    Returns:
+        float or None: Median indirim oranı (0.0-1.0 arası) veya None (yeterli veri yoksa)
+    """
+    gecerli_indirimler = []
+
+    for urun in koleksiyon_urunler:
+        sku = str(urun.get('sku', ''))
+
+        # SKU filtreleme
+        if not gecerli_sku(sku):
+            continue
+
+        json_liste = urun.get('liste_fiyat', 0.0)
+
+        # Sheets'ten fiyat al
+        price_info = price_loader.get_price(sku) if price_loader else None
+
+        if price_info is None:
+            continue  # SKU bulunamadı, atla
+
+        sheets_liste = price_info['liste']
+        sheets_perakende = price_info['perakende']
+
+        # Geçersiz fiyatları atla
+        if sheets_liste <= 0 or sheets_perakende <= 0:
+            continue
+
+        # Negatif indirim oranlarını filtrele (perakende > liste = veri hatası)
+        if sheets_perakende > sheets_liste:
+            continue
+
+        # KRİTİK: Liste fiyat değişmiş mi? (±100 TL tolerans)
+        if abs(json_liste - sheets_liste) <= LISTE_TOLERANSI:
+            # Liste fiyat AYNI → indirim oranını hesapla
+            indirim_orani = (sheets_liste - sheets_perakende) / sheets_liste
+            gecerli_indirimler.append(indirim_orani)
+
+    # En az 2 geçerli ürün olmalı
+    if len(gecerli_indirimler) >= 2:
+        # Median hesapla (aykırı değerlere dayanıklı)
+        sorted_indirimler = sorted(gecerli_indirimler)
+        n = len(sorted_indirimler)
+        if n % 2 == 0:
+            return (sorted_indirimler[n//2 - 1] + sorted_indirimler[n//2]) / 2
+        return sorted_indirimler[n//2]
+
+    return None
+
+
+def koleksiyon_satirlari(kategori_adi, koleksiyon_adi, koleksiyon_data, price_loader):
+    """Tek bir koleksiyonun etiket_listesi ve takım satırlarını hesapla
+
+    Returns:
+        tuple: (rows, missing, takimlar)
+            rows: etiket_listesi satırları [row_data]
+            missing: Bulunamayan veya fiyatı 0 olan SKU'lar {sku: urun_adi_tam}
+            takimlar: {takim_adi: [takim_urun]}
+    """
+    rows = []
+    missing = {}
+
+    # Etiket listesini kontrol et
+    if 'etiket_listesi' in koleksiyon_data:
+        etiket_listesi = koleksiyon_data['etiket_listesi']
+        urunler = etiket_listesi.get('urunler', [])
+
+        # Koleksiyon indirim oranını hesapla (sadece liste fiyatı sabit olanlar için)
+        koleksiyon_indirim = calculate_collection_discount(urunler, price_loader)
+
+        # Her ürün için
+        for urun in urunler:
+            sku = str(urun.get('sku', ''))
+
+            # SKU filtreleme: 3 ile başlamalı ve 10 haneli olmalı
+            if not gecerli_sku(sku):
+                continue
+
+            urun_adi = urun.get('urun_adi_tam', '')
+            liste_fiyat = urun.get('liste_fiyat', 0.0)
+            perakende_fiyat = urun.get('perakende_fiyat', 0.0)
+
+            # Excel'den güncel fiyatı al
+            price_info = price_loader.get_price(sku) if price_loader else None
+
+            # SKU Google Sheets'te var mı ve fiyatlar geçerli mi kontrol et
+            if price_info is None or (price_info['liste'] <= 0 or price_info['perakende'] <= 0):
+                # Eksik SKU'yu kaydet (Hata sayfası için)
+                missing[sku] = urun_adi
+
+                # SKU bulunamadı VEYA fiyat geçersiz (0 TL) - koleksiyon indirimini kullanarak tahmin et
+                # Liste fiyatı 0 ise tahmin yapma (0 x indirim = 0)
+                liste_new = liste_fiyat  # Liste fiyat değişmemiş
+                if koleksiyon_indirim is not None and liste_fiyat > 0:
+                    perakende_new = liste_fiyat * (1 - koleksiyon_indirim)  # Tahmini perakende
+                else:
+                    perakende_new = perakende_fiyat  # Eski fiyatı koru
+                has_price_data = False
+            else:
+                # SKU bulundu VE fiyatlar geçerli - güncel fiyatları kullan
+                liste_new = price_info['liste']
+                perakende_new = price_info['perakende']
+                has_price_data = True
+
+            # Tabloya eklenecek satır verisi (etiket_listesi için)
+            rows.append({
+                'type': 'etiket_listesi',
+                'sku': sku,
+                'miktar': 1,
+                'urun_adi': urun_adi,
+                'Malzeme_adi': malzeme_adi(koleksiyon_adi, urun_adi),
+                'liste': liste_fiyat,
+                'perakende': perakende_fiyat,
+                'kategori': kategori_adi,
+                'koleksiyon': koleksiyon_adi,
+                'liste_new': liste_new,
+                'perakende_new': perakende_new,
+                'has_price_data': has_price_data  # SKU bulundu mu?
+            })
+
+    # Takım verilerini topla
+    takimlar = {}
+
+    for takim_adi, value in koleksiyon_data.items():
+        if not is_takim(takim_adi, value):
+            continue
+
+        # Takım ürünlerini işle
+        takim_urunler = []
+        for product in value.get('products', []):
+            product_sku = str(product.get('sku', ''))
+
+            # SKU filtreleme: 3 ile başlamalı ve 10 haneli olmalı
+            if not gecerli_sku(product_sku):
+                continue
+
+            urun_adi = product.get('urun_adi_tam', '')
+
+            # Excel'den güncel fiyatı al
+            price_info = price_loader.get_price(product_sku) if price_loader else None
+
+            # SKU bulunamadıysa fiyatları 0 bırak (takım ürünleri için normal)
+            takim_urunler.append({
+                'type': 'takim_urun',
+                'sku': product_sku,
+                'miktar': product.get('miktar', 1),
+                'urun_adi': urun_adi,
+                'Malzeme_adi': malzeme_adi(koleksiyon_adi, urun_adi),
+                'liste': 0.0,  # Takım ürünlerinde liste fiyatı yok
+                'perakende': 0.0,  # Takım ürünlerinde perakende fiyatı yok
+                'kategori': kategori_adi,
+                'koleksiyon': koleksiyon_adi,
+                'liste_new': price_info['liste'] if price_info else 0.0,
+                'perakende_new': price_info['perakende'] if price_info else 0.0,
+                'has_price_data': price_info is not None  # SKU bulundu mu?
+            })
+
+        takimlar[takim_adi] = takim_urunler
+
+    return rows, missing, takimlar
+
+
+def koleksiyon_flags(rows):
+    """Fiyat farkı ve eksik SKU bayraklarını hesapla"""
+    has_price_diff = False
+    has_missing_sku = False
+    for row_data in rows:
+        if abs(row_data['perakende_new'] - row_data['perakende']) > FIYAT_FARK_ESIGI:
+            has_price_diff = True
+        if not row_data.get('has_price_data', True):
+            has_missing_sku = True
+        if has_price_diff and has_missing_sku:
+            break  # Her ikisi de bulundu, döngüyü kes
+
+    return {'has_price_diff': has_price_diff, 'has_missing_sku': has_missing_sku}
+
+
+def guncelle_koleksiyon_fiyatlari(koleksiyon_data, price_loader, current_time, log=print):
+    """Koleksiyonun ürün fiyatlarını, takim_sku toplamlarını ve özel takım toplamlarını güncelle
+
+    Sadece fiyat farkı olan (koleksiyon_flags -> has_price_diff) koleksiyonlar için çağrılmalı.
+
+    Returns:
+        list: Değişen ürünler [(sku, eski_perakende, yeni_perakende)]
+    """
+    degisenler = []
+
+    if 'etiket_listesi' in koleksiyon_data and 'takim_sku' in koleksiyon_data['etiket_listesi']:
+        etiket_listesi = koleksiyon_data['etiket_listesi']
+        takim_sku = etiket_listesi['takim_sku']
+
+        # etiket_listesi > urunler içindeki SKU'ları güncelle
+        if 'urunler' in etiket_listesi:
+            urunler = etiket_listesi['urunler']
+
+            # Koleksiyon indirim oranını hesapla (SKU bulunamayan ürünler için tahmin yapmak üzere)
+            koleksiyon_indirim = calculate_collection_discount(urunler, price_loader)
+
+            for urun in urunler:
+                sku = str(urun.get('sku', ''))
+                old_liste = urun.get('liste_fiyat', 0.0)
+                old_perakende = urun.get('perakende_fiyat', 0.0)
+
+                # Excel'den yeni fiyatları al
+                price_info = price_loader.get_price(sku) if price_loader else None
+
+                # ✅ 4 KATMANLI KORUMA (Sheets'te yok, geçersiz fiyat, tahmini fiyat, normal güncelleme)
+                if price_info is None or (price_info['perakende'] <= 0 or price_info['liste'] <= 0):
+                    # SKU bulunamadı VEYA fiyat geçersiz (0 TL) - koleksiyon indirimini kullanarak tahmin et
+                    # Liste fiyatı 0 ise tahmin yapma (0 x indirim = 0)
+                    if koleksiyon_indirim is not None and old_liste > 0:
+                        tahmini_perakende = old_liste * (1 - koleksiyon_indirim)
+
+                        # Liste fiyat aynı kalır, sadece perakende güncellenir
+                        if abs(tahmini_perakende - old_perakende) > FIYAT_FARK_ESIGI:
+                            urun['perakende_fiyat'] = tahmini_perakende
+                            degisenler.append((sku, old_perakende, tahmini_perakende))
+                    continue  # Sonraki ürüne geç
+
+                # Sadece mutlak değer farkı 7'den büyükse güncelle
+                if abs(price_info['perakende'] - old_perakende) > FIYAT_FARK_ESIGI:
+                    urun['liste_fiyat'] = price_info['liste']
+                    urun['perakende_fiyat'] = price_info['perakende']
+                    degisenler.append((sku, old_perakende, price_info['perakende']))
+
+        # takim_sku fiyatlarını yeniden hesapla
+        total_liste = 0.0
+        total_perakende = 0.0
+        for urun in etiket_listesi.get('urunler', []):
+            total_liste += urun.get('liste_fiyat', 0.0)
+            total_perakende += urun.get('perakende_fiyat', 0.0)
+
+        takim_sku['liste_fiyat'] = round(total_liste, 2)
+        takim_sku['perakende_fiyat'] = round(total_perakende, 2)
+
+        # indirim_yuzde hesapla
+        if total_liste > 0:
+            takim_sku['indirim_yuzde'] = round(((total_liste - total_perakende) / total_liste) * 100)
+        else:
+            takim_sku['indirim_yuzde'] = 0
+
+        # updated_at güncelle
+        takim_sku['updated_at'] = current_time
+
+    # etiket_listesi dışındaki tüm takımları bul ve fiyatlarını güncelle
+    for key, value in koleksiyon_data.items():
+        if not is_takim(key, value):
+            continue
+
+        # Takım için toplam fiyatları hesapla
+        total_liste = 0.0
+        total_perakende = 0.0
+
+        for product in value.get('products', []):
+            product_sku = str(product.get('sku', ''))
+            product_miktar = product.get('miktar', 1)
+
+            # Excel'den yeni fiyatları al
+            price_info = price_loader.get_price(product_sku) if price_loader else None
+
+            # ✅ KORUMA: SKU bulunamadıysa veya fiyat geçersizse atla
+            if price_info is None:
+                log(f"[WARNING] Takım ürünü SKU {product_sku} Google Sheets'te bulunamadı - atlandı")
+                continue
+
+            if price_info['perakende'] <= 0 or price_info['liste'] <= 0:
+                log(f"[WARNING] Takım ürünü SKU {product_sku} için geçersiz fiyat - atlandı")
+                continue
+
+            # Fiyatları miktar ile çarp ve topla
+            total_liste += price_info['liste'] * product_miktar
+            total_perakende += price_info['perakende'] * product_miktar
+
+        # Toplam fiyatları güncelle
+        value['total_liste_price'] = round(total_liste, 2)
+        value['total_perakende_price'] = round(total_perakende, 2)
+
+        # İndirim yüzdesini hesapla
+        if total_liste > 0:
+            value['total_indirim_yuzde'] = round(((total_liste - total_perakende) / total_liste) * 100)
+        else:
+            value['total_indirim_yuzde'] = 0
+
+    return degisenler
+
+
+def reconcile(json_data, price_loader, current_time=None, secili=None, log=print):
+    """Tüm koleksiyonları fiyat listesiyle karşılaştır ve fiyat farkı olanları güncelle
+
+    Args:
+        json_data: etiketEkle.json içeriği (yerinde güncellenir)
+        price_loader: Fiyat kaynağı
+        current_time: updated_at için zaman damgası (None = şimdi)
+        secili: Güncellenecek (kategori, koleksiyon) anahtarları (None = hepsi)
+
+    Returns:
+        dict: {'guncellenen': {(kategori, koleksiyon): [(sku, eski, yeni)]},
+               'missing': {sku: urun_adi_tam}, 'koleksiyon_sayisi': int}
+    """
+    if current_time is None:
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    sonuc = {'guncellenen': {}, 'missing': {}, 'koleksiyon_sayisi': 0}
+
+    for kategori_adi, kategori_data in json_data.items():
+        for koleksiyon_adi, koleksiyon_data in kategori_data.items():
+            sonuc['koleksiyon_sayisi'] += 1
+
+            rows, missing, _ = koleksiyon_satirlari(kategori_adi, koleksiyon_adi, koleksiyon_data, price_loader)
+            sonuc['missing'].update(missing)
+
+            if secili is not None and (kategori_adi, koleksiyon_adi) not in secili:
+                continue
+            if not koleksiyon_flags(rows)['has_price_diff']:
+                continue
+
+            sonuc['guncellenen'][(kategori_adi, koleksiyon_adi)] = guncelle_koleksiyon_fiyatlari(
+                koleksiyon_data, price_loader, current_time, log=log)
+
+    return sonuc
+
+
+def cmd_reconcile(args):
+    """reconcile komutu: --dry-run raporlar, --apply JSON dosyasına yazar"""
+    sure = {}
+
+    baslangic = time.perf_counter()
+    depo = EtiketDeposu(args.json)
+    json_data = depo.load()
+    sure['json_oku'] = time.perf_counter() - baslangic
+
+    baslangic = time.perf_counter()
+    price_loader = PriceLoader(snapshot_file=args.prices)
+    sure['fiyat_yukle'] = time.perf_counter() - baslangic
+
+    if not price_loader.price_data:
+        print("[HATA] Fiyat verisi yüklenemedi, işlem iptal edildi")
+        return 1
+
+    if args.save_prices:
+        price_loader.save_snapshot(args.save_prices)
+        print(f"[OK] Fiyat anlık görüntüsü kaydedildi: {args.save_prices}")
+
+    # Dry-run belgeyi değiştirmez
+    hedef = copy.deepcopy(json_data) if args.dry_run else json_data
+    log = print if args.verbose else (lambda mesaj: None)
+
+    baslangic = time.perf_counter()
+    sonuc = reconcile(hedef, price_loader, log=log)
+    sure['mutabakat'] = time.perf_counter() - baslangic
+
+    # Rapor
+    urun_sayisi = 0
+    for (kategori_adi, koleksiyon_adi), degisenler in sorted(sonuc['guncellenen'].items()):
+        urun_sayisi += len(degisenler)
+        print(f"[{'DRY-RUN' if args.dry_run else 'GÜNCELLE'}] {kategori_adi} > {koleksiyon_adi}: {len(degisenler)} ürün")
+        if args.verbose:
+            for sku, eski, yeni in degisenler:
+                print(f"    {sku}: {eski:,.2f} → {yeni:,.2f}")
+
+    print(f"\n{'='*80}")
+    print(f"Koleksiyon: {sonuc['koleksiyon_sayisi']} | Güncellenen: {len(sonuc['guncellenen'])} | "
+          f"Ürün: {urun_sayisi} | Eksik SKU: {len(sonuc['missing'])}")
+
+    if args.apply and sonuc['guncellenen']:
+        baslangic = time.perf_counter()
+        depo.koleksiyonlari_kaydet(sonuc['guncellenen'].keys())
+        sure['json_yaz'] = time.perf_counter() - baslangic
+        print(f"[OK] {args.json} güncellendi")
+    elif args.dry_run:
+        print("[INFO] Dry-run: dosyaya yazılmadı")
+
+    print("Süre: " + ", ".join(f"{k}={v*1000:.1f} ms" for k, v in sure.items()))
+    print(f"{'='*80}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="fiyatGuncelle", description="etiketEkle.json fiyat mutabakatı")
+    subparsers = parser.add_subparsers(dest="komut", required=True)
+
+    p_reconcile = subparsers.add_parser("reconcile", help="Fiyatları DogtasCom listesiyle karşılaştır/güncelle")
+    mod = p_reconcile.add_mutually_exclusive_group(required=True)
+    mod.add_argument("--dry-run", action="store_true", help="Sadece raporla, dosyaya yazma")
+    mod.add_argument("--apply", action="store_true", help="Değişiklikleri etiketEkle.json dosyasına yaz")
+    p_reconcile.add_argument("--json", default=os.path.join(get_base_dir(), "etiketEkle.json"),
+                             help="etiketEkle.json yolu")
+    p_reconcile.add_argument("--prices", help="Google Sheets yerine yerel fiyat anlık görüntüsü (JSON)")
+    p_reconcile.add_argument("--save-prices", help="İndirilen fiyatları bu dosyaya kaydet")
+    p_reconcile.add_argument("-v", "--verbose", action="store_true", help="Ürün bazında değişiklikleri göster")
+    p_reconcile.set_defaults(func=cmd_reconcile)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,18 +5,17 @@ etiketEkle.json ve Google Sheets'teki dogtasCom sayfasını tablo şeklinde kar
 
 import sys
 import os
-import json
-from PyQt5.QtCore import Qt
+import time
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QMessageBox, QHeaderView, QLineEdit,
                              QTableWidget, QTableWidgetItem, QApplication,
                              QMainWindow, QCheckBox, QTreeWidget, QTreeWidgetItem, QDialog)
 from PyQt5.QtGui import QFont, QColor, QBrush
-import pandas as pd
 from datetime import datetime
-import requests
-from io import BytesIO
 from config import SPREADSHEET_ID
+from fiyatGuncelle import PriceLoader, koleksiyon_satirlari, koleksiyon_flags, guncelle_koleksiyon_fiyatlari
+from etiketBelgesi import EtiketBelgesi
 
 # Google Sheets API
 try:
@@ -77,63 +76,171 @@ def setup_data_file(filename):
     return target_file
 
 
-class PriceLoader:
-    """Google Sheets'ten fiyat verilerini yükleyen sınıf"""
+class HataUploaderThread(QThread):
+    """Eksik SKU'ları Google Sheets Hata sayfasına arka planda yükleyen thread
+
+    Son yüklenen küme bellekte tutulur; sadece eklenen/silinen/adı değişen satırlar
+    gönderilir. Küme değişmediyse ağa hiç çıkılmaz.
+    """
+    finished_signal = pyqtSignal(str)  # Başarı mesajı (boş = değişiklik yok)
+    error_signal = pyqtSignal(str)
+
+    HEADER = ['SKU', 'urun_adi_tam']
 
     def __init__(self):
-        self.price_data = {}
-        self.load_prices()
+        super().__init__()
+        self.uploaded = None  # {sku: urun_adi_tam} - Hata sayfasındaki son bilinen durum (None = henüz okunmadı)
+        self.sheet_skus = []  # Sayfadaki SKU'lar, satır sırasıyla (2. satırdan itibaren)
+        self.worksheet = None
+        self.target = {}
+
+    def set_target(self, missing_skus):
+        """Yüklenecek kümeyi ayarla - thread çalışmıyorken çağrılmalı"""
+        self.target = dict(missing_skus)
+
+    def is_up_to_date(self, missing_skus):
+        """Hata sayfası verilen kümeyle zaten aynı mı?"""
+        return self.uploaded is not None and self.uploaded == missing_skus
+
+    def get_worksheet(self):
+        """Hata sayfasını aç (yoksa oluştur) - bağlantı tekrar kullanılır"""
+        if self.worksheet is not None:
+            return self.worksheet
+
+        # Service Account authentication
+        service_account_file = os.path.join(get_base_dir(), 'service-account.json')
+        if not os.path.exists(service_account_file):
+            raise FileNotFoundError(f"service-account.json bulunamadı: {service_account_file}")
+
+        SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+        creds = Credentials.from_service_account_file(service_account_file, scopes=SCOPES)
+        client = gspread.authorize(creds)
+        spreadsheet = client.open_by_key(SPREADSHEET_ID)
+
+        # Hata sayfası var mı kontrol et, yoksa oluştur
+        try:
+            self.worksheet = spreadsheet.worksheet("Hata")
+        except gspread.exceptions.WorksheetNotFound:
+            self.worksheet = spreadsheet.add_worksheet(title="Hata", rows=1000, cols=2)
+
+        return self.worksheet
+
+    def read_sheet(self, worksheet):
+        """Sayfanın mevcut içeriğini oku (ilk yüklemede bir kez)"""
+        values = worksheet.get_all_values()
+        if not values or values[0][:2] != self.HEADER:
+            # Boş veya tanınmayan sayfa - başlıkla baştan yaz
+            worksheet.clear()
+            worksheet.update(range_name='A1', values=[self.HEADER])
+            self.sheet_skus = []
+            self.uploaded = {}
+            return
+
+        self.sheet_skus = []
+        self.uploaded = {}
+        for row in values[1:]:
+            sku = row[0] if row else ''
+            if not sku:
+                continue
+            self.sheet_skus.append(sku)
+            self.uploaded[sku] = row[1] if len(row) > 1 else ''
+
+        if len(self.uploaded) != len(values) - 1:
+            # Boş satırlar veya tekrarlar var - sıkıştırılmış halini yaz (her SKU bir kez)
+            self.sheet_skus = list(self.uploaded)
+            worksheet.clear()
+            worksheet.update(range_name='A1', values=[self.HEADER] + [[k, self.uploaded[k]] for k in self.sheet_skus])
 
-    def load_prices(self):
-        """Google Sheets'ten dogtasCom sayfasını yükle ve SKU bazlı fiyat sözlüğü oluştur"""
+    def run(self):
+        """Farkı hesapla ve sadece değişen satırları gönder"""
         try:
-            # Google Sheets URL
-            gsheets_url = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=xlsx"
+            target = self.target
+            worksheet = self.get_worksheet()
 
-            # Google Sheets'ten veri çek
-            response = requests.get(gsheets_url, timeout=30)
+            if self.uploaded is None:
+                self.read_sheet(worksheet)
 
-            if response.status_code != 200:
-                print(f"Google Sheets yükleme hatası: HTTP {response.status_code}")
-                self.price_data = {}
+            silinecek = set(self.uploaded) - set(target)
+            eklenecek = sorted(set(target) - set(self.uploaded))
+            guncellenecek = [sku for sku in target if sku in self.uploaded and self.uploaded[sku] != target[sku]]
+
+            if not (silinecek or eklenecek or guncellenecek):
+                self.finished_signal.emit("")
                 return
 
-            # DogtasCom sayfasını oku
-            df = pd.read_excel(BytesIO(response.content), sheet_name="DogtasCom")
-
-            # SKU'yu string'e çevir ve fiyat bilgilerini sözlüğe aktar
-            for _, row in df.iterrows():
-                sku = str(row['sku'])
-                self.price_data[sku] = {
-                    'liste': float(row['LISTE']) if pd.notna(row['LISTE']) else 0.0,
-                    'perakende': float(row['PERAKENDE']) if pd.notna(row['PERAKENDE']) else 0.0,
-                    'kategori': str(row.get('kategori', '')),
-                    'koleksiyon': str(row.get('KOLEKSIYON', ''))
-                }
-        except Exception as e:
-            print(f"Google Sheets yükleme hatası: {e}")
-            self.price_data = {}
+            # Silinecek satırları alttan yukarı, ardışık bloklar halinde sil
+            satirlar = sorted((i + 2 for i, sku in enumerate(self.sheet_skus) if sku in silinecek), reverse=True)
+            while satirlar:
+                bitis = baslangic = satirlar.pop(0)
+                while satirlar and satirlar[0] == baslangic - 1:
+                    baslangic = satirlar.pop(0)
+                worksheet.delete_rows(baslangic, bitis)
+            self.sheet_skus = [sku for sku in self.sheet_skus if sku not in silinecek]
+
+            # Adı değişen satırları tek istekte güncelle
+            if guncellenecek:
+                konum = {sku: i + 2 for i, sku in enumerate(self.sheet_skus)}
+                worksheet.batch_update([
+                    {'range': f"B{konum[sku]}", 'values': [[target[sku]]]}
+                    for sku in guncellenecek
+                ])
+
+            # Yeni satırları sona ekle
+            if eklenecek:
+                worksheet.append_rows([[sku, target[sku]] for sku in eklenecek])
+                self.sheet_skus.extend(eklenecek)
+
+            self.uploaded = target
+            self.finished_signal.emit(
+                f"Hata sayfası güncellendi: +{len(eklenecek)} / -{len(silinecek)} / ~{len(guncellenecek)} SKU")
 
-    def get_price(self, sku):
-        """SKU'ya göre fiyat bilgisi döndür - SKU yoksa None döner"""
-        sku_str = str(sku)
-        return self.price_data.get(sku_str, None)  # SKU yoksa None döndür
+        except Exception as e:
+            # Sayfanın durumu artık bilinmiyor - bir sonraki yüklemede yeniden oku
+            self.uploaded = None
+            self.worksheet = None
+            self.error_signal.emit(str(e))
 
 
 class JsonGosterWidget(QWidget):
     """JSON Görüntüleyici Widget - Ana pencereye embed edilebilir"""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, belge=None):
         super().__init__(parent)
 
         # Dosya yolları - PyInstaller uyumlu
         self.json_file = setup_data_file("etiketEkle.json")
+
+        # Paylaşılan belge (MainWindow verir) - diğer ekranların kayıtları degisti sinyaliyle gelir
+        self.belge = belge if belge is not None else EtiketBelgesi(self.json_file, self)
+        self.belge.degisti.connect(self.on_belge_degisti)
         self.json_data = None
         self.price_loader = None
         self.table_data = []  # Tüm ürün verilerini saklar
-        self.koleksiyon_widgets = {}  # {(kategori, koleksiyon): {'sec': checkbox, 'exc': checkbox, 'sube': checkbox, 'has_price_diff': bool, 'has_missing_sku': bool}}
-        self.takim_widgets = {}  # {(kategori, koleksiyon, takim_adi): checkbox}
+        self.koleksiyon_rows = {}  # {(kategori, koleksiyon): [row_data]} - koleksiyon bazlı satırlar
+        self.missing_by_koleksiyon = {}  # {(kategori, koleksiyon): {sku: urun_adi_tam}}
+        self.sku_index = {}  # {(kategori, koleksiyon): {'data': koleksiyon_data, 'urunler': {sku: urun}, 'takimlar': {takim_adi: {sku: product}}}}
+        self.pending_edits = {}  # {(tur, kategori, koleksiyon, takim_adi, sku, kolon): yeni_metin} - sadece düzenlenen hücreler
+        self.koleksiyon_widgets = {}  # {(kategori, koleksiyon): {'sec': checkbox, 'exc': checkbox, 'sube': checkbox}} - sadece oluşturulmuş satırlar
+        self.koleksiyon_state = {}  # {(kategori, koleksiyon): {'sec': bool, 'exc': bool, 'sube': bool, 'has_price_diff': bool, 'has_missing_sku': bool}}
+        self.kategori_items = {}  # {kategori: QTreeWidgetItem}
+        self.koleksiyon_items = {}  # {(kategori, koleksiyon): QTreeWidgetItem} - sadece oluşturulmuş satırlar
+        self.visible_koleksiyonlar = {}  # {kategori: {koleksiyon: [row_data]}} - filtre sonrası görünür satırlar
+        self.populated_koleksiyonlar = set()  # Alt satırları oluşturulmuş (kategori, koleksiyon) anahtarları
+        self.secili_takimlar = set()  # İşaretli takımlar: {(kategori, koleksiyon, takim_adi)}
+        self.population_job = None  # Parçalı genişletme işi (generator) - yeni doldurma eskisini iptal eder
+
+        # Hata sayfası yükleyicisi (arka plan) - art arda gelen istekler tek yüklemede birleştirilir
+        self.hata_uploader = HataUploaderThread()
+        self.hata_uploader.finished_signal.connect(self.on_hata_upload_finished)
+        self.hata_uploader.error_signal.connect(self.on_hata_upload_error)
+        self.hata_upload_timer = QTimer(self)
+        self.hata_upload_timer.setSingleShot(True)
+        self.hata_upload_timer.setInterval(1500)
+        self.hata_upload_timer.timeout.connect(self.start_hata_upload)
+        QApplication.instance().aboutToQuit.connect(lambda: self.hata_uploader.wait(5000))
         self.missing_skus = {}  # Bulunamayan veya fiyatı 0 olan SKU'lar: {sku: urun_adi_tam}
+        self.dirty_koleksiyonlar = set()  # Kaydedilmemiş değişikliği olan (kategori, koleksiyon) anahtarları
+        self.current_filter = ""  # Aktif arama metni
 
         # UI setup
         self.setup_ui()
@@ -363,6 +470,10 @@ class JsonGosterWidget(QWidget):
             "sku"
         ])
 
+        # Kullanıcı düzenlemelerini takip et (save sırasında sadece düzenlenen satırlar işlenir)
+        self.tree.itemChanged.connect(self.on_tree_item_changed)
+        self.tree.itemExpanded.connect(self.on_tree_item_expanded)
+
         main_layout.addWidget(self.tree)
 
         # Status label
@@ -381,20 +492,23 @@ class JsonGosterWidget(QWidget):
         main_layout.addWidget(self.status_label)
 
     def load_data(self):
-        """JSON dosyasını ve Google Sheets verilerini yükle"""
+        """JSON dosyasını ve Google Sheets verilerini yükle
+
+        Tam yenileme: fiyat indeksi yalnızca burada (açılışta ve Yenile butonunda)
+        yeniden indirilir. Kaydet/Sil işlemleri bellekteki belge üzerinde çalışır.
+        """
         try:
             self.status_label.setText("🔄 Veriler yükleniyor...")
             QApplication.processEvents()
 
             # JSON dosyasını kontrol et
-            if not os.path.exists(self.json_file):
+            if not self.belge.exists():
                 self.status_label.setText("❌ JSON dosyası bulunamadı")
                 QMessageBox.warning(self, "Uyarı", f"JSON dosyası bulunamadı:\n{self.json_file}")
                 return
 
             # JSON dosyasını oku
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                self.json_data = json.load(f)
+            self.json_data = self.belge.load(kaynak=self)
 
             # Google Sheets'ten fiyat verilerini yükle
             self.price_loader = PriceLoader()
@@ -402,8 +516,11 @@ class JsonGosterWidget(QWidget):
             # Tablo verilerini hazırla
             self.prepare_table_data()
 
+            # Bellekteki belge diskle aynı, bekleyen değişiklik yok
+            self.dirty_koleksiyonlar = set()
+
             # Tree'yi doldur (gruplandırılmış)
-            self.populate_tree()
+            self.populate_tree(self.current_filter)
 
             # Eksik SKU'ları Hata sayfasına kaydet
             self.save_missing_skus_to_hata()
@@ -416,561 +533,135 @@ class JsonGosterWidget(QWidget):
             self.status_label.setText(f"❌ {error_msg}")
             QMessageBox.critical(self, "Hata", error_msg)
 
-    def calculate_collection_discount(self, koleksiyon_urunler, koleksiyon_adi):
-        """
-        Koleksiyondaki ürünlerin liste fiyatlarına göre indirim oranını hesapla
-
-        Args:
-            koleksiyon_urunler: JSON'daki koleksiyon ürünleri listesi
-            koleksiyon_adi: Koleksiyon adı (log için)
-
-        Returns:
-            float or None: Median indirim oranı (0.0-1.0 arası) veya None (yeterli veri yoksa)
-        """
-        gecerli_indirimler = []
-
-        for urun in koleksiyon_urunler:
-            sku = str(urun.get('sku', ''))
-
-            # SKU filtreleme
-            if not sku.startswith('3') or len(sku) != 10:
-                continue
-
-            json_liste = urun.get('liste_fiyat', 0.0)
-            json_perakende = urun.get('perakende_fiyat', 0.0)
-
-            # Sheets'ten fiyat al
-            price_info = self.price_loader.get_price(sku) if self.price_loader else None
-
-            if price_info is None:
-                continue  # SKU bulunamadı, atla
-
-            sheets_liste = price_info['liste']
-            sheets_perakende = price_info['perakende']
-
-            # Geçersiz fiyatları atla
-            if sheets_liste <= 0 or sheets_perakende <= 0:
-                continue
-
-            # Negatif indirim oranlarını filtrele (perakende > liste = veri hatası)
-            if sheets_perakende > sheets_liste:
-                continue
-
-            # KRİTİK: Liste fiyat değişmiş mi? (±100 TL tolerans)
-            if abs(json_liste - sheets_liste) <= 100:
-                # Liste fiyat AYNI → indirim oranını hesapla
-                indirim_orani = (sheets_liste - sheets_perakende) / sheets_liste
-                gecerli_indirimler.append(indirim_orani)
-
-        # En az 2 geçerli ürün olmalı
-        if len(gecerli_indirimler) >= 2:
-            # Median hesapla (aykırı değerlere dayanıklı)
-            sorted_indirimler = sorted(gecerli_indirimler)
-            n = len(sorted_indirimler)
-            if n % 2 == 0:
-                median_indirim = (sorted_indirimler[n//2 - 1] + sorted_indirimler[n//2]) / 2
-            else:
-                median_indirim = sorted_indirimler[n//2]
-
-            return median_indirim
-        else:
-            return None
-
     def save_missing_skus_to_hata(self):
-        """Eksik SKU'ları Google Sheets Hata sayfasına kaydet (Service Account kullanarak)"""
-        if not self.missing_skus:
-            return
-
+        """Eksik SKU'ların Hata sayfasına yüklenmesini planla (arka planda, sadece fark gönderilir)"""
         if not GSPREAD_AVAILABLE:
             return
 
-        try:
-            # Service Account authentication
-            service_account_file = os.path.join(get_base_dir(), 'service-account.json')
+        # Kısa süre içindeki yükle/kaydet/sil çağrıları tek yüklemede birleşir
+        self.hata_upload_timer.start()
 
-            if not os.path.exists(service_account_file):
-                print("[ERROR] service-account.json dosyası bulunamadı")
-                print(f"[INFO] Beklenen konum: {service_account_file}")
-                return
+    def start_hata_upload(self):
+        """Hata sayfası yüklemesini başlat - önceki yükleme sürüyorsa bitince tekrar denenir"""
+        if self.hata_uploader.isRunning():
+            return  # on_hata_upload_finished/error yeniden planlar
 
-            from google.oauth2.service_account import Credentials
+        if self.hata_uploader.is_up_to_date(self.missing_skus):
+            return  # Değişiklik yok, ağa çıkma
 
-            SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-            creds = Credentials.from_service_account_file(service_account_file, scopes=SCOPES)
+        self.hata_uploader.set_target(self.missing_skus)
+        self.hata_uploader.start()
 
-            # gspread client oluştur
-            client = gspread.authorize(creds)
+    def on_hata_upload_finished(self, message):
+        """Yükleme tamamlandı - bu arada küme değiştiyse tekrar yükle"""
+        if message:
+            print(f"[INFO] {message}")
 
-            # Spreadsheet'i aç
-            spreadsheet = client.open_by_key(SPREADSHEET_ID)
+        if not self.hata_uploader.is_up_to_date(self.missing_skus):
+            self.hata_upload_timer.start()
 
-            # Hata sayfası var mı kontrol et, yoksa oluştur
-            try:
-                worksheet = spreadsheet.worksheet("Hata")
-            except gspread.exceptions.WorksheetNotFound:
-                worksheet = spreadsheet.add_worksheet(title="Hata", rows=1000, cols=1)
-
-            # Sayfayı temizle
-            worksheet.clear()
-
-            # SKU ve ürün adı listesi oluştur
-            data_list = []
-            for sku, urun_adi in sorted(self.missing_skus.items()):
-                data_list.append({
-                    'SKU': sku,
-                    'urun_adi_tam': urun_adi
-                })
-
-            # DataFrame oluştur
-            df = pd.DataFrame(data_list)
-
-            # Google Sheets'e yaz
-            data_to_write = [df.columns.values.tolist()] + df.values.tolist()
-            worksheet.update(range_name='A1', values=data_to_write)
-
-        except Exception as e:
-            pass  # Sessiz hata
+    def on_hata_upload_error(self, error):
+        """Yükleme hatasını durum çubuğunda göster (sessizce yutma)"""
+        print(f"[ERROR] Hata sayfası yüklenemedi: {error}")
+        self.status_label.setText(f"⚠ Eksik SKU'lar Hata sayfasına yüklenemedi: {error}")
 
     def prepare_table_data(self):
         """JSON'dan tüm etiket_listesi ve takım verilerini çıkar"""
         self.table_data = []
         self.takim_data = {}  # {kategori: {koleksiyon: {takim_adi: [products]}}}
+        self.koleksiyon_rows = {}
+        self.missing_by_koleksiyon = {}
+        self.sku_index = {}
         self.missing_skus = {}  # Eksik SKU'ları topla: {sku: urun_adi_tam}
 
         if not self.json_data:
             return
 
-        # Her kategori için
+        # Her kategori ve koleksiyon için
         for kategori_adi, kategori_data in self.json_data.items():
-            # Her koleksiyon için
             for koleksiyon_adi, koleksiyon_data in kategori_data.items():
-                # Etiket listesini kontrol et
-                if 'etiket_listesi' in koleksiyon_data:
-                    etiket_listesi = koleksiyon_data['etiket_listesi']
-                    urunler = etiket_listesi.get('urunler', [])
-
-                    # Koleksiyon indirim oranını hesapla (sadece liste fiyatı sabit olanlar için)
-                    koleksiyon_indirim = self.calculate_collection_discount(urunler, koleksiyon_adi)
-
-                    # Her ürün için
-                    for urun in urunler:
-                        sku = str(urun.get('sku', ''))
-
-                        # SKU filtreleme: 3 ile başlamalı ve 10 haneli olmalı
-                        if not sku.startswith('3') or len(sku) != 10:
-                            continue
-
-                        urun_adi = urun.get('urun_adi_tam', '')
-                        liste_fiyat = urun.get('liste_fiyat', 0.0)
-                        perakende_fiyat = urun.get('perakende_fiyat', 0.0)
-
-                        # Excel'den güncel fiyatı al
-                        price_info = self.price_loader.get_price(sku) if self.price_loader else None
-
-                        # Malzeme adı: KOLEKSIYON + Ürün Adı
-                        Malzeme_adi = f"{koleksiyon_adi} {urun_adi.replace(koleksiyon_adi, '').strip()}"
-
-                        # SKU Google Sheets'te var mı ve fiyatlar geçerli mi kontrol et
-                        if price_info is None or (price_info['liste'] <= 0 or price_info['perakende'] <= 0):
-                            # Eksik SKU'yu kaydet (Hata sayfası için)
-                            self.missing_skus[sku] = urun_adi
-
-                            # SKU bulunamadı VEYA fiyat geçersiz (0 TL) - koleksiyon indirimini kullanarak tahmin et
-                            if koleksiyon_indirim is not None:
-                                # Liste fiyatı 0 ise tahmin yapma (0 x indirim = 0)
-                                if liste_fiyat <= 0:
-                                    liste_new = liste_fiyat
-                                    perakende_new = perakende_fiyat
-                                    has_price_data = False
-                                else:
-                                    # Tahmini perakende fiyat hesapla
-                                    tahmini_perakende = liste_fiyat * (1 - koleksiyon_indirim)
-                                    liste_new = liste_fiyat  # Liste fiyat değişmemiş
-                                    perakende_new = tahmini_perakende
-                                    has_price_data = False  # SKU bulunamadı veya geçersiz ama tahmin edildi
-                            else:
-                                # Koleksiyon indirimi yok, eski fiyatı koru
-                                liste_new = liste_fiyat
-                                perakende_new = perakende_fiyat
-                                has_price_data = False
-                        else:
-                            # SKU bulundu VE fiyatlar geçerli - güncel fiyatları kullan
-                            liste_new = price_info['liste']
-                            perakende_new = price_info['perakende']
-                            has_price_data = True
-
-                        # Tabloya eklenecek satır verisi (etiket_listesi için)
-                        row_data = {
-                            'type': 'etiket_listesi',
-                            'sku': sku,
-                            'miktar': 1,
-                            'urun_adi': urun_adi,
-                            'Malzeme_adi': Malzeme_adi,
-                            'liste': liste_fiyat,
-                            'perakende': perakende_fiyat,
-                            'kategori': kategori_adi,
-                            'koleksiyon': koleksiyon_adi,
-                            'liste_new': liste_new,
-                            'perakende_new': perakende_new,
-                            'has_price_data': has_price_data  # SKU bulundu mu?
-                        }
-
-                        self.table_data.append(row_data)
-
-                # Takım verilerini topla
-                if kategori_adi not in self.takim_data:
-                    self.takim_data[kategori_adi] = {}
-                if koleksiyon_adi not in self.takim_data[kategori_adi]:
-                    self.takim_data[kategori_adi][koleksiyon_adi] = {}
-
-                # Takımları bul
-                for key, value in koleksiyon_data.items():
-                    if key != 'etiket_listesi' and isinstance(value, dict) and 'products' in value:
-                        takim_adi = key
-                        products = value.get('products', [])
-
-                        # Takım ürünlerini işle
-                        takim_urunler = []
-                        for product in products:
-                            product_sku = str(product.get('sku', ''))
-
-                            # SKU filtreleme: 3 ile başlamalı ve 10 haneli olmalı
-                            if not product_sku.startswith('3') or len(product_sku) != 10:
-                                continue
-
-                            product_miktar = product.get('miktar', 1)
-                            urun_adi = product.get('urun_adi_tam', '')
-
-                            # Excel'den güncel fiyatı al
-                            price_info = self.price_loader.get_price(product_sku) if self.price_loader else None
-
-                            # Malzeme adı
-                            Malzeme_adi = f"{koleksiyon_adi} {urun_adi.replace(koleksiyon_adi, '').strip()}"
-
-                            # SKU Google Sheets'te var mı kontrol et
-                            if price_info is None:
-                                # SKU bulunamadı - fiyatları 0 bırak (takım ürünleri için normal)
-                                liste_new = 0.0
-                                perakende_new = 0.0
-                                has_price_data = False
-                            else:
-                                # SKU bulundu - güncel fiyatları kullan
-                                liste_new = price_info['liste']
-                                perakende_new = price_info['perakende']
-                                has_price_data = True
-
-                            # Takım ürünü verisi
-                            takim_urun = {
-                                'type': 'takim_urun',
-                                'sku': product_sku,
-                                'miktar': product_miktar,
-                                'urun_adi': urun_adi,
-                                'Malzeme_adi': Malzeme_adi,
-                                'liste': 0.0,  # Takım ürünlerinde liste fiyatı yok
-                                'perakende': 0.0,  # Takım ürünlerinde perakende fiyatı yok
-                                'kategori': kategori_adi,
-                                'koleksiyon': koleksiyon_adi,
-                                'liste_new': liste_new,
-                                'perakende_new': perakende_new,
-                                'has_price_data': has_price_data  # SKU bulundu mu?
-                            }
-
-                            takim_urunler.append(takim_urun)
-
-                        self.takim_data[kategori_adi][koleksiyon_adi][takim_adi] = takim_urunler
+                self.prepare_koleksiyon_data(kategori_adi, koleksiyon_adi, koleksiyon_data)
+
+        self.rebuild_table_data()
+
+    def rebuild_table_data(self):
+        """Koleksiyon bazlı satırlardan düz table_data ve missing_skus listelerini yeniden oluştur"""
+        self.table_data = [row for rows in self.koleksiyon_rows.values() for row in rows]
+        self.missing_skus = {}
+        for missing in self.missing_by_koleksiyon.values():
+            self.missing_skus.update(missing)
+
+    def drop_koleksiyon_data(self, kategori_adi, koleksiyon_adi):
+        """Silinen koleksiyonun hesaplanmış verilerini bellekten kaldır"""
+        self.koleksiyon_rows.pop((kategori_adi, koleksiyon_adi), None)
+        self.missing_by_koleksiyon.pop((kategori_adi, koleksiyon_adi), None)
+        self.sku_index.pop((kategori_adi, koleksiyon_adi), None)
+        if kategori_adi in self.takim_data:
+            self.takim_data[kategori_adi].pop(koleksiyon_adi, None)
+            if not self.takim_data[kategori_adi]:
+                del self.takim_data[kategori_adi]
+
+    def prepare_koleksiyon_data(self, kategori_adi, koleksiyon_adi, koleksiyon_data):
+        """Tek bir koleksiyonun etiket_listesi ve takım satırlarını hesapla (mevcut fiyat indeksiyle)"""
+        rows, missing, takimlar = koleksiyon_satirlari(kategori_adi, koleksiyon_adi, koleksiyon_data, self.price_loader)
+
+        self.koleksiyon_rows[(kategori_adi, koleksiyon_adi)] = rows
+        self.missing_by_koleksiyon[(kategori_adi, koleksiyon_adi)] = missing
+        self.sku_index[(kategori_adi, koleksiyon_adi)] = self.build_sku_index(koleksiyon_data)
+        self.takim_data.setdefault(kategori_adi, {})[koleksiyon_adi] = takimlar
+
+    def filter_rows(self, rows, filter_text):
+        """Satırları arama metnine göre filtrele"""
+        if not filter_text:
+            return rows
+
+        filter_lower = filter_text.lower()
+        return [
+            row for row in rows
+            if (filter_lower in row['kategori'].lower() or
+                filter_lower in row['koleksiyon'].lower() or
+                filter_lower in row['sku'].lower() or
+                filter_lower in row['urun_adi'].lower() or
+                filter_lower in row['Malzeme_adi'].lower())
+        ]
 
     def populate_tree(self, filter_text=""):
-        """Tree'yi gruplandırılmış şekilde doldur (Kategori -> Koleksiyon -> Etiket Listesi + Takımlar)"""
-        # Tree'yi temizle
-        self.tree.clear()
-        self.koleksiyon_widgets = {}  # Widget referanslarını sıfırla
-        self.takim_widgets = {}  # Takım widget referanslarını sıfırla
-
-        # Filtre uygula
-        filtered_data = self.table_data
-        if filter_text:
-            filter_lower = filter_text.lower()
-            filtered_data = [
-                row for row in self.table_data
-                if (filter_lower in row['kategori'].lower() or
-                    filter_lower in row['koleksiyon'].lower() or
-                    filter_lower in row['sku'].lower() or
-                    filter_lower in row['urun_adi'].lower() or
-                    filter_lower in row['Malzeme_adi'].lower())
-            ]
-
-        # Kategorilere göre grupla
-        from collections import defaultdict
-        kategori_groups = defaultdict(lambda: defaultdict(list))
-
-        for row_data in filtered_data:
-            kategori = row_data['kategori']
-            koleksiyon = row_data['koleksiyon']
-            kategori_groups[kategori][koleksiyon].append(row_data)
+        """Tree'yi gruplandırılmış şekilde doldur (Kategori -> Koleksiyon -> Etiket Listesi + Takımlar)
 
-        # Tree'ye ekle
-        for kategori_adi in sorted(kategori_groups.keys()):
-            # Kategori seviyesi
-            kategori_item = QTreeWidgetItem(self.tree)
-            kategori_item.setText(0, f"📂 {kategori_adi}")  # İlk sütuna yaz
-            kategori_item.setExpanded(False)  # Başlangıçta kapalı
-
-            # Kategori başlığını bold yap
-            font = QFont()
-            font.setBold(True)
-            font.setPointSize(10)
-            kategori_item.setFont(0, font)
-
-            # Tüm kolonlara arka plan rengi ver
-            for col in range(13):
-                kategori_item.setBackground(col, QBrush(QColor("#ecf0f1")))
-
-            # İlk kolonu tüm sütunlara yay (span) - doğru kullanım
-            from PyQt5.QtCore import QModelIndex
-            row_index = self.tree.indexOfTopLevelItem(kategori_item)
-            self.tree.setFirstColumnSpanned(row_index, QModelIndex(), True)
-
-            koleksiyonlar = kategori_groups[kategori_adi]
-
-            for koleksiyon_adi in sorted(koleksiyonlar.keys()):
-                # Koleksiyon seviyesi
-                koleksiyon_item = QTreeWidgetItem(kategori_item)
-
-                # Fiyat farkı ve eksik SKU kontrolü
-                urunler = koleksiyonlar[koleksiyon_adi]
-                has_price_diff = False
-                has_missing_sku = False
-                for row_data in urunler:
-                    fark = abs(row_data['perakende_new'] - row_data['perakende'])
-                    if fark > 7:
-                        has_price_diff = True
-                    if not row_data.get('has_price_data', True):
-                        has_missing_sku = True
-                    if has_price_diff and has_missing_sku:
-                        break  # Her ikisi de bulundu, döngüyü kes
-
-                # JSON'dan mevcut değerleri oku
-                exc_deger = False
-                sube_deger = False
-
-                if (self.json_data and
-                    kategori_adi in self.json_data and
-                    koleksiyon_adi in self.json_data[kategori_adi]):
-
-                    koleksiyon_data = self.json_data[kategori_adi][koleksiyon_adi]
-                    if 'etiket_listesi' in koleksiyon_data and 'takim_sku' in koleksiyon_data['etiket_listesi']:
-                        takim_sku = koleksiyon_data['etiket_listesi']['takim_sku']
-
-                        # String değerleri boolean'a çevir
-                        exc_deger = takim_sku.get('excDeger', 'false').lower() == 'true'
-                        sube_deger = takim_sku.get('subeDeger', 'false').lower() == 'true'
-
-                # SEÇ kolonu - Checkbox (varsayılan olarak HER ZAMAN seçili)
-                sec_checkbox = QCheckBox()
-                sec_checkbox.setChecked(True)  # Her zaman seçili
-                sec_widget = QWidget()
-                sec_layout = QHBoxLayout(sec_widget)
-                sec_layout.addWidget(sec_checkbox)
-                sec_layout.setAlignment(Qt.AlignCenter)
-                sec_layout.setContentsMargins(0, 0, 0, 0)
-                self.tree.setItemWidget(koleksiyon_item, 0, sec_widget)
-
-                # EXC kolonu - Checkbox (JSON'dan gelen değere göre)
-                exc_checkbox = QCheckBox()
-                exc_checkbox.setChecked(exc_deger)  # JSON'dan oku
-                exc_widget = QWidget()
-                exc_layout = QHBoxLayout(exc_widget)
-                exc_layout.addWidget(exc_checkbox)
-                exc_layout.setAlignment(Qt.AlignCenter)
-                exc_layout.setContentsMargins(0, 0, 0, 0)
-                self.tree.setItemWidget(koleksiyon_item, 1, exc_widget)
-
-                # SUBE kolonu - Checkbox (JSON'dan gelen değere göre)
-                sube_checkbox = QCheckBox()
-                sube_checkbox.setChecked(sube_deger)  # JSON'dan oku
-                sube_widget = QWidget()
-                sube_layout = QHBoxLayout(sube_widget)
-                sube_layout.addWidget(sube_checkbox)
-                sube_layout.setAlignment(Qt.AlignCenter)
-                sube_layout.setContentsMargins(0, 0, 0, 0)
-                self.tree.setItemWidget(koleksiyon_item, 2, sube_widget)
-
-                # Widget referanslarını sakla
-                self.koleksiyon_widgets[(kategori_adi, koleksiyon_adi)] = {
-                    'sec': sec_checkbox,
-                    'exc': exc_checkbox,
-                    'sube': sube_checkbox,
-                    'has_price_diff': has_price_diff,
-                    'has_missing_sku': has_missing_sku
-                }
-
-                # Kategori / KOLEKSIYON kolonu
-                koleksiyon_item.setText(3, f"📁 {koleksiyon_adi}")
-                koleksiyon_item.setExpanded(False)  # Başlangıçta kapalı
-
-                # Koleksiyon başlığını bold yap
-                font2 = QFont()
-                font2.setBold(True)
-                font2.setPointSize(9)
-                koleksiyon_item.setFont(3, font2)
-
-                # Koleksiyon renklendirme (ÖNCELİK: KIRMIZI > SARI > GRİ)
-                if has_price_diff:
-                    # Fiyat farkı >7 TL → KIRMIZI
-                    koleksiyon_item.setBackground(3, QBrush(QColor("#ffcccc")))
-                elif has_missing_sku:
-                    # SKU bulunamadı → SARI
-                    koleksiyon_item.setBackground(3, QBrush(QColor("#fff9c4")))
-                else:
-                    # Normal → GRİ
-                    koleksiyon_item.setBackground(3, QBrush(QColor("#d5dbdb")))
+        Sadece kategori satırları oluşturulur; koleksiyonlar ve ürünler ilgili düğüm ilk kez
+        açıldığında (on_tree_item_expanded) oluşturulur.
+        """
+        # Devam eden parçalı doldurma işini iptal et
+        self.population_job = None
 
-                # Etiket listesi ürünleri
-                urunler = koleksiyonlar[koleksiyon_adi]
-                for row_data in urunler:
-                    # SKU bulunamayan mı kontrol et
-                    has_price_data = row_data.get('has_price_data', True)
+        # Programatik değişiklikler düzenleme olarak kaydedilmesin
+        signals_blocked = self.tree.blockSignals(True)
 
-                    # Fark hesaplama (satır renklendirme için)
-                    fark = abs(row_data['perakende_new'] - row_data['perakende'])
-                    satir_kirmizi = fark > 7 and has_price_data  # SKU varsa ve fark > 7 ise kırmızı
+        # Tree'yi temizle (kaydedilmemiş hücre düzenlemeleri de atılır)
+        self.tree.clear()
+        self.pending_edits = {}
+        self.kategori_items = {}  # Kategori item referanslarını sıfırla
+        self.koleksiyon_items = {}  # Koleksiyon item referanslarını sıfırla
+        self.koleksiyon_widgets = {}  # Widget referanslarını sıfırla
+        self.koleksiyon_state = {}  # SEÇ/EXC/SUBE durumlarını sıfırla
+        self.populated_koleksiyonlar = set()
+        self.secili_takimlar = set()
 
-                    # Ürün satırı
-                    urun_item = QTreeWidgetItem(koleksiyon_item)
+        # Kategorilere göre grupla (filtre uygulanmış)
+        self.visible_koleksiyonlar = {}
 
-                    # SEÇ, EXC, SUBE, Kategori/KOLEKSIYON, Takım kolonları boş
-                    urun_item.setText(0, "")
-                    urun_item.setText(1, "")
-                    urun_item.setText(2, "")
-                    urun_item.setText(3, "")
-                    urun_item.setText(4, "")
-
-                    # Miktar (etiket_listesi için boş - çünkü products[].miktar yok)
-                    urun_item.setText(5, "")
-
-                    # Malzeme Adı - Düzenlenebilir
-                    urun_item.setText(6, row_data['Malzeme_adi'])
-                    urun_item.setFlags(urun_item.flags() | Qt.ItemIsEditable)
-
-                    # LISTE (JSON - liste_fiyat)
-                    urun_item.setText(7, f"{row_data['liste']:,.0f}")
-
-                    # PERAKENDE (JSON - perakende_fiyat)
-                    urun_item.setText(8, f"{row_data['perakende']:,.0f}")
-
-                    # Fark
-                    if has_price_data:
-                        urun_item.setText(9, f"{fark:,.2f}")
-                    else:
-                        urun_item.setText(9, "SKU YOK")  # Uyarı mesajı
-
-                    # LISTE_new (Excel)
-                    if has_price_data:
-                        urun_item.setText(10, f"{row_data['liste_new']:,.0f}")
-                    else:
-                        urun_item.setText(10, "?")  # SKU bulunamadı işareti
-
-                    # PERAKENDE_new (Excel)
-                    if has_price_data:
-                        urun_item.setText(11, f"{row_data['perakende_new']:,.0f}")
-                    else:
-                        urun_item.setText(11, "?")  # SKU bulunamadı işareti
+        for (kategori, koleksiyon), rows in self.koleksiyon_rows.items():
+            filtered_rows = self.filter_rows(rows, filter_text)
+            if filtered_rows:
+                self.visible_koleksiyonlar.setdefault(kategori, {})[koleksiyon] = filtered_rows
+                self.koleksiyon_state[(kategori, koleksiyon)] = self.initial_koleksiyon_state(
+                    kategori, koleksiyon, filtered_rows)
 
-                    # sku (EN SON)
-                    urun_item.setText(12, row_data['sku'])
-
-                    # Renklendirme (3 katman: SARI > KIRMIZI > BEYAZ)
-                    if not has_price_data:
-                        # SKU bulunamadı - SARI (ÖNCELİK 1)
-                        for col in range(13):
-                            urun_item.setBackground(col, QBrush(QColor("#fff9c4")))  # AÇIK SARI
-                            font = QFont()
-                            font.setBold(True)
-                            urun_item.setFont(col, font)
-                    elif satir_kirmizi:
-                        # Fark > 7 TL - KIRMIZI (ÖNCELİK 2)
-                        for col in range(13):
-                            urun_item.setBackground(col, QBrush(QColor("#ffcccc")))
-
-                # Takımları ekle (koleksiyon altında)
-                if kategori_adi in self.takim_data and koleksiyon_adi in self.takim_data[kategori_adi]:
-                    takimlar = self.takim_data[kategori_adi][koleksiyon_adi]
-
-                    for takim_adi in sorted(takimlar.keys()):
-                        takim_urunler = takimlar[takim_adi]
-
-                        if not takim_urunler:
-                            continue
-
-                        # Takım seviyesi (koleksiyon benzeri)
-                        takim_item = QTreeWidgetItem(koleksiyon_item)
-
-                        # Orijinal takım adını item'a kaydet (save sırasında kullanmak için)
-                        takim_item.setData(0, Qt.UserRole, {
-                            'kategori': kategori_adi,
-                            'koleksiyon': koleksiyon_adi,
-                            'orijinal_takim_adi': takim_adi
-                        })
-
-                        # Takım checkbox'ı ekle (varsayılan olarak işaretsiz)
-                        takim_checkbox = QCheckBox()
-                        takim_checkbox.setChecked(False)  # Varsayılan olarak işaretsiz
-                        takim_checkbox_widget = QWidget()
-                        takim_checkbox_layout = QHBoxLayout(takim_checkbox_widget)
-                        takim_checkbox_layout.addWidget(takim_checkbox)
-                        takim_checkbox_layout.setAlignment(Qt.AlignCenter)
-                        takim_checkbox_layout.setContentsMargins(0, 0, 0, 0)
-                        self.tree.setItemWidget(takim_item, 0, takim_checkbox_widget)
-
-                        # Takım widget referansını sakla
-                        self.takim_widgets[(kategori_adi, koleksiyon_adi, takim_adi)] = takim_checkbox
-
-                        # Takım başlığı - "Takım" sütunu hizasında (kolon 4)
-                        takim_item.setText(4, f"📁 {takim_adi}")
-                        takim_item.setExpanded(False)  # Başlangıçta kapalı
-
-                        # Takım adını düzenlenebilir yap
-                        takim_item.setFlags(takim_item.flags() | Qt.ItemIsEditable)
-
-                        # Takım başlığını bold ve koyu yap
-                        font_takim = QFont()
-                        font_takim.setBold(True)
-                        font_takim.setPointSize(9)
-                        takim_item.setFont(4, font_takim)
-
-                        # Tüm kolonlara arka plan rengi ver
-                        for col in range(13):
-                            takim_item.setBackground(col, QBrush(QColor("#d5dbdb")))
-
-                        # Takım ürünlerini ekle
-                        for takim_urun in takim_urunler:
-                            # Takım ürün satırı
-                            takim_urun_item = QTreeWidgetItem(takim_item)
-
-                            # SEÇ, EXC, SUBE, Kategori/KOLEKSIYON, Takım kolonları boş
-                            takim_urun_item.setText(0, "")
-                            takim_urun_item.setText(1, "")
-                            takim_urun_item.setText(2, "")
-                            takim_urun_item.setText(3, "")
-                            takim_urun_item.setText(4, "")
-
-                            # Miktar (products[].miktar) - Düzenlenebilir
-                            takim_urun_item.setText(5, str(takim_urun['miktar']))
-                            takim_urun_item.setFlags(takim_urun_item.flags() | Qt.ItemIsEditable)
-
-                            # Malzeme Adı (urun_adi_tam) - Düzenlenebilir
-                            takim_urun_item.setText(6, takim_urun['Malzeme_adi'])
-                            takim_urun_item.setFlags(takim_urun_item.flags() | Qt.ItemIsEditable)
-
-                            # LISTE, PERAKENDE, Fark, LISTE_new, PERAKENDE_new (takım ürünleri için boş)
-                            takim_urun_item.setText(7, "")
-                            takim_urun_item.setText(8, "")
-                            takim_urun_item.setText(9, "")
-                            takim_urun_item.setText(10, "")
-                            takim_urun_item.setText(11, "")
-
-                            # sku (EN SON)
-                            takim_urun_item.setText(12, takim_urun['sku'])
+        # Tree'ye ekle
+        for kategori_adi in sorted(self.visible_koleksiyonlar.keys()):
+            self.create_kategori_item(kategori_adi)
+
+        self.tree.blockSignals(signals_blocked)
 
         # Sütun genişliklerini ayarla
         header = self.tree.header()
@@ -1001,148 +692,696 @@ class JsonGosterWidget(QWidget):
         header.setSectionResizeMode(11, QHeaderView.ResizeToContents)  # PERAKENDE_new
         header.setSectionResizeMode(12, QHeaderView.ResizeToContents)  # sku
 
+    def create_kategori_item(self, kategori_adi):
+        """Kategori satırını oluştur - koleksiyonlar açılınca eklenir"""
+        # Kategori seviyesi
+        kategori_item = QTreeWidgetItem(self.tree)
+        kategori_item.setText(0, f"📂 {kategori_adi}")  # İlk sütuna yaz
+        kategori_item.setData(0, Qt.UserRole, {'tur': 'kategori', 'kategori': kategori_adi, 'koleksiyon': None})
+        kategori_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)  # Koleksiyonlar açılınca eklenir
+        kategori_item.setExpanded(False)  # Başlangıçta kapalı
+        self.kategori_items[kategori_adi] = kategori_item
+
+        # Kategori başlığını bold yap
+        font = QFont()
+        font.setBold(True)
+        font.setPointSize(10)
+        kategori_item.setFont(0, font)
+
+        # Tüm kolonlara arka plan rengi ver
+        for col in range(13):
+            kategori_item.setBackground(col, QBrush(QColor("#ecf0f1")))
+
+        # İlk kolonu tüm sütunlara yay (span) - doğru kullanım
+        from PyQt5.QtCore import QModelIndex
+        row_index = self.tree.indexOfTopLevelItem(kategori_item)
+        self.tree.setFirstColumnSpanned(row_index, QModelIndex(), True)
+        return kategori_item
+
+    def initial_koleksiyon_state(self, kategori_adi, koleksiyon_adi, urunler):
+        """Koleksiyonun SEÇ/EXC/SUBE başlangıç durumunu ve renk bayraklarını hesapla (widget oluşturmadan)"""
+        # JSON'dan mevcut değerleri oku
+        exc_deger = False
+        sube_deger = False
+
+        if (self.json_data and
+            kategori_adi in self.json_data and
+            koleksiyon_adi in self.json_data[kategori_adi]):
+
+            koleksiyon_data = self.json_data[kategori_adi][koleksiyon_adi]
+            if 'etiket_listesi' in koleksiyon_data and 'takim_sku' in koleksiyon_data['etiket_listesi']:
+                takim_sku = koleksiyon_data['etiket_listesi']['takim_sku']
+
+                # String değerleri boolean'a çevir
+                exc_deger = takim_sku.get('excDeger', 'false').lower() == 'true'
+                sube_deger = takim_sku.get('subeDeger', 'false').lower() == 'true'
+
+        state = {
+            'sec': True,  # SEÇ varsayılan olarak HER ZAMAN seçili
+            'exc': exc_deger,
+            'sube': sube_deger
+        }
+        state.update(koleksiyon_flags(urunler))
+        return state
+
+    def set_koleksiyon_flag(self, key, flag, checked):
+        """SEÇ/EXC/SUBE checkbox değişikliğini durum sözlüğüne yaz"""
+        if key in self.koleksiyon_state:
+            self.koleksiyon_state[key][flag] = checked
+
+    def set_takim_secili(self, key, checked):
+        """Takım checkbox değişikliğini seçili takımlar kümesine yaz"""
+        if checked:
+            self.secili_takimlar.add(key)
+        else:
+            self.secili_takimlar.discard(key)
+
+    def on_tree_item_expanded(self, item):
+        """Düğüm ilk kez açıldığında alt satırlarını oluştur"""
+        node = item.data(0, Qt.UserRole)
+        if not node:
+            return
+
+        if node['tur'] == 'kategori':
+            self.populate_kategori(node['kategori'])
+        elif node['tur'] == 'koleksiyon':
+            self.populate_koleksiyon(node['kategori'], node['koleksiyon'])
+
+    def populate_kategori(self, kategori_adi):
+        """Kategorinin koleksiyon satırlarını oluştur (henüz oluşturulmadıysa)"""
+        for _ in self.iter_populate_kategori(kategori_adi):
+            pass
+
+    def iter_populate_kategori(self, kategori_adi):
+        """Kategorinin koleksiyon satırlarını tek tek oluştur, her koleksiyondan sonra yield et"""
+        kategori_item = self.kategori_items.get(kategori_adi)
+        if kategori_item is None:
+            return
+
+        koleksiyonlar = self.visible_koleksiyonlar.get(kategori_adi, {})
+        for koleksiyon_adi in sorted(koleksiyonlar.keys()):
+            if (kategori_adi, koleksiyon_adi) not in self.koleksiyon_items:
+                self.create_koleksiyon_item(kategori_item, kategori_adi, koleksiyon_adi)
+                yield
+
+        kategori_item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+    def create_koleksiyon_item(self, kategori_item, kategori_adi, koleksiyon_adi):
+        """Koleksiyon satırını (SEÇ/EXC/SUBE checkbox'ları ile) oluştur - ürünler açılınca eklenir"""
+        key = (kategori_adi, koleksiyon_adi)
+        state = self.koleksiyon_state[key]
+
+        # Programatik değişiklikler düzenleme olarak kaydedilmesin
+        signals_blocked = self.tree.blockSignals(True)
+
+        # Koleksiyon seviyesi (iter_populate_kategori sıralı çağırır)
+        koleksiyon_item = QTreeWidgetItem(kategori_item)
+
+        koleksiyon_item.setData(0, Qt.UserRole, {'tur': 'koleksiyon', 'kategori': kategori_adi, 'koleksiyon': koleksiyon_adi})
+        koleksiyon_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)  # Ürünler açılınca eklenir
+        self.koleksiyon_items[key] = koleksiyon_item
+
+        # SEÇ kolonu - Checkbox (varsayılan olarak HER ZAMAN seçili)
+        sec_checkbox = QCheckBox()
+        sec_checkbox.setChecked(state['sec'])
+        sec_checkbox.toggled.connect(lambda checked, key=key: self.set_koleksiyon_flag(key, 'sec', checked))
+        sec_widget = QWidget()
+        sec_layout = QHBoxLayout(sec_widget)
+        sec_layout.addWidget(sec_checkbox)
+        sec_layout.setAlignment(Qt.AlignCenter)
+        sec_layout.setContentsMargins(0, 0, 0, 0)
+        self.tree.setItemWidget(koleksiyon_item, 0, sec_widget)
+
+        # EXC kolonu - Checkbox (JSON'dan gelen değere göre)
+        exc_checkbox = QCheckBox()
+        exc_checkbox.setChecked(state['exc'])  # JSON'dan oku
+        exc_checkbox.toggled.connect(lambda checked, key=key: self.set_koleksiyon_flag(key, 'exc', checked))
+        exc_widget = QWidget()
+        exc_layout = QHBoxLayout(exc_widget)
+        exc_layout.addWidget(exc_checkbox)
+        exc_layout.setAlignment(Qt.AlignCenter)
+        exc_layout.setContentsMargins(0, 0, 0, 0)
+        self.tree.setItemWidget(koleksiyon_item, 1, exc_widget)
+
+        # SUBE kolonu - Checkbox (JSON'dan gelen değere göre)
+        sube_checkbox = QCheckBox()
+        sube_checkbox.setChecked(state['sube'])  # JSON'dan oku
+        sube_checkbox.toggled.connect(lambda checked, key=key: self.set_koleksiyon_flag(key, 'sube', checked))
+        sube_widget = QWidget()
+        sube_layout = QHBoxLayout(sube_widget)
+        sube_layout.addWidget(sube_checkbox)
+        sube_layout.setAlignment(Qt.AlignCenter)
+        sube_layout.setContentsMargins(0, 0, 0, 0)
+        self.tree.setItemWidget(koleksiyon_item, 2, sube_widget)
+
+        # Widget referanslarını sakla (durumun kaynağı koleksiyon_state'tir)
+        self.koleksiyon_widgets[key] = {
+            'sec': sec_checkbox,
+            'exc': exc_checkbox,
+            'sube': sube_checkbox
+        }
+
+        # Kategori / KOLEKSIYON kolonu
+        koleksiyon_item.setText(3, f"📁 {koleksiyon_adi}")
+        koleksiyon_item.setExpanded(False)  # Başlangıçta kapalı
+
+        # Koleksiyon başlığını bold yap
+        font2 = QFont()
+        font2.setBold(True)
+        font2.setPointSize(9)
+        koleksiyon_item.setFont(3, font2)
+
+        self.update_koleksiyon_header(kategori_adi, koleksiyon_adi)
+
+        self.tree.blockSignals(signals_blocked)
+
+    def update_koleksiyon_header(self, kategori_adi, koleksiyon_adi):
+        """Koleksiyon satırının rengini fiyat farkı / eksik SKU bayraklarına göre güncelle"""
+        koleksiyon_item = self.koleksiyon_items[(kategori_adi, koleksiyon_adi)]
+        state = self.koleksiyon_state[(kategori_adi, koleksiyon_adi)]
+
+        # Koleksiyon renklendirme (ÖNCELİK: KIRMIZI > SARI > GRİ)
+        if state['has_price_diff']:
+            # Fiyat farkı >7 TL → KIRMIZI
+            koleksiyon_item.setBackground(3, QBrush(QColor("#ffcccc")))
+        elif state['has_missing_sku']:
+            # SKU bulunamadı → SARI
+            koleksiyon_item.setBackground(3, QBrush(QColor("#fff9c4")))
+        else:
+            # Normal → GRİ
+            koleksiyon_item.setBackground(3, QBrush(QColor("#d5dbdb")))
+
+    def populate_koleksiyon(self, kategori_adi, koleksiyon_adi):
+        """Koleksiyonun ürün ve takım satırlarını oluştur (henüz oluşturulmadıysa)"""
+        key = (kategori_adi, koleksiyon_adi)
+        if key in self.populated_koleksiyonlar or key not in self.koleksiyon_items:
+            return
+
+        self.populated_koleksiyonlar.add(key)
+        self.update_koleksiyon_item(kategori_adi, koleksiyon_adi, self.visible_koleksiyonlar[kategori_adi][koleksiyon_adi])
+        self.koleksiyon_items[key].setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+    def update_koleksiyon_item(self, kategori_adi, koleksiyon_adi, urunler):
+        """Koleksiyon satırının alt satırlarını (ürünler + takımlar) yeniden oluştur"""
+        koleksiyon_item = self.koleksiyon_items[(kategori_adi, koleksiyon_adi)]
+
+        # Programatik değişiklikler düzenleme olarak kaydedilmesin
+        signals_blocked = self.tree.blockSignals(True)
+
+        # Açık olan takımları hatırla (yeniden oluşturulduktan sonra tekrar açmak için)
+        acik_takimlar = set()
+        for k in range(koleksiyon_item.childCount()):
+            child = koleksiyon_item.child(k)
+            child_data = child.data(0, Qt.UserRole)
+            if child.isExpanded() and child_data and child_data['tur'] == 'takim':
+                acik_takimlar.add(child_data['takim_adi'])
+
+        # Eski alt satırları, bekleyen düzenlemeleri ve takım seçimlerini kaldır
+        koleksiyon_item.takeChildren()
+        self.discard_pending_edits(kategori_adi, koleksiyon_adi)
+        self.secili_takimlar = {k for k in self.secili_takimlar
+                                if not (k[0] == kategori_adi and k[1] == koleksiyon_adi)}
+
+        # Etiket listesi ürünleri
+        for row_data in urunler:
+            # SKU bulunamayan mı kontrol et
+            has_price_data = row_data.get('has_price_data', True)
+
+            # Fark hesaplama (satır renklendirme için)
+            fark = abs(row_data['perakende_new'] - row_data['perakende'])
+            satir_kirmizi = fark > 7 and has_price_data  # SKU varsa ve fark > 7 ise kırmızı
+
+            # Ürün satırı - JSON nesnesine SKU indeksi üzerinden bağlanır
+            urun_item = QTreeWidgetItem(koleksiyon_item)
+            urun_item.setData(0, Qt.UserRole, {
+                'tur': 'urun',
+                'kategori': kategori_adi,
+                'koleksiyon': koleksiyon_adi,
+                'sku': row_data['sku']
+            })
+
+            # SEÇ, EXC, SUBE, Kategori/KOLEKSIYON, Takım kolonları boş
+            urun_item.setText(0, "")
+            urun_item.setText(1, "")
+            urun_item.setText(2, "")
+            urun_item.setText(3, "")
+            urun_item.setText(4, "")
+
+            # Miktar (etiket_listesi için boş - çünkü products[].miktar yok)
+            urun_item.setText(5, "")
+
+            # Malzeme Adı - Düzenlenebilir
+            urun_item.setText(6, row_data['Malzeme_adi'])
+            urun_item.setFlags(urun_item.flags() | Qt.ItemIsEditable)
+
+            # LISTE (JSON - liste_fiyat)
+            urun_item.setText(7, f"{row_data['liste']:,.0f}")
+
+            # PERAKENDE (JSON - perakende_fiyat)
+            urun_item.setText(8, f"{row_data['perakende']:,.0f}")
+
+            # Fark
+            if has_price_data:
+                urun_item.setText(9, f"{fark:,.2f}")
+            else:
+                urun_item.setText(9, "SKU YOK")  # Uyarı mesajı
+
+            # LISTE_new (Excel)
+            if has_price_data:
+                urun_item.setText(10, f"{row_data['liste_new']:,.0f}")
+            else:
+                urun_item.setText(10, "?")  # SKU bulunamadı işareti
+
+            # PERAKENDE_new (Excel)
+            if has_price_data:
+                urun_item.setText(11, f"{row_data['perakende_new']:,.0f}")
+            else:
+                urun_item.setText(11, "?")  # SKU bulunamadı işareti
+
+            # sku (EN SON)
+            urun_item.setText(12, row_data['sku'])
+
+            # Renklendirme (3 katman: SARI > KIRMIZI > BEYAZ)
+            if not has_price_data:
+                # SKU bulunamadı - SARI (ÖNCELİK 1)
+                for col in range(13):
+                    urun_item.setBackground(col, QBrush(QColor("#fff9c4")))  # AÇIK SARI
+                    font = QFont()
+                    font.setBold(True)
+                    urun_item.setFont(col, font)
+            elif satir_kirmizi:
+                # Fark > 7 TL - KIRMIZI (ÖNCELİK 2)
+                for col in range(13):
+                    urun_item.setBackground(col, QBrush(QColor("#ffcccc")))
+
+        # Takımları ekle (koleksiyon altında)
+        if kategori_adi in self.takim_data and koleksiyon_adi in self.takim_data[kategori_adi]:
+            takimlar = self.takim_data[kategori_adi][koleksiyon_adi]
+
+            for takim_adi in sorted(takimlar.keys()):
+                takim_urunler = takimlar[takim_adi]
+
+                if not takim_urunler:
+                    continue
+
+                # Takım seviyesi (koleksiyon benzeri)
+                takim_item = QTreeWidgetItem(koleksiyon_item)
+
+                # Orijinal takım adını item'a kaydet (save sırasında kullanmak için)
+                takim_item.setData(0, Qt.UserRole, {
+                    'tur': 'takim',
+                    'kategori': kategori_adi,
+                    'koleksiyon': koleksiyon_adi,
+                    'takim_adi': takim_adi
+                })
+
+                # Takım checkbox'ı ekle (varsayılan olarak işaretsiz)
+                takim_checkbox = QCheckBox()
+                takim_checkbox.setChecked(False)  # Varsayılan olarak işaretsiz
+                takim_checkbox.toggled.connect(
+                    lambda checked, key=(kategori_adi, koleksiyon_adi, takim_adi): self.set_takim_secili(key, checked))
+                takim_checkbox_widget = QWidget()
+                takim_checkbox_layout = QHBoxLayout(takim_checkbox_widget)
+                takim_checkbox_layout.addWidget(takim_checkbox)
+                takim_checkbox_layout.setAlignment(Qt.AlignCenter)
+                takim_checkbox_layout.setContentsMargins(0, 0, 0, 0)
+                self.tree.setItemWidget(takim_item, 0, takim_checkbox_widget)
+
+                # Takım başlığı - "Takım" sütunu hizasında (kolon 4)
+                takim_item.setText(4, f"📁 {takim_adi}")
+
+                # Takım adını düzenlenebilir yap
+                takim_item.setFlags(takim_item.flags() | Qt.ItemIsEditable)
+
+                # Takım başlığını bold ve koyu yap
+                font_takim = QFont()
+                font_takim.setBold(True)
+                font_takim.setPointSize(9)
+                takim_item.setFont(4, font_takim)
+
+                # Tüm kolonlara arka plan rengi ver
+                for col in range(13):
+                    takim_item.setBackground(col, QBrush(QColor("#d5dbdb")))
+
+                # Takım ürünlerini ekle
+                for takim_urun in takim_urunler:
+                    # Takım ürün satırı
+                    takim_urun_item = QTreeWidgetItem(takim_item)
+                    takim_urun_item.setData(0, Qt.UserRole, {
+                        'tur': 'takim_urun',
+                        'kategori': kategori_adi,
+                        'koleksiyon': koleksiyon_adi,
+                        'takim_adi': takim_adi,
+                        'sku': takim_urun['sku']
+                    })
+
+                    # SEÇ, EXC, SUBE, Kategori/KOLEKSIYON, Takım kolonları boş
+                    takim_urun_item.setText(0, "")
+                    takim_urun_item.setText(1, "")
+                    takim_urun_item.setText(2, "")
+                    takim_urun_item.setText(3, "")
+                    takim_urun_item.setText(4, "")
+
+                    # Miktar (products[].miktar) - Düzenlenebilir
+                    takim_urun_item.setText(5, str(takim_urun['miktar']))
+                    takim_urun_item.setFlags(takim_urun_item.flags() | Qt.ItemIsEditable)
+
+                    # Malzeme Adı (urun_adi_tam) - Düzenlenebilir
+                    takim_urun_item.setText(6, takim_urun['Malzeme_adi'])
+                    takim_urun_item.setFlags(takim_urun_item.flags() | Qt.ItemIsEditable)
+
+                    # LISTE, PERAKENDE, Fark, LISTE_new, PERAKENDE_new (takım ürünleri için boş)
+                    takim_urun_item.setText(7, "")
+                    takim_urun_item.setText(8, "")
+                    takim_urun_item.setText(9, "")
+                    takim_urun_item.setText(10, "")
+                    takim_urun_item.setText(11, "")
+
+                    # sku (EN SON)
+                    takim_urun_item.setText(12, takim_urun['sku'])
+
+                # Kullanıcı bu takımı açmışsa açık bırak
+                takim_item.setExpanded(takim_adi in acik_takimlar)
+
+        self.tree.blockSignals(signals_blocked)
+
+    def remove_koleksiyon_item(self, kategori_adi, koleksiyon_adi):
+        """Koleksiyon satırını tree'den kaldır, kategori boş kaldıysa onu da kaldır"""
+        key = (kategori_adi, koleksiyon_adi)
+        koleksiyon_item = self.koleksiyon_items.pop(key, None)
+        self.koleksiyon_widgets.pop(key, None)
+        self.koleksiyon_state.pop(key, None)
+        self.populated_koleksiyonlar.discard(key)
+        self.discard_pending_edits(kategori_adi, koleksiyon_adi)
+        self.secili_takimlar = {k for k in self.secili_takimlar
+                                if not (k[0] == kategori_adi and k[1] == koleksiyon_adi)}
+
+        koleksiyonlar = self.visible_koleksiyonlar.get(kategori_adi)
+        if koleksiyonlar is None or koleksiyonlar.pop(koleksiyon_adi, None) is None:
+            return
+
+        if koleksiyon_item is not None:
+            self.kategori_items[kategori_adi].removeChild(koleksiyon_item)
+
+        if not koleksiyonlar:
+            # Kategori boş kaldı
+            del self.visible_koleksiyonlar[kategori_adi]
+            kategori_item = self.kategori_items.pop(kategori_adi)
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(kategori_item))
+
+    def add_koleksiyon_item(self, kategori_adi, koleksiyon_adi):
+        """Başka bir ekranda eklenen koleksiyonu filtreye uyuyorsa tree'ye ekle"""
+        key = (kategori_adi, koleksiyon_adi)
+        filtered_rows = self.filter_rows(self.koleksiyon_rows.get(key, []), self.current_filter)
+        if not filtered_rows:
+            return
+
+        self.visible_koleksiyonlar.setdefault(kategori_adi, {})[koleksiyon_adi] = filtered_rows
+        self.koleksiyon_state[key] = self.initial_koleksiyon_state(kategori_adi, koleksiyon_adi, filtered_rows)
+
+        kategori_item = self.kategori_items.get(kategori_adi)
+        if kategori_item is None:
+            signals_blocked = self.tree.blockSignals(True)
+            self.create_kategori_item(kategori_adi)
+            self.tree.blockSignals(signals_blocked)
+        elif kategori_item.childCount() > 0:
+            # Kategori daha önce açılmış - sadece eksik koleksiyon satırı oluşturulur
+            self.populate_kategori(kategori_adi)
+
+    def on_belge_degisti(self, anahtarlar, kaynak):
+        """Başka bir ekran belgeyi kaydettiğinde sadece değişen koleksiyonları yenile"""
+        if kaynak is self or self.json_data is None or self.price_loader is None:
+            return  # Kendi kaydımız veya ekran henüz yüklenmedi
+
+        onceki_eksikler = set(self.missing_skus)
+
+        if anahtarlar is None:
+            # Belge diskten yeniden okundu - bellekteki yeni belgeyle tümünü yeniden hesapla
+            self.json_data = self.belge.data
+            self.dirty_koleksiyonlar = set()
+            self.prepare_table_data()
+            self.populate_tree(self.current_filter)
+        else:
+            yeni = [key for key in anahtarlar if key not in self.koleksiyon_rows]
+            self.refresh_koleksiyonlar(anahtarlar)
+            for kategori_adi, koleksiyon_adi in yeni:
+                if (kategori_adi, koleksiyon_adi) in self.koleksiyon_rows:
+                    self.add_koleksiyon_item(kategori_adi, koleksiyon_adi)
+
+        if set(self.missing_skus) != onceki_eksikler:
+            self.save_missing_skus_to_hata()
+
+        self.status_label.setText("🔄 Diğer ekranlarda yapılan değişiklikler yansıtıldı")
+
+    def discard_pending_edits(self, kategori_adi, koleksiyon_adi):
+        """Koleksiyona ait kaydedilmemiş hücre düzenlemelerini at"""
+        for key in [k for k in self.pending_edits if k[1] == kategori_adi and k[2] == koleksiyon_adi]:
+            del self.pending_edits[key]
+
+    def refresh_koleksiyonlar(self, keys):
+        """Sadece değişen koleksiyonları yeniden hesapla ve tree'deki ilgili düğümleri güncelle
+
+        Fiyat indeksi (self.price_loader) yeniden indirilmez; bellekteki belge kullanılır.
+        """
+        for kategori_adi, koleksiyon_adi in keys:
+            koleksiyon_data = (self.json_data or {}).get(kategori_adi, {}).get(koleksiyon_adi)
+
+            if koleksiyon_data is None:
+                # Koleksiyon silinmiş
+                self.drop_koleksiyon_data(kategori_adi, koleksiyon_adi)
+                self.remove_koleksiyon_item(kategori_adi, koleksiyon_adi)
+                continue
+
+            self.prepare_koleksiyon_data(kategori_adi, koleksiyon_adi, koleksiyon_data)
+
+            key = (kategori_adi, koleksiyon_adi)
+            filtered_rows = self.filter_rows(self.koleksiyon_rows[key], self.current_filter)
+            visible = kategori_adi in self.visible_koleksiyonlar and koleksiyon_adi in self.visible_koleksiyonlar[kategori_adi]
+            if not visible:
+                # Filtre dışında kalan veya yeni eklenen koleksiyonlar bir sonraki tam doldurmada görünür
+                continue
+
+            if not filtered_rows:
+                self.remove_koleksiyon_item(kategori_adi, koleksiyon_adi)
+                continue
+
+            self.visible_koleksiyonlar[kategori_adi][koleksiyon_adi] = filtered_rows
+            self.koleksiyon_state[key].update(koleksiyon_flags(filtered_rows))
+
+            if key in self.koleksiyon_items:
+                self.update_koleksiyon_header(kategori_adi, koleksiyon_adi)
+            if key in self.populated_koleksiyonlar:
+                self.update_koleksiyon_item(kategori_adi, koleksiyon_adi, filtered_rows)
+
+        self.rebuild_table_data()
+
+    def mark_dirty(self, kategori_adi, koleksiyon_adi):
+        """Koleksiyonu kaydedilecek/yeniden hesaplanacak olarak işaretle"""
+        self.dirty_koleksiyonlar.add((kategori_adi, koleksiyon_adi))
+
+    def write_json(self, koleksiyonlar):
+        """Bellekte değişen koleksiyonları depoya tek işlem olarak yaz (dosya baştan yazılmaz)"""
+        self.belge.koleksiyonlari_kaydet(koleksiyonlar, kaynak=self)
+        self.json_data = self.belge.data
+
+    def commit_changes(self):
+        """Bekleyen değişiklikleri diske yaz ve sadece kirli koleksiyonları yeniden hesapla
+
+        Returns:
+            set: Kaydedilen (kategori, koleksiyon) anahtarları
+        """
+        dirty = self.dirty_koleksiyonlar
+        self.dirty_koleksiyonlar = set()
+
+        if not dirty:
+            return dirty
+
+        onceki_eksikler = set(self.missing_skus)
+
+        self.write_json(dirty)
+        self.refresh_koleksiyonlar(dirty)
+
+        # Eksik SKU listesi değiştiyse Hata sayfasını güncelle
+        if set(self.missing_skus) != onceki_eksikler:
+            self.save_missing_skus_to_hata()
+
+        return dirty
+
     def filter_table(self, text):
         """Arama filtresini uygula"""
+        self.current_filter = text
         self.populate_tree(text)
 
     def expand_partial(self):
         """Sadece kategorileri ve koleksiyonları genişlet, ürünleri değil"""
-        root = self.tree.invisibleRootItem()
+        self.start_population_job(self.iter_expand(koleksiyonlari_ac=False))
+
+    def expand_all(self):
+        """Tüm kategorileri, koleksiyonları ve ürünleri genişlet"""
+        self.start_population_job(self.iter_expand(koleksiyonlari_ac=True))
+
+    def iter_expand(self, koleksiyonlari_ac):
+        """Kategorileri (ve istenirse koleksiyonları) sırayla oluşturup genişlet, her adımda yield et"""
+        for kategori_adi in sorted(self.visible_koleksiyonlar.keys()):
+            kategori_item = self.kategori_items.get(kategori_adi)
+            if kategori_item is None:
+                continue
 
-        # Tüm kategorileri genişlet
-        for i in range(root.childCount()):
-            kategori_item = root.child(i)
+            for _ in self.iter_populate_kategori(kategori_adi):
+                yield
             kategori_item.setExpanded(True)
 
-            # Her kategorinin altındaki koleksiyonları genişlet
-            for j in range(kategori_item.childCount()):
-                koleksiyon_item = kategori_item.child(j)
-                koleksiyon_item.setExpanded(False)  # Koleksiyonların altındaki ürünler kapalı
+            for koleksiyon_adi in sorted(self.visible_koleksiyonlar.get(kategori_adi, {}).keys()):
+                koleksiyon_item = self.koleksiyon_items.get((kategori_adi, koleksiyon_adi))
+                if koleksiyon_item is None:
+                    continue
 
-    def expand_all(self):
-        """Tüm kategorileri, koleksiyonları ve ürünleri genişlet"""
-        self.tree.expandAll()
+                if koleksiyonlari_ac:
+                    self.populate_koleksiyon(kategori_adi, koleksiyon_adi)
+                    koleksiyon_item.setExpanded(True)
+                    for j in range(koleksiyon_item.childCount()):
+                        koleksiyon_item.child(j).setExpanded(True)  # Takımlar
+                    yield
+                else:
+                    koleksiyon_item.setExpanded(False)  # Koleksiyonların altındaki ürünler kapalı
+
+    def start_population_job(self, job):
+        """Parçalı doldurma işini başlat - UI donmasın diye her turda kısa bir süre çalışır"""
+        self.population_job = job
+        self.run_population_job(job)
+
+    def run_population_job(self, job):
+        """İşi ~30 ms'lik dilimlerle ilerlet, kalan kısmı olay döngüsüne bırak"""
+        if job is not self.population_job:
+            return  # Yeni bir doldurma/genişletme bu işi iptal etti
+
+        bitis = time.perf_counter() + 0.03
+        try:
+            while time.perf_counter() < bitis:
+                next(job)
+        except StopIteration:
+            self.population_job = None
+            return
+
+        QTimer.singleShot(0, lambda: self.run_population_job(job))
+
+    def on_tree_item_changed(self, item, column):
+        """Kullanıcının düzenlediği hücreyi kaydet - save sırasında sadece bu hücreler uygulanır"""
+        node = item.data(0, Qt.UserRole)
+        if not node or column not in (4, 5, 6):
+            return
+        if node['tur'] == 'takim' and column != 4:
+            # Takım başlığında sadece ad (kolon 4) düzenlenir - diğer hücreye yazılanı geri al
+            signals_blocked = self.tree.blockSignals(True)
+            item.setText(column, "")
+            self.tree.blockSignals(signals_blocked)
+            return
+
+        key = (node['tur'], node['kategori'], node['koleksiyon'],
+               node.get('takim_adi'), node.get('sku'), column)
+        self.pending_edits[key] = item.text(column)
+
+    def build_sku_index(self, koleksiyon_data):
+        """Koleksiyon için SKU → JSON nesnesi haritası oluştur
+
+        Returns:
+            dict: {'data': koleksiyon_data, 'urunler': {sku: urun}, 'takimlar': {takim_adi: {sku: product}}}
+        """
+        index = {'data': koleksiyon_data, 'urunler': {}, 'takimlar': {}}
+
+        for urun in koleksiyon_data.get('etiket_listesi', {}).get('urunler', []):
+            index['urunler'].setdefault(str(urun.get('sku', '')), urun)
+
+        for key, value in koleksiyon_data.items():
+            if key != 'etiket_listesi' and isinstance(value, dict) and 'products' in value:
+                takim_index = {}
+                for product in value.get('products', []):
+                    takim_index.setdefault(str(product.get('sku', '')), product)
+                index['takimlar'][key] = takim_index
+
+        return index
+
+    def get_sku_index(self, json_data, kategori_adi, koleksiyon_adi):
+        """Koleksiyonun SKU indeksini döndür; belge değiştiyse (diskten tazelendiyse) yeniden oluştur"""
+        koleksiyon_data = json_data.get(kategori_adi, {}).get(koleksiyon_adi)
+        if koleksiyon_data is None:
+            return None
+
+        index = self.sku_index.get((kategori_adi, koleksiyon_adi))
+        if index is None or index['data'] is not koleksiyon_data:
+            index = self.build_sku_index(koleksiyon_data)
+            self.sku_index[(kategori_adi, koleksiyon_adi)] = index
+        return index
 
     def update_takim_data_from_tree(self, json_data):
-        """Tree'deki takım güncellemelerini JSON'a uygula"""
+        """Tree'de düzenlenen hücreleri JSON'a uygula (Takım adı, Miktar, Malzeme Adı)
+
+        Sadece kullanıcının düzenlediği satırlar ziyaret edilir; her satır SKU indeksi
+        üzerinden O(1) ile JSON nesnesine eşlenir.
+        """
         try:
             # Değişen takım adlarını sakla
             degisen_takimlar = []
+            takim_adi_degisiklikleri = []
+
+            edits = self.pending_edits
+            self.pending_edits = {}
+
+            for (tur, kategori_adi, koleksiyon_adi, takim_adi, sku, column), text in edits.items():
+                index = self.get_sku_index(json_data, kategori_adi, koleksiyon_adi)
+                if index is None:
+                    continue
+
+                if tur == 'takim':
+                    # Takım adları en sonda değiştirilir (ürün eşlemesi orijinal adla yapılır)
+                    if column == 4:
+                        takim_adi_degisiklikleri.append((kategori_adi, koleksiyon_adi, takim_adi, text))
+                    continue
+
+                if tur == 'takim_urun':
+                    hedef = index['takimlar'].get(takim_adi, {}).get(sku)
+                else:
+                    hedef = index['urunler'].get(sku)
+
+                if hedef is None:
+                    continue
+
+                if column == 5 and tur == 'takim_urun':
+                    # Miktar güncelle
+                    try:
+                        yeni_miktar = int(text) if text else 1
+                    except ValueError:
+                        continue  # Geçersiz miktar, değiştirme
+
+                    if hedef.get('miktar', 1) != yeni_miktar:
+                        hedef['miktar'] = yeni_miktar
+                        self.mark_dirty(kategori_adi, koleksiyon_adi)
+
+                elif column == 6:
+                    # Malzeme adını güncelle (urun_adi_tam)
+                    yeni_ad = text.strip()
+                    if yeni_ad and hedef.get('urun_adi_tam', '') != yeni_ad:
+                        hedef['urun_adi_tam'] = yeni_ad
+                        self.mark_dirty(kategori_adi, koleksiyon_adi)
+
+            for kategori_adi, koleksiyon_adi, eski_takim_adi, text in takim_adi_degisiklikleri:
+                # Kullanıcı emoji önekini silmiş olabilir, varsa kaldır
+                yeni_takim_adi = text.replace("📁 ", "").strip()
+                koleksiyon_data = json_data[kategori_adi][koleksiyon_adi]
 
-            # Tree'yi tara
-            root = self.tree.invisibleRootItem()
-
-            for i in range(root.childCount()):
-                kategori_item = root.child(i)
-                # Kategori adını al (📂 prefix'ini kaldır)
-                kategori_text = kategori_item.text(0)
-                kategori_adi = kategori_text.replace("📂 ", "").strip()
-
-                for j in range(kategori_item.childCount()):
-                    koleksiyon_item = kategori_item.child(j)
-                    # Koleksiyon adını al (📁 prefix'ini kaldır)
-                    koleksiyon_text = koleksiyon_item.text(3)
-                    koleksiyon_adi = koleksiyon_text.replace("📁 ", "").strip()
-
-                    # JSON'da bu kategori ve koleksiyon var mı?
-                    if kategori_adi not in json_data or koleksiyon_adi not in json_data[kategori_adi]:
-                        continue
-
-                    # Koleksiyon altındaki item'leri tara
-                    for k in range(koleksiyon_item.childCount()):
-                        item = koleksiyon_item.child(k)
-
-                        # Takım mı kontrol et (kolon 4'te değer varsa)
-                        takim_text = item.text(4)
-                        # Emoji ile başlayıp başlamadığına bakmadan, kolon 4'te metin varsa takım olarak kabul et
-                        if takim_text and len(takim_text.strip()) > 0:
-                            # Bu bir takım item'i - tree'deki güncel ad
-                            # Emoji varsa kaldır, yoksa olduğu gibi kullan
-                            tree_takim_adi = takim_text.replace("📁 ", "").strip()
-
-                            # Item'dan orijinal takım adını al
-                            item_data = item.data(0, Qt.UserRole)
-
-                            if not item_data or 'orijinal_takim_adi' not in item_data:
-                                # Veri yoksa, tree'deki adı kullan
-                                eski_takim_adi = tree_takim_adi
-                            else:
-                                eski_takim_adi = item_data['orijinal_takim_adi']
-
-                            # JSON'da bu takım var mı kontrol et
-                            if (kategori_adi not in json_data or
-                                koleksiyon_adi not in json_data[kategori_adi] or
-                                eski_takim_adi not in json_data[kategori_adi][koleksiyon_adi]):
-                                continue
-
-                            # Takım adı değişti mi?
-                            if eski_takim_adi != tree_takim_adi:
-                                # Takım adını güncelle (key değiştir)
-                                takım_data = json_data[kategori_adi][koleksiyon_adi][eski_takim_adi]
-                                json_data[kategori_adi][koleksiyon_adi][tree_takim_adi] = takım_data
-                                del json_data[kategori_adi][koleksiyon_adi][eski_takim_adi]
-                                guncel_takim_adi = tree_takim_adi
-
-                                # Değişikliği kaydet
-                                degisen_takimlar.append({
-                                    'koleksiyon': koleksiyon_adi,
-                                    'eski_ad': eski_takim_adi,
-                                    'yeni_ad': tree_takim_adi
-                                })
-                            else:
-                                guncel_takim_adi = eski_takim_adi
-
-                            # Takım ürünlerini güncelle
-                            takim_data = json_data[kategori_adi][koleksiyon_adi][guncel_takim_adi]
-                            if 'products' in takim_data:
-                                products = takim_data['products']
-
-                                # Tree'deki takım ürünlerini al
-                                for m in range(item.childCount()):
-                                    urun_item = item.child(m)
-                                    sku_text = urun_item.text(12)  # SKU kolonu
-                                    miktar_text = urun_item.text(5)  # Miktar kolonu
-                                    malzeme_adi_text = urun_item.text(6)  # Malzeme Adı kolonu
-
-                                    if not sku_text:
-                                        continue
-
-                                    # Bu SKU'yu products içinde bul
-                                    for product in products:
-                                        if str(product.get('sku', '')) == sku_text:
-                                            # Miktar güncelle
-                                            try:
-                                                yeni_miktar = int(miktar_text) if miktar_text else 1
-                                                if product.get('miktar', 1) != yeni_miktar:
-                                                    product['miktar'] = yeni_miktar
-                                            except ValueError:
-                                                pass  # Geçersiz miktar, değiştirme
-
-                                            # Malzeme adını güncelle (urun_adi_tam)
-                                            if malzeme_adi_text:
-                                                if product.get('urun_adi_tam', '') != malzeme_adi_text.strip():
-                                                    product['urun_adi_tam'] = malzeme_adi_text.strip()
-                                            break
-
-                        else:
-                            # Bu bir etiket listesi ürünü (takım değil)
-                            # SKU ve Malzeme Adı var mı kontrol et
-                            sku_text = item.text(12)  # SKU kolonu
-                            malzeme_adi_text = item.text(6)  # Malzeme Adı kolonu
-
-                            if not sku_text or not malzeme_adi_text:
-                                continue
-
-                            # JSON'da etiket_listesi > urunler içinde bu SKU'yu bul ve güncelle
-                            koleksiyon_data = json_data[kategori_adi][koleksiyon_adi]
-                            if 'etiket_listesi' in koleksiyon_data and 'urunler' in koleksiyon_data['etiket_listesi']:
-                                urunler = koleksiyon_data['etiket_listesi']['urunler']
-                                for urun in urunler:
-                                    if str(urun.get('sku', '')) == sku_text:
-                                        # Malzeme adını güncelle (urun_adi_tam)
-                                        if urun.get('urun_adi_tam') != malzeme_adi_text.strip():
-                                            urun['urun_adi_tam'] = malzeme_adi_text.strip()
-                                        break
+                if not yeni_takim_adi or yeni_takim_adi == eski_takim_adi or eski_takim_adi not in koleksiyon_data:
+                    continue
+
+                # Takım adını güncelle (key değiştir)
+                koleksiyon_data[yeni_takim_adi] = koleksiyon_data.pop(eski_takim_adi)
+                self.mark_dirty(kategori_adi, koleksiyon_adi)
+
+                # Değişikliği kaydet
+                degisen_takimlar.append({
+                    'koleksiyon': koleksiyon_adi,
+                    'eski_ad': eski_takim_adi,
+                    'yeni_ad': yeni_takim_adi
+                })
 
             return degisen_takimlar
 
@@ -1155,10 +1394,7 @@ class JsonGosterWidget(QWidget):
         """İşaretlenmiş takımları JSON dosyasından sil"""
         try:
             # İşaretlenmiş takımları bul
-            selected_takimlar = []
-            for (kategori_adi, koleksiyon_adi, takim_adi), checkbox in self.takim_widgets.items():
-                if checkbox.isChecked():
-                    selected_takimlar.append((kategori_adi, koleksiyon_adi, takim_adi))
+            selected_takimlar = sorted(self.secili_takimlar)
 
             if not selected_takimlar:
                 QMessageBox.warning(self, "Uyarı", "Lütfen silmek istediğiniz takımları işaretleyin!")
@@ -1185,9 +1421,8 @@ class JsonGosterWidget(QWidget):
             self.status_label.setText("🗑 Takımlar siliniyor...")
             QApplication.processEvents()
 
-            # JSON dosyasını oku
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            # Bellekteki belge üzerinde çalış
+            json_data = self.json_data
 
             # Seçili takımları sil
             silinen_sayisi = 0
@@ -1198,18 +1433,15 @@ class JsonGosterWidget(QWidget):
 
                     # Takımı sil
                     del json_data[kategori_adi][koleksiyon_adi][takim_adi]
+                    self.mark_dirty(kategori_adi, koleksiyon_adi)
                     silinen_sayisi += 1
 
-            # JSON dosyasını kaydet
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
+            # JSON dosyasını kaydet ve sadece etkilenen koleksiyonları yenile
+            self.commit_changes()
 
             self.status_label.setText(f"✅ {silinen_sayisi} takım başarıyla silindi")
             QMessageBox.information(self, "Başarılı", f"{silinen_sayisi} takım başarıyla silindi!")
 
-            # Verileri yeniden yükle
-            self.load_data()
-
         except Exception as e:
             error_msg = f"Takım silme hatası: {str(e)}"
             self.status_label.setText(f"❌ {error_msg}")
@@ -1220,8 +1452,8 @@ class JsonGosterWidget(QWidget):
         try:
             # İşaretli OLMAYAN koleksiyonları bul
             unselected_koleksiyonlar = []
-            for (kategori_adi, koleksiyon_adi), widgets in self.koleksiyon_widgets.items():
-                if not widgets['sec'].isChecked():  # İşaretli değilse
+            for (kategori_adi, koleksiyon_adi), state in self.koleksiyon_state.items():
+                if not state['sec']:  # İşaretli değilse
                     unselected_koleksiyonlar.append((kategori_adi, koleksiyon_adi))
 
             if not unselected_koleksiyonlar:
@@ -1250,9 +1482,8 @@ class JsonGosterWidget(QWidget):
             self.status_label.setText("🗑 Koleksiyonlar siliniyor...")
             QApplication.processEvents()
 
-            # JSON dosyasını oku
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            # Bellekteki belge üzerinde çalış
+            json_data = self.json_data
 
             # Seçili olmayan koleksiyonları sil
             silinen_sayisi = 0
@@ -1262,22 +1493,19 @@ class JsonGosterWidget(QWidget):
 
                     # Koleksiyonu tamamen sil (etiket_listesi + tüm takımlar)
                     del json_data[kategori_adi][koleksiyon_adi]
+                    self.mark_dirty(kategori_adi, koleksiyon_adi)
                     silinen_sayisi += 1
 
                     # Eğer kategori boş kaldıysa kategoriyi de sil
                     if not json_data[kategori_adi]:
                         del json_data[kategori_adi]
 
-            # JSON dosyasını kaydet
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
+            # JSON dosyasını kaydet ve silinen koleksiyonları tree'den kaldır
+            self.commit_changes()
 
             self.status_label.setText(f"✅ {silinen_sayisi} koleksiyon başarıyla silindi")
             QMessageBox.information(self, "Başarılı", f"{silinen_sayisi} koleksiyon başarıyla silindi!")
 
-            # Verileri yeniden yükle
-            self.load_data()
-
         except Exception as e:
             error_msg = f"Koleksiyon silme hatası: {str(e)}"
             self.status_label.setText(f"❌ {error_msg}")
@@ -1302,19 +1530,24 @@ class JsonGosterWidget(QWidget):
             self.tree.clearFocus()
             QApplication.processEvents()
 
-            # JSON dosyasını oku
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            # Dosya başka bir modül tarafından değiştirildiyse bellekteki belgeyi tazele
+            # (fiyat indeksi yeniden indirilmez)
+            disk_degisti = self.belge.degisti_mi()
+            if disk_degisti:
+                self.json_data = self.belge.load(kaynak=self)
+
+            # Bellekteki belge üzerinde çalış
+            json_data = self.json_data
 
             # Şu anki tarih-saat
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             # Her kategori ve koleksiyon için
-            for (kategori_adi, koleksiyon_adi), widgets in self.koleksiyon_widgets.items():
-                # Checkbox durumlarını al
-                sec_checked = widgets['sec'].isChecked()
-                exc_checked = widgets['exc'].isChecked()
-                sube_checked = widgets['sube'].isChecked()
+            for (kategori_adi, koleksiyon_adi), state in self.koleksiyon_state.items():
+                # Checkbox durumlarını al (açılmamış koleksiyonlar için de geçerli)
+                sec_checked = state['sec']
+                exc_checked = state['exc']
+                sube_checked = state['sube']
 
                 # JSON'daki ilgili koleksiyona eriş
                 if kategori_adi not in json_data:
@@ -1327,124 +1560,46 @@ class JsonGosterWidget(QWidget):
                 # etiket_listesi > takim_sku altına secDeger, excDeger, subeDeger ekle/güncelle
                 if 'etiket_listesi' in koleksiyon_data and 'takim_sku' in koleksiyon_data['etiket_listesi']:
                     takim_sku = koleksiyon_data['etiket_listesi']['takim_sku']
-                    takim_sku['secDeger'] = "true" if sec_checked else "false"
-                    takim_sku['excDeger'] = "true" if exc_checked else "false"
-                    takim_sku['subeDeger'] = "true" if sube_checked else "false"
-
-                    # Fiyat güncellemelerini yap (sadece SEÇ işaretli olanlar için ve fiyat farkı varsa)
-                    if sec_checked and widgets['has_price_diff']:
-                        # etiket_listesi > urunler içindeki SKU'ları güncelle
-                        if 'urunler' in koleksiyon_data['etiket_listesi']:
-                            urunler = koleksiyon_data['etiket_listesi']['urunler']
-
-                            # Koleksiyon indirim oranını hesapla (SKU bulunamayan ürünler için tahmin yapmak üzere)
-                            koleksiyon_indirim = self.calculate_collection_discount(urunler, koleksiyon_adi)
-
-                            for urun in urunler:
-                                sku = str(urun.get('sku', ''))
-                                # Excel'den yeni fiyatları al
-                                price_info = self.price_loader.get_price(sku) if self.price_loader else None
-
-                                # ✅ 4 KATMANLI KORUMA (Sheets'te yok, geçersiz fiyat, tahmini fiyat, normal güncelleme)
-                                if price_info is None or (price_info['perakende'] <= 0 or price_info['liste'] <= 0):
-                                    # SKU bulunamadı VEYA fiyat geçersiz (0 TL) - koleksiyon indirimini kullanarak tahmin et
-                                    if koleksiyon_indirim is not None:
-                                        old_liste = urun.get('liste_fiyat', 0.0)
-                                        old_perakende = urun.get('perakende_fiyat', 0.0)
-
-                                        # Liste fiyatı 0 ise tahmin yapma (0 x indirim = 0)
-                                        if old_liste > 0:
-                                            # Tahmini perakende fiyat hesapla
-                                            tahmini_perakende = old_liste * (1 - koleksiyon_indirim)
-
-                                            # Fark kontrolü
-                                            if abs(tahmini_perakende - old_perakende) > 7:
-                                                # Liste fiyat aynı kalır, sadece perakende güncellenir
-                                                urun['perakende_fiyat'] = tahmini_perakende
-                                    continue  # Sonraki ürüne geç
-
-                                # Sadece mutlak değer farkı 7'den büyükse güncelle
-                                old_perakende = urun.get('perakende_fiyat', 0.0)
-                                new_perakende = price_info['perakende']
-                                if abs(new_perakende - old_perakende) > 7:
-                                    urun['liste_fiyat'] = price_info['liste']
-                                    urun['perakende_fiyat'] = price_info['perakende']
-
-                        # takim_sku fiyatlarını yeniden hesapla
-                        total_liste = 0.0
-                        total_perakende = 0.0
-                        if 'urunler' in koleksiyon_data['etiket_listesi']:
-                            for urun in koleksiyon_data['etiket_listesi']['urunler']:
-                                total_liste += urun.get('liste_fiyat', 0.0)
-                                total_perakende += urun.get('perakende_fiyat', 0.0)
-
-                        takim_sku['liste_fiyat'] = round(total_liste, 2)
-                        takim_sku['perakende_fiyat'] = round(total_perakende, 2)
-
-                        # indirim_yuzde hesapla
-                        if total_liste > 0:
-                            indirim_yuzde = round(((total_liste - total_perakende) / total_liste) * 100)
-                            takim_sku['indirim_yuzde'] = indirim_yuzde
-                        else:
-                            takim_sku['indirim_yuzde'] = 0
-
-                        # updated_at güncelle
-                        takim_sku['updated_at'] = current_time
-
-                # Özel takım adlarının fiyatlarını güncelle (SEÇ işaretli olanlar için ve fiyat farkı varsa)
-                if sec_checked and widgets['has_price_diff']:
-                    # etiket_listesi dışındaki tüm takımları bul ve fiyatlarını güncelle
-                    for key, value in koleksiyon_data.items():
-                        if key != 'etiket_listesi' and isinstance(value, dict) and 'products' in value:
-                            # Bu bir özel takım adı
-                            products = value.get('products', [])
-
-                            # Takım için toplam fiyatları hesapla
-                            total_liste = 0.0
-                            total_perakende = 0.0
-
-                            for product in products:
-                                product_sku = str(product.get('sku', ''))
-                                product_miktar = product.get('miktar', 1)
-
-                                # Excel'den yeni fiyatları al
-                                price_info = self.price_loader.get_price(product_sku) if self.price_loader else None
-
-                                # ✅ KORUMA: SKU bulunamadıysa veya fiyat geçersizse atla
-                                if price_info is None:
-                                    print(f"[WARNING] Takım ürünü SKU {product_sku} Google Sheets'te bulunamadı - atlandı")
-                                    continue
-
-                                if price_info['perakende'] <= 0 or price_info['liste'] <= 0:
-                                    print(f"[WARNING] Takım ürünü SKU {product_sku} için geçersiz fiyat - atlandı")
-                                    continue
-
-                                # Fiyatları miktar ile çarp ve topla
-                                total_liste += price_info['liste'] * product_miktar
-                                total_perakende += price_info['perakende'] * product_miktar
-
-                            # Toplam fiyatları güncelle
-                            value['total_liste_price'] = round(total_liste, 2)
-                            value['total_perakende_price'] = round(total_perakende, 2)
-
-                            # İndirim yüzdesini hesapla
-                            if total_liste > 0:
-                                indirim_yuzde = round(((total_liste - total_perakende) / total_liste) * 100)
-                                value['total_indirim_yuzde'] = indirim_yuzde
-                            else:
-                                value['total_indirim_yuzde'] = 0
+                    yeni_degerler = {
+                        'secDeger': "true" if sec_checked else "false",
+                        'excDeger': "true" if exc_checked else "false",
+                        'subeDeger': "true" if sube_checked else "false"
+                    }
+                    if any(takim_sku.get(k) != v for k, v in yeni_degerler.items()):
+                        takim_sku.update(yeni_degerler)
+                        self.mark_dirty(kategori_adi, koleksiyon_adi)
+
+                # Fiyat güncellemelerini yap (sadece SEÇ işaretli olanlar için ve fiyat farkı varsa)
+                # Ürün fiyatları, takim_sku toplamları ve özel takım toplamları (fiyatGuncelle.py)
+                if sec_checked and state['has_price_diff']:
+                    self.mark_dirty(kategori_adi, koleksiyon_adi)
+                    guncelle_koleksiyon_fiyatlari(koleksiyon_data, self.price_loader, current_time)
 
             # Takım güncellemelerini yap (Takım adı, Miktar, Malzeme Adı)
             degisen_takimlar = self.update_takim_data_from_tree(json_data)
 
-            # JSON dosyasını kaydet
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
+            if disk_degisti:
+                # Belge diskten tazelendi: tüm koleksiyonları mevcut fiyat indeksiyle yeniden hesapla
+                self.write_json(self.dirty_koleksiyonlar)
+                self.dirty_koleksiyonlar = set()
+                self.prepare_table_data()
+                self.populate_tree(self.current_filter)
+                kaydedilen = None
+            else:
+                # Sadece değişen koleksiyonları yaz ve yenile
+                kaydedilen = self.commit_changes()
+
+            if kaydedilen is not None and not kaydedilen:
+                self.status_label.setText("ℹ Kaydedilecek değişiklik yok")
+                QMessageBox.information(self, "Bilgi", "Kaydedilecek değişiklik yok.")
+                return
 
             self.status_label.setText(f"✅ Veriler başarıyla kaydedildi: {current_time}")
 
             # Başarı mesajı
             mesaj = "Veriler başarıyla kaydedildi!"
+            if kaydedilen:
+                mesaj += f"\n\n{len(kaydedilen)} koleksiyon güncellendi."
 
             # Değişen takımlar varsa göster
             if degisen_takimlar:
@@ -1456,9 +1611,6 @@ class JsonGosterWidget(QWidget):
 
             QMessageBox.information(self, "Başarılı", mesaj)
 
-            # Verileri yeniden yükle
-            self.load_data()
-
         except Exception as e:
             error_msg = f"Kaydetme hatası: {str(e)}"
             self.status_label.setText(f"❌ {error_msg}")
@@ -0,0 +1,156 @@
+"""
+QR Önbelleği - etiket QR kodları için bellek (LRU) + disk önbelleği
+
+Ürün URL'leri yazdırmalar arasında nadiren değişir; QR kodu her etiket için
+yeniden üretilip PNG'ye kodlanmak yerine bir kez üretilir ve saklanır.
+
+İki biçim saklanır:
+- png: raster çizim için PNG baytları (qr_cache/<sha1>.png)
+- matris: vektör çizim için modül satırları, "0"/"1" metni (qr_cache/<sha1>.txt)
+
+Anahtar: (url, box_size, border, error_correction) + biçim
+- Bellek: son kullanılan max_size kayıt (OrderedDict, LRU)
+- Disk: geçici dosya + os.replace ile atomik yazılır
+"""
+
+import os
+import hashlib
+import logging
+from io import BytesIO
+from collections import OrderedDict
+import qrcode
+
+
+# Disk önbelleği klasör adı (exe/script klasöründe)
+QR_ONBELLEK_KLASORU = "qr_cache"
+
+# Etiketlerde kullanılan QR ayarları
+QR_BOX_SIZE = 10
+QR_BORDER = 2
+QR_ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_M
+
+
+def qr_anahtari(url, box_size=QR_BOX_SIZE, border=QR_BORDER, error_correction=QR_ERROR_CORRECTION):
+    """Önbellek anahtarı ve disk dosya adı için sha1 özeti"""
+    anahtar = (url, box_size, border, error_correction)
+    return anahtar, hashlib.sha1(repr(anahtar).encode('utf-8')).hexdigest()
+
+
+def qr_olustur(url, box_size=QR_BOX_SIZE, border=QR_BORDER, error_correction=QR_ERROR_CORRECTION):
+    """URL için QRCode nesnesi (matris hesaplanmış)"""
+    qr = qrcode.QRCode(version=1, box_size=box_size, border=border, error_correction=error_correction)
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr
+
+
+def qr_png_uret(url, box_size=QR_BOX_SIZE, border=QR_BORDER, error_correction=QR_ERROR_CORRECTION):
+    """QR kodunu üret ve PNG baytları olarak döndür"""
+    qr = qr_olustur(url, box_size, border, error_correction)
+    img = qr.make_image(fill_color="black", back_color="white")
+    buff = BytesIO()
+    img.save(buff, format="PNG")
+    return buff.getvalue()
+
+
+def qr_matris_uret(url, box_size=QR_BOX_SIZE, border=QR_BORDER, error_correction=QR_ERROR_CORRECTION):
+    """QR modül matrisini (kenar boşluğu dahil) "0"/"1" satırları olarak döndür"""
+    qr = qr_olustur(url, box_size, border, error_correction)
+    return tuple("".join("1" if modul else "0" for modul in satir) for satir in qr.get_matrix())
+
+
+# Biçim: (üretici, dosya uzantısı, baytlara çevir, baytlardan oku)
+QR_BICIMLERI = {
+    "png": (qr_png_uret, ".png", lambda png: png, lambda veri: veri),
+    "matris": (qr_matris_uret, ".txt",
+               lambda matris: "\n".join(matris).encode('ascii'),
+               lambda veri: tuple(veri.decode('ascii').split())),
+}
+
+
+class QrOnbellegi:
+    """QR kodları (PNG ve matris) için LRU + disk önbelleği
+
+    Args:
+        klasor: Disk önbelleği klasörü (None = sadece bellek)
+        max_size: Bellekte tutulacak en fazla QR sayısı
+    """
+
+    def __init__(self, klasor=None, max_size=512):
+        self.klasor = klasor
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.istatistik_sifirla()
+
+    def istatistik_sifirla(self):
+        self.istatistik = {"bellek": 0, "disk": 0, "uretilen": 0}
+
+    def _disk_yolu(self, ozet, uzanti):
+        return os.path.join(self.klasor, ozet + uzanti)
+
+    def _bellege_ekle(self, anahtar, deger):
+        self.entries[anahtar] = deger
+        self.entries.move_to_end(anahtar)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)  # En eski kaydı at
+
+    def _diske_yaz(self, yol, veri):
+        try:
+            os.makedirs(self.klasor, exist_ok=True)
+            gecici = f"{yol}.{os.getpid()}.tmp"
+            with open(gecici, 'wb') as f:
+                f.write(veri)
+            os.replace(gecici, yol)
+        except OSError as e:
+            # Disk önbelleği isteğe bağlı - yazılamazsa sadece bellekte kalır
+            logging.warning(f"QR önbelleğe yazılamadı ({self.klasor}): {e}")
+
+    def _getir(self, bicim, url, box_size, border, error_correction):
+        """Önce bellek, sonra disk; yoksa üret ve ikisine de kaydet"""
+        uret, uzanti, kodla, coz = QR_BICIMLERI[bicim]
+        anahtar, ozet = qr_anahtari(url, box_size, border, error_correction)
+        anahtar = (bicim,) + anahtar
+
+        deger = self.entries.get(anahtar)
+        if deger is not None:
+            self.entries.move_to_end(anahtar)  # En son kullanılan
+            self.istatistik["bellek"] += 1
+            return deger
+
+        yol = self._disk_yolu(ozet, uzanti) if self.klasor else None
+        if yol:
+            try:
+                with open(yol, 'rb') as f:
+                    veri = f.read()
+            except OSError:
+                veri = None
+            if veri:
+                deger = coz(veri)
+                self._bellege_ekle(anahtar, deger)
+                self.istatistik["disk"] += 1
+                return deger
+
+        deger = uret(url, box_size, border, error_correction)
+        self._bellege_ekle(anahtar, deger)
+        if yol:
+            self._diske_yaz(yol, kodla(deger))
+        self.istatistik["uretilen"] += 1
+        return deger
+
+    def png(self, url, box_size=QR_BOX_SIZE, border=QR_BORDER, error_correction=QR_ERROR_CORRECTION):
+        """URL'nin QR PNG baytlarını döndür (raster çizim)"""
+        return self._getir("png", url, box_size, border, error_correction)
+
+    def matris(self, url, box_size=QR_BOX_SIZE, border=QR_BORDER, error_correction=QR_ERROR_CORRECTION):
+        """URL'nin QR modül matrisini döndür (vektör çizim)"""
+        return self._getir("matris", url, box_size, border, error_correction)
+
+    def ozet(self):
+        """İstatistik özeti (log için)"""
+        bellek, disk, uretilen = (self.istatistik[k] for k in ("bellek", "disk", "uretilen"))
+        toplam = bellek + disk + uretilen
+        if toplam == 0:
+            return "QR önbelleği: istek yok"
+        oran = (bellek + disk) / toplam * 100
+        return (f"QR önbelleği: {toplam} istek, isabet %{oran:.0f} "
+                f"(bellek {bellek}, disk {disk}, yeni {uretilen})")
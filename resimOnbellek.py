@@ -0,0 +1,154 @@
+"""
+Resim Önbelleği - etiket başlık/logo resimleri için kalıcı disk önbelleği
+
+ETIKET_BASLIK_URL ve YERLI_URETIM_URL her açılışta Google Drive'dan yeniden
+indirilmez; indirilen dosya resim_cache/<sha1>.bin olarak, ETag/Last-Modified
+bilgisi resim_cache/<sha1>.json olarak saklanır.
+
+- Kayıt RESIM_MAX_YAS saniyeden yeniyse ağa hiç çıkılmaz
+- Eskiyse koşullu istek (If-None-Match / If-Modified-Since) gönderilir;
+  304 gelirse diskteki kopya kullanılmaya devam eder
+- Ağ yoksa (bağlantı hatası / zaman aşımı) diskteki kopya hemen kullanılır ve
+  süreç boyunca RESIM_CEVRIMDISI_BEKLEME saniye ağ tekrar denenmez
+- Disk yazımı geçici dosya + os.replace ile atomiktir
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import requests
+
+
+# Disk önbelleği klasör adı (exe/script klasöründe)
+RESIM_ONBELLEK_KLASORU = "resim_cache"
+
+# Bu süreden yeni kayıtlar ağa sorulmadan kullanılır (saniye)
+RESIM_MAX_YAS = 24 * 60 * 60
+
+# Bağlantı kurulamazsa ağın tekrar denenmeyeceği süre (saniye)
+RESIM_CEVRIMDISI_BEKLEME = 5 * 60
+
+# (bağlantı, okuma) zaman aşımı - önbellekte kopya varsa bağlantı için kısa beklenir
+ZAMAN_ASIMI = (10, 10)
+ONBELLEKLI_ZAMAN_ASIMI = (3, 10)
+
+# Son bağlantı hatasının zamanı (süreç başına)
+_cevrimdisi_zamani = None
+
+
+def resim_ozeti(url):
+    """Disk dosya adı için sha1 özeti"""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def cevrimdisi_mi():
+    """Yakın zamanda bağlantı kurulamadıysa True (ağ tekrar denenmez)"""
+    return _cevrimdisi_zamani is not None and time.time() - _cevrimdisi_zamani < RESIM_CEVRIMDISI_BEKLEME
+
+
+class ResimOnbellegi:
+    """URL'den indirilen resimler için ETag/Last-Modified doğrulamalı disk önbelleği
+
+    Args:
+        klasor: Disk önbelleği klasörü
+        max_yas: Kaydın ağa sorulmadan kullanılacağı süre (saniye)
+    """
+
+    def __init__(self, klasor, max_yas=RESIM_MAX_YAS):
+        self.klasor = klasor
+        self.max_yas = max_yas
+
+    def _yollar(self, url):
+        ozet = resim_ozeti(url)
+        return os.path.join(self.klasor, ozet + ".bin"), os.path.join(self.klasor, ozet + ".json")
+
+    def _oku(self, url):
+        """Diskteki kayıt: (bayt, bilgi) veya (None, None)"""
+        veri_yolu, bilgi_yolu = self._yollar(url)
+        try:
+            with open(bilgi_yolu, 'r', encoding='utf-8') as f:
+                bilgi = json.load(f)
+            with open(veri_yolu, 'rb') as f:
+                veri = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if bilgi.get("url") != url or not veri:
+            return None, None
+        return veri, bilgi
+
+    def _yaz_atomik(self, yol, veri):
+        gecici = f"{yol}.{os.getpid()}.tmp"
+        with open(gecici, 'wb') as f:
+            f.write(veri)
+        os.replace(gecici, yol)
+
+    def _kaydet(self, url, veri, bilgi):
+        try:
+            os.makedirs(self.klasor, exist_ok=True)
+            veri_yolu, bilgi_yolu = self._yollar(url)
+            if veri is not None:
+                self._yaz_atomik(veri_yolu, veri)
+            self._yaz_atomik(bilgi_yolu, json.dumps(bilgi, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            # Disk önbelleği isteğe bağlı - yazılamazsa sadece bu çalıştırmada kullanılır
+            logging.warning(f"Resim önbelleğe yazılamadı ({self.klasor}): {e}")
+
+    def getir(self, url, indirme_url=None):
+        """Resmin ham baytlarını döndür (önbellek, gerekirse koşullu indirme)
+
+        Args:
+            url: Önbellek anahtarı olan URL (config'teki paylaşım linki)
+            indirme_url: İsteğin gönderileceği URL (None = url)
+
+        Returns:
+            bayt veya None (ağ yok ve önbellekte kopya yok / sunucu hata döndü)
+        """
+        global _cevrimdisi_zamani
+        veri, bilgi = self._oku(url)
+
+        # Taze kayıt - ağa çıkılmaz
+        if veri is not None and time.time() - bilgi.get("zaman", 0) < self.max_yas:
+            return veri
+
+        # Ağ yakın zamanda erişilemedi - varsa diskteki kopya hemen kullanılır
+        if cevrimdisi_mi():
+            return veri
+
+        basliklar = {}
+        if veri is not None:
+            if bilgi.get("etag"):
+                basliklar["If-None-Match"] = bilgi["etag"]
+            if bilgi.get("last_modified"):
+                basliklar["If-Modified-Since"] = bilgi["last_modified"]
+
+        try:
+            response = requests.get(indirme_url or url, headers=basliklar,
+                                    timeout=ONBELLEKLI_ZAMAN_ASIMI if veri is not None else ZAMAN_ASIMI)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            _cevrimdisi_zamani = time.time()
+            logging.warning(f"Resim indirilemedi, ağ yok ({url}): {e}")
+            return veri
+        except requests.RequestException as e:
+            logging.warning(f"Resim indirilemedi ({url}): {e}")
+            return veri
+        _cevrimdisi_zamani = None
+
+        if response.status_code == 304 and veri is not None:
+            # Değişmemiş - sadece doğrulama zamanını güncelle
+            bilgi["zaman"] = time.time()
+            self._kaydet(url, None, bilgi)
+            return veri
+
+        if response.status_code == 200 and response.content:
+            self._kaydet(url, response.content, {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "zaman": time.time(),
+            })
+            return response.content
+
+        logging.warning(f"Resim indirilemedi ({url}): HTTP {response.status_code}")
+        return veri
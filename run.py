@@ -14,8 +14,9 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
 from PyQt5.QtGui import QFont, QIcon
 
 # Modülleri import et
-from jsonGoster import JsonGosterWidget
+from jsonGoster import JsonGosterWidget, setup_data_file
 from etiketYazdir import EtiketYazdirWidget
+from etiketBelgesi import EtiketBelgesi
 
 
 def get_resource_path(filename):
@@ -388,9 +389,10 @@ class DogtasComWidget(QWidget):
 class EtiketEkleWidget(QWidget):
     """Etiket Ekle modülü için widget wrapper"""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, belge=None):
         super().__init__(parent)
         self.window = None  # Window referansını sakla
+        self.belge = belge  # Paylaşılan etiketEkle.json belgesi
         self.setup_ui()
 
     def setup_ui(self):
@@ -403,7 +405,7 @@ class EtiketEkleWidget(QWidget):
             from etiketEkle import EtiketListesiWindow
 
             # Window'u oluştur ve REFERANSTA TUT (garbage collection engellemek için)
-            self.window = EtiketListesiWindow()
+            self.window = EtiketListesiWindow(belge=self.belge)
 
             # Ayrı pencereyi gizle (sadece central widget'ı embed edeceğiz)
             self.window.hide()
@@ -441,6 +443,9 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Etiket Programı")
         self.setGeometry(50, 50, 1400, 900)
 
+        # Tüm modüllerin paylaştığı etiketEkle.json belgesi (bir kez okunur, değişiklikler sinyalle yayılır)
+        self.belge = EtiketBelgesi(setup_data_file("etiketEkle.json"), self)
+
         # UI setup
         self.setup_ui()
 
@@ -525,13 +530,13 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(DogtasComWidget())
 
         # 2. Etiket Ekle
-        self.stacked_widget.addWidget(EtiketEkleWidget())
+        self.stacked_widget.addWidget(EtiketEkleWidget(belge=self.belge))
 
         # 3. Json Göster
-        self.stacked_widget.addWidget(JsonGosterWidget())
+        self.stacked_widget.addWidget(JsonGosterWidget(belge=self.belge))
 
         # 4. Yazdır
-        self.stacked_widget.addWidget(EtiketYazdirWidget())
+        self.stacked_widget.addWidget(EtiketYazdirWidget(belge=self.belge))
 
         main_layout.addWidget(self.stacked_widget)
 
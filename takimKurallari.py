@@ -0,0 +1,577 @@
+"""
+Takım Kuralları - Etiket Ekle takım preset'leri için derlenmiş regex kural motoru
+
+Kural tabloları (kategori → takım adı → aranacak_urunler / adet / exclude_patterns)
+bir kez derlenir. Her ürün adı tüm desenlere karşı tek geçişte sınıflandırılır ve
+sonuç katalog sürümü boyunca satır bazında saklanır; preset seçimi bu eşleşmelerin
+mevcut koleksiyon satırları üzerinde aranmasına indirgenir.
+
+toplu_takim_onerileri bir preset'i kategorideki tüm koleksiyonlara uygular;
+sonuç toplu_takim_farki ile incelenir, toplu_takim_islemleri ile depoya tek işlemde
+yazılır.
+
+Kurallar exe'nin yanındaki takim_kurallari.json dosyasından okunur (yoksa
+varsayılanlarla oluşturulur). Dosya doğrulanır, derlenir ve değiştirilme zamanı
+değiştiğinde yeniden yüklenir; kural güncellemek için exe'yi yeniden derlemeye
+gerek yoktur. Ürün adı → eşleşen desenler sonuçları takim_kurallari.cache.json
+dosyasında kural özetiyle birlikte saklanır ve sonraki açılışlarda kullanılır.
+
+Kural dosyası biçimi:
+    {
+        "surum": 1,
+        "kategoriler": {
+            "Yatak Odası": {
+                "6 Kapaklı, Karyola": {
+                    "aranacak_urunler": ["(?i)^(?=.*ayna)(?=.*konsol).*$", ...],
+                    "adet": {"(?i)kom[oi]din": 2},
+                    "exclude_patterns": {"<aranacak desen>": ["<hariç desen>", ...]}
+                }
+            }
+        }
+    }
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+
+
+# Desteklenen kural dosyası biçim sürümü
+KURAL_DOSYASI_SURUMU = 1
+KURAL_DOSYASI = "takim_kurallari.json"
+KURAL_ONBELLEK_DOSYASI = "takim_kurallari.cache.json"
+
+
+# Yatak Odası takım kombinasyonları tanımlamaları (Regex pattern'ler)
+YATAK_ODASI_KOMBINASYONLARI = {
+    "6 Kapaklı, Karyola": {
+        "aranacak_urunler": [
+            r"(?i)\b6\s*kapak(lı)?\b",
+            r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
+            r"(?i)^(?!.*180)(?!.*Baza)(?!.*Başlıklı).*Karyola.*160.*$",
+            r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
+            r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
+            r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
+
+        ],
+        "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
+    },
+    "6 Kapaklı, Baza": {
+        "aranacak_urunler": [
+            r"(?i)\b6\s*kapak(lı)?\b",
+            r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
+            r"(?i)^(?!.*başlıklı)(?=.*baza)(?=.*160).*$",
+            r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
+            r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
+            r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
+        ],
+        "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
+    },
+    "5 Kapaklı, Karyola": {
+        "aranacak_urunler": [
+            r"(?i)\b5\s*kapak(lı)?\b",
+            r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
+            r"(?i)^(?!.*180)(?!.*Baza)(?!.*Başlıklı).*Karyola.*160.*$",
+            r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
+            r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
+            r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
+        ],
+        "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
+    },
+    "5 Kapaklı, Baza": {
+        "aranacak_urunler": [
+            r"(?i)\b5\s*kapak(lı)?\b",
+            r'(?i)(?=.*ba(ş|s)l(ı|i)k)(?=.*160)',
+            r"(?i)^(?!.*başlıklı)(?=.*baza)(?=.*160).*$",
+            r"(?i)^(?!.*ayna)(?!.*ikili)(?!.*dar)(?!.*yüksek)(?=.*şifonyer).*$",
+            r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
+            r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?"
+        ],
+
+        "adet": {r"(?i)(?=.*kom[oi]din)(?=.*(çift|çekmece))?": 2}
+    }
+}
+
+# Yemek Odası takım kombinasyonları tanımlamaları (Regex pattern'ler)
+YEMEK_ODASI_KOMBINASYONLARI = {
+    "Konsol, Açılır, Sandalye*6": {
+        "aranacak_urunler": [
+            r"(?i)^(?!.*ayna)(?!.*mini)(?=.*konsol).*$",
+            r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
+            r"(?i)^(?!.*sabit)(?=.*yemek)(?=.*açılır).*$",
+            r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
+        ],
+        "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
+    },
+    "Konsol, Sabit, Sandalye*6": {
+        "aranacak_urunler": [
+            r"(?i)^(?!.*ayna)(?!.*mini)(?=.*konsol).*$",
+            r"(?i)^(?=.*ayna)(?=.*(konsol|şifonyer)).*$",
+            r"(?i)^(?!.*açılır)(?=.*yemek)(?=.*sabit).*$",
+            r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
+        ],
+        "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
+    },
+    "Açılır, Sandalye*6": {
+        "aranacak_urunler": [
+            r"(?i)^(?!.*sabit)(?=.*yemek)(?=.*açılır).*$",
+            r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
+        ],
+        "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
+    },
+    "Sabit, Sandalye*6": {
+        "aranacak_urunler": [
+            r"(?i)^(?!.*açılır)(?=.*yemek)(?=.*sabit).*$",
+            r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$"
+        ],
+        "adet": {r"(?i)^(?!.*kol)(?=.*(sandalye|sand\.)).*$": 6}
+    }
+}
+
+# Oturma Grubu takım kombinasyonları tanımlamaları (Regex pattern'ler)
+OTURMA_GRUBU_KOMBINASYONLARI = {
+    "Üçlü*2, Berjer*2": {
+        "aranacak_urunler": [
+            r"(?i)^(?=.*(berjer|tekli)).*$",
+            r"(?i)^(?=.*(üçlü)).*$"
+        ],
+        "adet": {
+            r"(?i)^(?=.*(berjer|tekli)).*$": 2,
+            r"(?i)^(?=.*(üçlü)).*$": 2
+        }
+    },
+    # Sadece ad olarak tanımlı (otomatik seçim yok - kural dosyasından desen eklenebilir)
+    "Üçlü, İkili, Berjer": {"aranacak_urunler": []},
+    "İkili Modül-Kollu*2, Köşe Modülü": {"aranacak_urunler": []}
+}
+
+# Genç Odası takım kombinasyonları tanımlamaları (Regex pattern'ler)
+GENC_ODASI_KOMBINASYONLARI = {
+    "3 Kapaklı, 100 Karyola, Çalışma Masası": {
+        "aranacak_urunler": [
+            r"(?i).*(3\s*kapa|3\s*kapı).*dolap.*",
+            r"(?i)^(?=.*(ba(ş|s)l(ı|i)k|100))(?!.*başlıksız)(?!.*karyola).*",
+            r"(?i)^(?=.*karyola)(?=.*100)(?!.*baza)(?=.*(başlıksız|kasa))?.*",
+            r"(?i)^(?=.*(çalışma|calısma))(?=.*masa)(?!.*üst)(?!.*modül)(?!.*eko)(?!.*kompakt).*"
+        ]
+    },
+    "3 Kapaklı, 100 Baza, Çalışma Masası": {
+        "aranacak_urunler": [
+            r"(?i).*(3\s*kapa|3\s*kapı).*dolap.*",
+            r"(?i)^(?=.*(başlık|100))(?!.*başlıksız)(?!.*karyola).*",
+            r"(?i)^(?=.*baza)(?=.*100).*",
+            r"(?i)^(?=.*(çalışma|calısma))(?=.*masa)(?!.*üst)(?!.*modül)(?!.*eko)(?!.*kompakt).*"
+        ]
+    }
+}
+
+
+# Kategori → takım kombinasyonları
+VARSAYILAN_KURALLAR = {
+    "Yatak Odası": YATAK_ODASI_KOMBINASYONLARI,
+    "Yemek Odası": YEMEK_ODASI_KOMBINASYONLARI,
+    "Oturma Grubu": OTURMA_GRUBU_KOMBINASYONLARI,
+    "Doğtaş Genç ve Çocuk Odası": GENC_ODASI_KOMBINASYONLARI,
+}
+
+
+def kurallari_dogrula(veri):
+    """Kural dosyası içeriğini doğrula ve {kategori: {takım: kombinasyon}} döndür
+
+    Hatalı yapı veya derlenemeyen regex için ValueError fırlatır.
+    """
+    if not isinstance(veri, dict):
+        raise ValueError("Kural dosyası bir JSON nesnesi olmalı")
+
+    surum = veri.get("surum")
+    if surum != KURAL_DOSYASI_SURUMU:
+        raise ValueError(f"Desteklenmeyen kural dosyası sürümü: {surum} (beklenen: {KURAL_DOSYASI_SURUMU})")
+
+    kategoriler = veri.get("kategoriler")
+    if not isinstance(kategoriler, dict):
+        raise ValueError("'kategoriler' alanı eksik veya hatalı")
+
+    def desen_kontrol(desen, yer):
+        if not isinstance(desen, str):
+            raise ValueError(f"{yer}: desen metin olmalı")
+        try:
+            re.compile(desen, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"{yer}: geçersiz regex '{desen}' ({e})")
+
+    for kategori, kombinasyonlar in kategoriler.items():
+        if not isinstance(kombinasyonlar, dict):
+            raise ValueError(f"{kategori}: takım tanımları nesne olmalı")
+        for takim_adi, kombinasyon in kombinasyonlar.items():
+            yer = f"{kategori} / {takim_adi}"
+            if not isinstance(kombinasyon, dict):
+                raise ValueError(f"{yer}: takım tanımı nesne olmalı")
+
+            aranacak = kombinasyon.get("aranacak_urunler", [])
+            if not isinstance(aranacak, list):
+                raise ValueError(f"{yer}: 'aranacak_urunler' liste olmalı")
+            for desen in aranacak:
+                desen_kontrol(desen, yer)
+
+            adet = kombinasyon.get("adet", {})
+            if not isinstance(adet, dict):
+                raise ValueError(f"{yer}: 'adet' nesne olmalı")
+            for desen, deger in adet.items():
+                desen_kontrol(desen, yer)
+                if not isinstance(deger, int) or isinstance(deger, bool) or deger < 1:
+                    raise ValueError(f"{yer}: '{desen}' için adet pozitif tam sayı olmalı")
+
+            exclude = kombinasyon.get("exclude_patterns", {})
+            if not isinstance(exclude, dict):
+                raise ValueError(f"{yer}: 'exclude_patterns' nesne olmalı")
+            for desen, haric_desenler in exclude.items():
+                desen_kontrol(desen, yer)
+                if not isinstance(haric_desenler, list):
+                    raise ValueError(f"{yer}: '{desen}' için hariç desenler liste olmalı")
+                for haric in haric_desenler:
+                    desen_kontrol(haric, yer)
+
+    return kategoriler
+
+
+def kural_dosyasi_yaz(dosya_yolu, kurallar):
+    """Kuralları sürüm bilgisiyle JSON olarak yaz (geçici dosya + os.replace)"""
+    gecici = dosya_yolu + ".tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        json.dump({"surum": KURAL_DOSYASI_SURUMU, "kategoriler": kurallar}, f, ensure_ascii=False, indent=2)
+    os.replace(gecici, dosya_yolu)
+
+
+class DerlenmisTakim:
+    """Tek bir takım preset'inin derlenmiş hali (desenler motorun ortak desen numaralarıdır)"""
+
+    def __init__(self, aranacak, exclude, adet):
+        self.aranacak = aranacak  # [desen no] - sırası korunur
+        self.exclude = exclude    # {aranacak desen no: [exclude desen no]}
+        self.adet = adet          # [(desen no, adet)] - ilk eşleşen kullanılır
+
+
+class TakimKuralMotoru:
+    """Kural tablolarını bir kez derleyen ve katalog satırlarını sınıflandıran motor
+
+    Aynı desen birden fazla takımda geçse de (ör. komodin deseni) bir kez derlenir
+    ve her ürün adı için bir kez denenir. Satır eşleşmeleri katalog sürümü
+    değişene kadar saklanır.
+    """
+
+    def __init__(self, kurallar=None, name_key='urun_adi_tam', dosya_yolu=None, onbellek_yolu=None):
+        self.name_key = name_key
+        self.desenler = []   # Derlenmiş desenler (desen no = liste indeksi)
+        self.desen_no = {}   # {desen metni: desen no}
+        self.takimlar = {}   # {kategori: {takım adı: DerlenmisTakim}}
+        self.kural_ozeti = None  # Kuralların özeti (açılışlar arası önbellek anahtarı)
+        self.rows = []
+        self.katalog_surumu = None
+        self.satir_eslesmeleri = {}  # {satır indeksi: frozenset(desen no)}
+        self.ad_eslesmeleri = {}     # {ürün adı: frozenset(desen no)} - diskte saklanır
+        self.onbellek_degisti = False
+
+        # Kural dosyası (hot-reload) ve açılışlar arası eşleşme önbelleği
+        self.dosya_yolu = dosya_yolu
+        self.onbellek_yolu = onbellek_yolu
+        self.dosya_mtime = None
+
+        self.derle(VARSAYILAN_KURALLAR if kurallar is None else kurallar)
+        self.onbellek_yukle()
+        if self.dosya_yolu:
+            if not os.path.exists(self.dosya_yolu):
+                self.varsayilanlari_yaz()
+            self.yenile_gerekirse()
+
+    def varsayilanlari_yaz(self):
+        """Kural dosyası yoksa varsayılan kurallarla oluştur (düzenlenebilmesi için)"""
+        try:
+            kural_dosyasi_yaz(self.dosya_yolu, VARSAYILAN_KURALLAR)
+            logging.info(f"Takım kural dosyası oluşturuldu: {self.dosya_yolu}")
+        except Exception as e:
+            logging.error(f"Takım kural dosyası oluşturulamadı: {str(e)}")
+
+    def yenile_gerekirse(self):
+        """Kural dosyası değiştiyse yeniden yükle
+
+        Returns:
+            (yenilendi, hata_mesaji) - hata durumunda mevcut kurallar korunur
+        """
+        if not self.dosya_yolu:
+            return False, None
+        try:
+            mtime = os.path.getmtime(self.dosya_yolu)
+        except OSError:
+            return False, None  # Dosya yok - mevcut kurallarla devam
+        if mtime == self.dosya_mtime:
+            return False, None
+
+        self.dosya_mtime = mtime
+        try:
+            with open(self.dosya_yolu, 'r', encoding='utf-8') as f:
+                kurallar = kurallari_dogrula(json.load(f))
+        except Exception as e:
+            hata = f"Takım kural dosyası okunamadı, önceki kurallar kullanılıyor: {str(e)}"
+            logging.error(hata)
+            return False, hata
+
+        self.derle(kurallar)
+        self.onbellek_yukle()
+        logging.info(f"Takım kuralları yüklendi: {self.dosya_yolu}")
+        return True, None
+
+    def onbellek_yukle(self):
+        """Önceki açılışlardan kalan ürün adı eşleşmelerini yükle (kural özeti aynıysa)"""
+        if not self.onbellek_yolu or not os.path.exists(self.onbellek_yolu):
+            return
+        try:
+            with open(self.onbellek_yolu, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            if veri.get("kural_ozeti") != self.kural_ozeti:
+                return  # Kurallar değişmiş - önbellek geçersiz
+            self.ad_eslesmeleri = {ad: frozenset(nolar) for ad, nolar in veri.get("eslesmeler", {}).items()}
+        except Exception as e:
+            logging.warning(f"Takım kuralı önbelleği okunamadı: {str(e)}")
+
+    def onbellek_kaydet(self):
+        """Yeni sınıflandırılan ürün adları varsa önbelleği diske yaz"""
+        if not self.onbellek_yolu or not self.onbellek_degisti:
+            return
+        try:
+            gecici = self.onbellek_yolu + ".tmp"
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "kural_ozeti": self.kural_ozeti,
+                    "eslesmeler": {ad: sorted(nolar) for ad, nolar in self.ad_eslesmeleri.items()}
+                }, f, ensure_ascii=False)
+            os.replace(gecici, self.onbellek_yolu)
+            self.onbellek_degisti = False
+        except Exception as e:
+            logging.warning(f"Takım kuralı önbelleği kaydedilemedi: {str(e)}")
+
+    def _desen_ekle(self, desen):
+        no = self.desen_no.get(desen)
+        if no is None:
+            no = len(self.desenler)
+            self.desenler.append(re.compile(desen, re.IGNORECASE))
+            self.desen_no[desen] = no
+        return no
+
+    def derle(self, kurallar):
+        """Kural tablolarını derle (geçersiz regex re.error fırlatır)"""
+        self.desenler = []
+        self.desen_no = {}
+        self.takimlar = {}
+        for kategori, kombinasyonlar in kurallar.items():
+            derlenmis = {}
+            for takim_adi, kombinasyon in kombinasyonlar.items():
+                aranacak = [self._desen_ekle(p) for p in kombinasyon.get("aranacak_urunler", [])]
+                exclude = {
+                    self._desen_ekle(p): [self._desen_ekle(e) for e in excludes]
+                    for p, excludes in kombinasyon.get("exclude_patterns", {}).items()
+                }
+                adet = [(self._desen_ekle(p), deger) for p, deger in kombinasyon.get("adet", {}).items()]
+                derlenmis[takim_adi] = DerlenmisTakim(aranacak, exclude, adet)
+            self.takimlar[kategori] = derlenmis
+
+        # Desen numaraları değişti - eski eşleşmeler geçersiz
+        # Özet, numaralandırma sırasındaki desen listesinden alınır: kurallarda sıra
+        # değişirse numaralar da değişir ve diskteki eşleşmeler kullanılmaz
+        self.kural_ozeti = hashlib.sha1(
+            json.dumps([desen.pattern for desen in self.desenler], ensure_ascii=False).encode('utf-8')).hexdigest()
+        self.satir_eslesmeleri = {}
+        self.ad_eslesmeleri = {}
+        self.onbellek_degisti = False
+
+    def takim_adlari(self, kategori):
+        """Kategorinin preset takım adları (tanım sırasıyla)"""
+        return list(self.takimlar.get(kategori, {}))
+
+    def katalog_ayarla(self, rows, surum):
+        """Katalog değiştiğinde çağrılır - sürüm aynıysa mevcut eşleşmeler korunur"""
+        self.rows = rows
+        if surum != self.katalog_surumu:
+            self.katalog_surumu = surum
+            self.satir_eslesmeleri = {}
+
+    def siniflandir(self, urun_adi):
+        """Ürün adını tüm desenlere karşı tek geçişte dene: eşleşen desen numaraları"""
+        return frozenset(no for no, desen in enumerate(self.desenler) if desen.search(urun_adi))
+
+    def ad_eslesmesi(self, urun_adi):
+        """Ürün adının eşleştiği desenler (ad bazında saklanır, açılışlar arası önbelleğe yazılır)"""
+        eslesen = self.ad_eslesmeleri.get(urun_adi)
+        if eslesen is None:
+            eslesen = self.siniflandir(urun_adi)
+            self.ad_eslesmeleri[urun_adi] = eslesen
+            self.onbellek_degisti = True
+        return eslesen
+
+    def satir_eslesmesi(self, row_idx):
+        """Satırın eşleştiği desenler (ilk istekte sınıflandırılır, sonra saklanır)"""
+        eslesen = self.satir_eslesmeleri.get(row_idx)
+        if eslesen is None:
+            row = self.rows[row_idx]
+            eslesen = self.ad_eslesmesi(str(row[self.name_key])) if self.name_key in row else frozenset()
+            self.satir_eslesmeleri[row_idx] = eslesen
+        return eslesen
+
+    def takim_sec(self, kategori, takim_adi, satirlar):
+        """Preset'i verilen satırlara (tablo sırasıyla) uygula: [(satır indeksi, miktar)]
+
+        Her aranacak desen için, exclude desenlerine uymayan ilk satır seçilir.
+        Kategori/takım tanımlı değilse veya takımın deseni yoksa None döner.
+        """
+        takim = self.takimlar.get(kategori, {}).get(takim_adi)
+        if takim is None or not takim.aranacak:
+            return None
+
+        eslesmeler = [(row_idx, self.satir_eslesmesi(row_idx)) for row_idx in satirlar]
+        secim = []
+        for no in takim.aranacak:
+            haric = takim.exclude.get(no, ())
+            for row_idx, eslesen in eslesmeler:
+                if no in eslesen and not any(e in eslesen for e in haric):
+                    miktar = next((deger for adet_no, deger in takim.adet if adet_no in eslesen), 1)
+                    secim.append((row_idx, miktar))
+                    break
+        return secim
+
+
+def fiyat_dizileri(rows):
+    """LISTE ve PERAKENDE sütunlarını satır indeksine göre float dizilere çevir (boş/hatalı = 0)"""
+    import numpy as np
+
+    def sayi(deger):
+        try:
+            return float(deger) if deger else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+
+    liste = np.nan_to_num(np.array([sayi(row.get('LISTE')) for row in rows], dtype=float))
+    perakende = np.nan_to_num(np.array([sayi(row.get('PERAKENDE')) for row in rows], dtype=float))
+    return liste, perakende
+
+
+def toplu_takim_onerileri(motor, rows, koleksiyon_satirlari, kategori, takim_adi, json_data,
+                          koleksiyonlar=None, fiyatlar=None):
+    """Preset'i kategorideki tüm koleksiyonlara uygula ve önerilen takım kayıtlarını döndür
+
+    Her koleksiyonun satırları Etiket Ekle tablosundaki gibi ürün adına göre
+    alfabetik sıralanır; seçim motorun önceden hesaplanmış eşleşmelerinden yapılır.
+    Toplamlar fiyat dizileri üzerinden tek çarpımla hesaplanır. json_data değiştirilmez.
+
+    Args:
+        motor: TakimKuralMotoru (katalog_ayarla ile rows verilmiş olmalı)
+        rows: Katalog satırları (original_data)
+        koleksiyon_satirlari: {(kategori, koleksiyon): [satır indeksleri]}
+        json_data: etiketEkle.json içeriği (mevcut kayıtlarla karşılaştırma için)
+        koleksiyonlar: İşlenecek koleksiyonlar (None = kategorideki tümü)
+        fiyatlar: fiyat_dizileri(rows) sonucu (None ise hesaplanır)
+
+    Returns:
+        [{'koleksiyon', 'durum', 'eski', 'yeni'}] - durum: yeni | degisti | ayni |
+        eslesme_yok | etiket_listesi_yok
+    """
+    import numpy as np
+
+    if takim_adi not in motor.takimlar.get(kategori, {}):
+        raise ValueError(f"'{kategori}' kategorisinde '{takim_adi}' takımı tanımlı değil")
+
+    liste, perakende = fiyatlar if fiyatlar is not None else fiyat_dizileri(rows)
+    if koleksiyonlar is None:
+        koleksiyonlar = [kol for (kat, kol) in koleksiyon_satirlari if kat == kategori and kol]
+
+    oneriler = []
+    for koleksiyon in sorted(koleksiyonlar):
+        kayit = json_data.get(kategori, {}).get(koleksiyon, {})
+        eski = kayit.get(takim_adi)
+
+        if 'etiket_listesi' not in kayit:
+            oneriler.append({'koleksiyon': koleksiyon, 'durum': 'etiket_listesi_yok', 'eski': eski, 'yeni': None})
+            continue
+
+        # Tablo sırası: ürün adına göre alfabetik (eşitlikte katalog sırası)
+        satirlar = sorted(koleksiyon_satirlari.get((kategori, koleksiyon), []),
+                          key=lambda i: str(rows[i].get('urun_adi_tam', '')).lower())
+        secim = motor.takim_sec(kategori, takim_adi, satirlar) or []
+
+        # Aynı satır iki desene uyarsa bir kez seçilir, son adet geçerli olur (tablodaki gibi)
+        miktarlar = {}
+        for row_idx, miktar in secim:
+            if 'sku' in rows[row_idx] and 'urun_adi_tam' in rows[row_idx]:
+                miktarlar[row_idx] = int(miktar)
+        if not miktarlar:
+            oneriler.append({'koleksiyon': koleksiyon, 'durum': 'eslesme_yok', 'eski': eski, 'yeni': None})
+            continue
+
+        indeksler = [i for i in satirlar if i in miktarlar]
+        adetler = np.array([miktarlar[i] for i in indeksler], dtype=float)
+        total_liste_price = float(liste[indeksler] @ adetler)
+        total_perakende_price = float(perakende[indeksler] @ adetler)
+
+        total_indirim_yuzde = 0
+        if total_liste_price > 0:
+            total_indirim_yuzde = int((1 - (total_perakende_price / total_liste_price)) * 100)
+
+        yeni = {
+            'products': [{
+                'sku': str(rows[i]['sku']).strip(),
+                'urun_adi_tam': rows[i]['urun_adi_tam'],
+                'miktar': miktarlar[i]
+            } for i in indeksler],
+            'total_liste_price': total_liste_price,
+            'total_perakende_price': total_perakende_price,
+            'total_indirim_yuzde': total_indirim_yuzde
+        }
+
+        if eski is None:
+            durum = 'yeni'
+        elif eski == yeni:
+            durum = 'ayni'
+        else:
+            durum = 'degisti'
+        oneriler.append({'koleksiyon': koleksiyon, 'durum': durum, 'eski': eski, 'yeni': yeni})
+
+    return oneriler
+
+
+def toplu_takim_farki(oneriler, takim_adi):
+    """Önerileri incelenebilir metin farkına çevir (değişmeyen koleksiyonlar tek satır)"""
+    satirlar = []
+    for oneri in oneriler:
+        koleksiyon, durum, eski, yeni = oneri['koleksiyon'], oneri['durum'], oneri['eski'], oneri['yeni']
+        if durum == 'etiket_listesi_yok':
+            satirlar.append(f"⏭️ {koleksiyon}: etiket listesi yok, atlandı")
+            continue
+        if durum == 'eslesme_yok':
+            satirlar.append(f"⏭️ {koleksiyon}: {takim_adi} için ürün bulunamadı")
+            continue
+        if durum == 'ayni':
+            satirlar.append(f"= {koleksiyon}: değişiklik yok")
+            continue
+
+        satirlar.append(f"{'+' if durum == 'yeni' else '~'} {koleksiyon}")
+        eski = eski or {}
+        for alan, etiket in [('total_liste_price', 'LISTE'), ('total_perakende_price', 'PERAKENDE')]:
+            if alan in eski:
+                satirlar.append(f"    {etiket}: {eski[alan]:,.2f} → {yeni[alan]:,.2f} TL")
+            else:
+                satirlar.append(f"    {etiket}: {yeni[alan]:,.2f} TL")
+
+        eski_urunler = {f"{p.get('miktar', 1)} x {p.get('urun_adi_tam', '')}" for p in eski.get('products', [])}
+        yeni_urunler = [f"{p['miktar']} x {p['urun_adi_tam']}" for p in yeni['products']]
+        for urun in yeni_urunler:
+            satirlar.append(f"    {'  ' if urun in eski_urunler else '+ '}{urun}")
+        for urun in sorted(eski_urunler - set(yeni_urunler)):
+            satirlar.append(f"    - {urun}")
+    return "\n".join(satirlar)
+
+
+def toplu_takim_islemleri(kategori, takim_adi, oneriler):
+    """Yeni/değişen önerileri EtiketDeposu.commit işlemlerine çevir (tek işlemde yazılır)"""
+    return [{"op": "set", "yol": [kategori, oneri['koleksiyon'], takim_adi], "deger": oneri['yeni']}
+            for oneri in oneriler if oneri['durum'] in ('yeni', 'degisti')]
+
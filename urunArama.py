@@ -0,0 +1,287 @@
+"""
+Ürün Arama İndeksi - Etiket Ekle arama kutusu için önceden hazırlanmış kelime indeksi
+
+Katalog bir kez indekslenir:
+- Ürün adları Türkçe'ye uygun şekilde normalize edilir (İ/I/ı/i, ş/s, ğ/g, ü/u, ö/o, ç/c eşlenir)
+- Her kelime için satır listesi (posting list) tutulur, çok kelimeli sorgular kesişimle cevaplanır
+- SKU önek araması sıralı SKU dizisi üzerinde bisect ile yapılır
+
+Benchmark (Qt gerektirmez):
+    python -m urunArama --bench 20000
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from bisect import bisect_left
+from collections import OrderedDict
+
+
+# Türkçe karakterleri ASCII karşılıklarına katla (büyük/küçük harf dahil)
+TURKCE_KATLAMA = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ü': 'u', 'ü': 'u',
+    'Ö': 'o', 'ö': 'o',
+    'Ç': 'c', 'ç': 'c',
+    'Â': 'a', 'â': 'a',
+    'Î': 'i', 'î': 'i',
+    'Û': 'u', 'û': 'u',
+})
+
+KELIME_AYIRICI = re.compile(r'[^0-9a-z]+')
+
+# Daraltmada bu sayıdan büyük alt kümeler satır satır değil indeksle süzülür
+DARALTMA_LIMITI = 2000
+
+
+def turkce_normalize(text):
+    """Metni Türkçe'ye uygun şekilde küçük harfe çevir ve katla ("ŞİFONYER" -> "sifonyer")"""
+    return str(text).translate(TURKCE_KATLAMA).lower()
+
+
+def kelimelere_ayir(text):
+    """Normalize edilmiş metni kelimelere ayır (noktalama ve boşluklar ayırıcıdır)"""
+    return [kelime for kelime in KELIME_AYIRICI.split(turkce_normalize(text)) if kelime]
+
+
+class UrunAramaIndeksi:
+    """Katalog satırları için kelime + SKU indeksi
+
+    Sonuçlar satır indeksleri (original_data içindeki sıra) kümesi olarak döner.
+    Sorgudaki her kelime ürün adındaki bir kelimenin parçası olmalıdır (AND);
+    alternatif olarak tüm sorgu SKU'nun başlangıcı olabilir.
+    """
+
+    def __init__(self, rows, name_key='urun_adi_tam', sku_key='sku'):
+        self.row_count = len(rows)
+        self.postings = {}  # {kelime: [satır indeksleri]} (artan sırada)
+        self.sku_rows = {}  # {sku: [satır indeksleri]}
+        self.term_cache = {}  # {sorgu kelimesi: frozenset(satır indeksleri)}
+        self.row_tokens = []  # Satır bazında ürün adı kelimeleri (daraltma için)
+        self.row_skus = []  # Satır bazında küçük harf SKU (daraltma için)
+
+        sku_list = []
+        for row_idx, row in enumerate(rows):
+            kelimeler = tuple(set(kelimelere_ayir(row[name_key]))) if name_key in row else ()
+            self.row_tokens.append(kelimeler)
+            for kelime in kelimeler:
+                self.postings.setdefault(kelime, []).append(row_idx)
+
+            sku = str(row[sku_key]).strip() if sku_key in row else ''
+            self.row_skus.append(sku.lower())
+            if sku_key in row:
+                self.sku_rows.setdefault(sku, []).append(row_idx)
+                sku_list.append((sku.lower(), row_idx))
+
+        # Kelime sözlüğü (satır sayısından çok daha küçük) - parça eşleşmeleri burada aranır
+        self.vocabulary = sorted(self.postings)
+
+        # Sıralı SKU dizisi (önek araması için)
+        sku_list.sort()
+        self.sorted_skus = [sku for sku, _ in sku_list]
+        self.sorted_sku_rows = [row_idx for _, row_idx in sku_list]
+
+    def term_rows(self, term):
+        """Bir sorgu kelimesini içeren satırlar (kelime parçası eşleşmesi, sonuç önbelleklenir)"""
+        cached = self.term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        # Önek eşleşmeleri sıralı sözlükte ardışık durur - bisect ile başlangıcı bul
+        eslesen = set()
+        start = bisect_left(self.vocabulary, term)
+        i = start
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+            eslesen.update(self.postings[self.vocabulary[i]])
+            i += 1
+
+        # Kelimenin ortasında geçen eşleşmeler ("atak" -> "yatak")
+        for kelime in self.vocabulary[:start]:
+            if term in kelime:
+                eslesen.update(self.postings[kelime])
+        for kelime in self.vocabulary[i:]:
+            if term in kelime:
+                eslesen.update(self.postings[kelime])
+
+        result = frozenset(eslesen)
+        self.term_cache[term] = result
+        return result
+
+    def sku_prefix_rows(self, prefix):
+        """SKU'su verilen önekle başlayan satırlar"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return set()
+
+        start = bisect_left(self.sorted_skus, prefix)
+        result = set()
+        for i in range(start, len(self.sorted_skus)):
+            if not self.sorted_skus[i].startswith(prefix):
+                break
+            result.add(self.sorted_sku_rows[i])
+        return result
+
+    def search(self, query):
+        """Sorguya uyan satır indekslerini döndür (boş sorgu için None = filtre yok)"""
+        terms = kelimelere_ayir(query)
+        if not terms and not query.strip():
+            return None
+
+        # Ürün adı: tüm kelimeler (AND) - en küçük listeden başlayarak kesiştir
+        name_rows = set()
+        if terms:
+            kumeler = sorted((self.term_rows(term) for term in set(terms)), key=len)
+            name_rows = set(kumeler[0])
+            for kume in kumeler[1:]:
+                if not name_rows:
+                    break
+                name_rows &= kume
+
+        # SKU önek araması
+        return name_rows | self.sku_prefix_rows(query)
+
+    def narrow(self, rows, query):
+        """Önceki bir sorgunun sonucunu (rows) daha uzun sorguya göre süz - sıra korunur
+
+        Sorgu önceki sorgunun devamı olduğunda ("yat" -> "yata") sonuç her zaman
+        önceki sonucun alt kümesidir; bu yüzden sadece o satırlara bakılır.
+        """
+        if len(rows) > DARALTMA_LIMITI:
+            eslesen = self.search(query)
+            return rows if eslesen is None else [i for i in rows if i in eslesen]
+
+        terms = set(kelimelere_ayir(query))
+        sku_prefix = query.strip().lower()
+        if not terms and not sku_prefix:
+            return rows
+
+        result = []
+        for i in rows:
+            kelimeler = self.row_tokens[i]
+            if terms and all(any(term in kelime for kelime in kelimeler) for term in terms):
+                result.append(i)
+            elif sku_prefix and self.row_skus[i].startswith(sku_prefix):
+                result.append(i)
+        return result
+
+    def rows_for_sku(self, sku):
+        """SKU'ya ait satır indeksleri"""
+        return self.sku_rows.get(sku, [])
+
+
+class AramaOnbellegi:
+    """Son sorguların sonuçları için küçük LRU önbellek
+
+    Anahtar: (normalize sorgu, kategori, koleksiyon) -> satır indeksleri listesi.
+    Yeni sorgu önbellekteki bir sorgunun devamıysa (aynı kategori/koleksiyon ile),
+    en uzun eşleşen sorgunun sonucu daraltma için taban olarak döner.
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def clear(self):
+        self.entries.clear()
+
+    def get(self, query, kategori, koleksiyon):
+        key = (query, kategori, koleksiyon)
+        rows = self.entries.get(key)
+        if rows is not None:
+            self.entries.move_to_end(key)  # En son kullanılan
+        return rows
+
+    def put(self, query, kategori, koleksiyon, rows):
+        key = (query, kategori, koleksiyon)
+        self.entries[key] = rows
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)  # En eski kaydı at
+
+    def find_base(self, query, kategori, koleksiyon):
+        """Sorgunun devamı olduğu en uzun önbellek kaydının sonucunu döndür (yoksa None)"""
+        best = None
+        for (cached_query, cached_kategori, cached_koleksiyon), rows in self.entries.items():
+            if cached_kategori != kategori or cached_koleksiyon != koleksiyon:
+                continue
+            if query.startswith(cached_query) and (best is None or len(cached_query) > len(best[0])):
+                best = (cached_query, rows)
+
+        if best is None:
+            return None
+        self.entries.move_to_end((best[0], kategori, koleksiyon))
+        return best[1]
+
+
+def regex_ara(rows, search_text):
+    """Eski yöntem (karşılaştırma için): her satır için regex kur ve ara"""
+    search_text = search_text.strip().lower()
+    result = []
+    for row_idx, row in enumerate(rows):
+        urun_adi = str(row['urun_adi_tam']).lower()
+        parts = [re.escape(part) for part in search_text.split() if part]
+        pattern = r'(?=.*?{})'.format(')(?=.*?'.join(parts))
+        if re.search(pattern, urun_adi) or search_text in str(row['sku']).lower():
+            result.append(row_idx)
+    return result
+
+
+def ornek_katalog(satir_sayisi, seed=42):
+    """Benchmark için rastgele katalog üret"""
+    rnd = random.Random(seed)
+    koleksiyonlar = ["ALFA", "BELLA", "CAPRİ", "DORA", "ELİT", "FİNO", "GÜNEŞ", "HAVVA", "İNCİ", "LOTUS"]
+    urunler = ["Karyola 160", "Baza 160", "6 Kapaklı Dolap", "5 Kapaklı Dolap", "Şifonyer", "Aynalı Konsol",
+               "Komodin Çift Çekmeceli", "Yemek Masası Açılır", "Sandalye", "Berjer", "Üçlü Kanepe",
+               "Çalışma Masası", "Başlık 160", "Köşe Modülü", "Orta Sehpa"]
+    renkler = ["Beyaz", "Ceviz", "Antrasit", "Meşe", "Gri", "Krem"]
+    rows = []
+    for i in range(satir_sayisi):
+        rows.append({
+            'sku': f"3{rnd.randrange(10**9):09d}",
+            'urun_adi_tam': f"{rnd.choice(koleksiyonlar)} {rnd.choice(urunler)} {rnd.choice(renkler)}",
+        })
+    return rows
+
+
+def benchmark(satir_sayisi):
+    """Tuş vuruşundan sonuca gecikmeyi ölç (indeks vs eski regex taraması)"""
+    rows = ornek_katalog(satir_sayisi)
+
+    baslangic = time.perf_counter()
+    indeks = UrunAramaIndeksi(rows)
+    print(f"İndeks oluşturma: {(time.perf_counter() - baslangic) * 1000:.1f} ms "
+          f"({satir_sayisi} satır, {len(indeks.vocabulary)} kelime)")
+
+    # Kullanıcının harf harf yazdığı sorgular
+    sorgular = []
+    for tam_sorgu in ["alfa karyola", "şifonyer ceviz", "sandalye", "3001"]:
+        sorgular += [tam_sorgu[:n] for n in range(1, len(tam_sorgu) + 1)]
+
+    for ad, fonksiyon in [("indeks", lambda q: indeks.search(q)), ("regex", lambda q: regex_ara(rows, q))]:
+        if ad == "indeks":
+            indeks.term_cache.clear()
+        sureler = []
+        for sorgu in sorgular:
+            baslangic = time.perf_counter()
+            fonksiyon(sorgu)
+            sureler.append((time.perf_counter() - baslangic) * 1000)
+        sureler.sort()
+        print(f"{ad:>6}: ortalama {sum(sureler) / len(sureler):7.2f} ms | "
+              f"p50 {sureler[len(sureler) // 2]:7.2f} ms | en kötü {sureler[-1]:7.2f} ms "
+              f"({len(sureler)} tuş vuruşu)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="urunArama", description="Ürün arama indeksi benchmark")
+    parser.add_argument("--bench", type=int, default=20000, help="Benchmark katalog satır sayısı")
+    args = parser.parse_args(argv)
+    benchmark(args.bench)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())